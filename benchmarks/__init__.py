@@ -0,0 +1,3 @@
+"""
+boa benchmarks, run with ``python -m benchmarks.<name>`` or ``invoke benchmark``
+"""
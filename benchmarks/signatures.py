@@ -0,0 +1,161 @@
+"""
+###################################
+Signature Matching Benchmarks
+###################################
+
+Measures the per-trial overhead of matching a trial's data to the arguments of
+metric functions (:func:`.get_dictionary_from_callable`), before and after its
+signatures are cached.
+
+For each of BOA's metrics it evaluates a trial's data the way :class:`.ModularMetric`
+does for every arm of every trial, with signature caching disabled (``uncached_us``,
+the signature is rebuilt on every call) and enabled (``cached_us``), and reports
+
+* ``uncached_us`` / ``cached_us``: microseconds per evaluation, median of the repeats
+* ``matching_us``: the overhead saved per evaluation, ``uncached_us - cached_us``
+* ``speedup``: ``uncached_us / cached_us``
+
+The data is kept small (``--n-points``) so the timings are dominated by the overhead
+rather than the metric computation.
+
+Run with::
+
+    python -m benchmarks.signatures
+    python -m benchmarks.signatures -r 5000 -p 100 -o signature_benchmark.csv
+
+"""
+
+from __future__ import annotations
+
+import pathlib
+import statistics
+import time
+import warnings
+from typing import Callable
+
+import click
+import numpy as np
+import pandas as pd
+
+from boa.metrics.metrics import (
+    Mean,
+    MeanSquaredError,
+    NormalizedRootMeanSquaredError,
+    RootMeanSquaredError,
+    RSquared,
+)
+from boa.metrics.modular_metric import ModularMetric
+from boa.utils import clear_signature_cache
+
+METRICS = {
+    "Mean": Mean,
+    "MSE": MeanSquaredError,
+    "RMSE": RootMeanSquaredError,
+    "NRMSE": NormalizedRootMeanSquaredError,
+    "R2": RSquared,
+}
+
+
+def _evaluate(metric: ModularMetric, kwargs: dict) -> Callable[[], float]:
+    def evaluate():
+        # _evaluate pops the trial data from the parameters
+        return metric._evaluate({"kwargs": dict(kwargs)})
+
+    return evaluate
+
+
+def _time_once(func: Callable) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _time_us(func: Callable, repeats: int) -> tuple[float, float]:
+    # alternate uncached and cached evaluations, so drift in the machine's load affects both alike
+    uncached, cached = [], []
+    for _ in range(repeats):
+        clear_signature_cache()
+        uncached.append(_time_once(func))
+        cached.append(_time_once(func))
+    return statistics.median(uncached) * 1e6, statistics.median(cached) * 1e6
+
+
+def benchmark_metric(name: str, repeats: int = 2_000, n_points: int = 10, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    y_true = rng.random(n_points)
+    y_pred = y_true + rng.normal(scale=0.1, size=n_points)
+    metric = METRICS[name]()
+    if name == "Mean":
+        kwargs = {"wrapper_args": [y_pred]}
+    else:
+        kwargs = {"y_true": y_true, "y_pred": y_pred}
+    evaluate = _evaluate(metric, kwargs)
+    with warnings.catch_warnings():
+        # sklearn's deprecation warnings would otherwise dominate the timings
+        warnings.simplefilter("ignore")
+        evaluate()  # warm up imports and first call costs
+        uncached, cached = _time_us(evaluate, repeats)
+    return {
+        "metric": name,
+        "uncached_us": uncached,
+        "cached_us": cached,
+        "matching_us": uncached - cached,
+        "speedup": uncached / cached,
+    }
+
+
+def run_signature_benchmark(metrics=tuple(METRICS), repeats: int = 2_000, n_points: int = 10) -> pd.DataFrame:
+    """Benchmark evaluating a trial's data with each metric in ``metrics``, with and without cached signatures.
+
+    Parameters
+    ----------
+    metrics
+        Metrics to benchmark, keys of :data:`METRICS`
+    repeats
+        Number of evaluations to time, with and without cached signatures
+    n_points
+        Number of points in the data of the trial
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per metric
+    """
+    return pd.DataFrame([benchmark_metric(name, repeats=repeats, n_points=n_points) for name in metrics])
+
+
+@click.command()
+@click.option(
+    "-m",
+    "--metric",
+    "metrics",
+    type=click.Choice(list(METRICS)),
+    multiple=True,
+    default=tuple(METRICS),
+    show_default=True,
+    help="Metric to benchmark, can be given multiple times.",
+)
+@click.option(
+    "-r", "--repeats", type=int, default=2_000, show_default=True, help="Number of evaluations to time per metric."
+)
+@click.option(
+    "-p", "--n-points", type=int, default=10, show_default=True, help="Number of points in the data of a trial."
+)
+@click.option(
+    "-o",
+    "--output-path",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Also save the results to this CSV file, to compare between versions.",
+)
+def main(metrics, repeats, n_points, output_path):
+    """Benchmark the per-trial overhead of matching trial data to metric function signatures."""
+    df = run_signature_benchmark(metrics=metrics, repeats=repeats, n_points=n_points)
+    with pd.option_context("display.max_columns", None, "display.width", None):
+        click.echo(df.to_string(index=False, float_format="{:.1f}".format))
+    if output_path:
+        df.to_csv(output_path, index=False)
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+###################################
+Storage Benchmarks
+###################################
+
+Measures how saving and loading an optimization scales with its number of trials,
+for each storage format.
+
+Experiments are made with :class:`.SyntheticWrapper`, with an objective from the
+Hartmann4 synthetic function, and filled with completed trials and their data
+directly (without running an optimization loop), so tens of thousands of trials
+only take seconds to set up. For each number of trials and storage format it reports
+
+* ``save_s``: seconds for a first (full) :func:`.dump_scheduler_data`
+* ``resave_s``: seconds for :func:`.dump_scheduler_data` after one more trial completes
+* ``load_s``: seconds for :func:`.scheduler_from_json_file`
+* ``summary_s``: seconds to load a :meth:`.SchedulerSnapshot.summary`
+* ``size_mb``: size of the saved scheduler files
+* ``save_peak_rss_mb`` / ``load_peak_rss_mb``: peak resident memory of the process while saving / loading
+
+Timings include writing ``optimization.csv``, which is also benchmarked on its own
+(format ``csv``, :func:`.exp_opt_to_csv` and reading it back with pandas).
+Each benchmark runs in a fresh python process so memory from one doesn't count towards the next.
+
+Run with::
+
+    python -m benchmarks.storage
+    python -m benchmarks.storage -n 100 -n 1000 -f json -f sqlite -o storage_benchmark.csv
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import click
+import numpy as np
+import pandas as pd
+from ax import Arm, Data, GeneratorRun
+
+from boa import (
+    BOAConfig,
+    SchedulerSnapshot,
+    WrappedJobRunner,
+    dump_scheduler_data,
+    exp_opt_to_csv,
+    get_experiment,
+    get_scheduler,
+    scheduler_from_json_file,
+)
+from boa.config import SnapshotCompression, StorageBackend
+from boa.metrics.synthetic_funcs import hartmann4
+from boa.scheduler import Scheduler
+from boa.storage.formats import snapshot_path_for
+from boa.storage.sqlite import sqlite_path_for
+from boa.wrappers.synthetic_wrapper import SyntheticWrapper
+
+BENCHMARKS_DIR = pathlib.Path(__file__).resolve().parent
+
+DEFAULT_N_TRIALS = (100, 1_000, 10_000, 50_000)
+
+FORMATS = {
+    "json": dict(storage_backend=StorageBackend.JSON),
+    "json.gz": dict(storage_backend=StorageBackend.JSON, snapshot_compression=SnapshotCompression.GZIP),
+    "journal": dict(storage_backend=StorageBackend.JOURNAL),
+    "sqlite": dict(storage_backend=StorageBackend.SQLITE),
+    "csv": {},  # optimization.csv on its own
+}
+
+METRIC_NAME = "hartmann4"
+N_PARAMS = 4
+
+
+def make_scheduler(experiment_dir: pathlib.Path, n_trials: int, seed: int = 0, **script_options) -> Scheduler:
+    """A scheduler with ``n_trials`` completed trials of the Hartmann4 function"""
+    config = BOAConfig(
+        objective={"metrics": [{"name": METRIC_NAME, "metric": "passthrough"}]},
+        parameters={
+            f"x{i}": {"type": "range", "bounds": [0.0, 1.0], "value_type": "float"} for i in range(1, N_PARAMS + 1)
+        },
+        scheduler={"total_trials": n_trials + 1},
+        script_options={"experiment_dir": experiment_dir, "append_timestamp": False, **script_options},
+    )
+    wrapper = SyntheticWrapper(config=config, metrics={METRIC_NAME: []})
+    experiment = get_experiment(config, WrappedJobRunner(wrapper=wrapper), wrapper)
+    scheduler = get_scheduler(experiment, config=config)
+    add_trials(scheduler, n_trials, rng=np.random.default_rng(seed))
+    return scheduler
+
+
+def add_trials(scheduler: Scheduler, n: int, rng: np.random.Generator) -> None:
+    """Add ``n`` completed trials with their data, the way the scheduler would have left them"""
+    experiment = scheduler.experiment
+    start = len(experiment.trials)
+    X = rng.random((n, N_PARAMS))
+    y = hartmann4(X) if n else np.array([])
+    for x in X:
+        parameters = {f"x{i}": float(v) for i, v in enumerate(x, start=1)}
+        trial = experiment.new_trial(generator_run=GeneratorRun(arms=[Arm(parameters=parameters)], model_key="Sobol"))
+        trial.runner = scheduler.runner
+        trial.mark_running(no_runner_required=True)
+        trial.mark_completed()
+    if not n:
+        return
+    df = pd.DataFrame(
+        dict(
+            arm_name=[f"{idx}_0" for idx in range(start, start + n)],
+            metric_name=METRIC_NAME,
+            mean=y,
+            sem=0.0,
+            trial_index=np.arange(start, start + n),
+        )
+    )
+    experiment.attach_data(Data(df=df))
+    # fetching through the metric would also fill its cache, which is saved with the experiment
+    metric = experiment.metrics[METRIC_NAME]
+    for idx, trial_df in df.groupby("trial_index"):
+        metric._trial_data_cache[idx] = trial_df.to_dict(orient="list")
+
+
+def _current_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):  # not linux
+        return None
+
+
+def _max_rss() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # bytes on macos, KiB on linux
+
+
+def measure(func: Callable, interval: float = 0.001) -> tuple[float, Optional[int]]:
+    """Seconds ``func`` takes and the peak resident memory (bytes) of the process while it runs.
+
+    The peak is sampled from a background thread where the current memory use is available
+    (linux), otherwise it is the peak over the life of the process.
+    """
+    peak = _current_rss()
+    if peak is None:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start, _max_rss()
+
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.wait(interval):
+            peak = max(peak, _current_rss())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        func()
+    finally:
+        seconds = time.perf_counter() - start
+        done.set()
+        sampler.join()
+    return seconds, max(peak, _current_rss())
+
+
+def _files_size(paths: Iterable[pathlib.Path]) -> int:
+    return sum(path.stat().st_size for path in paths if path.is_file())
+
+
+def benchmark_storage_format(n_trials: int, storage_format: str, dir_: pathlib.Path, seed: int = 0) -> dict:
+    """Benchmark saving and loading a scheduler with ``n_trials`` trials in one storage format"""
+    for name in ("boa", "ax"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    experiment_dir = pathlib.Path(dir_) / f"{storage_format}_{n_trials}"
+    scheduler = make_scheduler(experiment_dir, n_trials, seed=seed, **FORMATS[storage_format])
+    result = dict(n_trials=n_trials, format=storage_format)
+
+    if storage_format == "csv":
+        opt_csv = experiment_dir / "optimization.csv"
+        result["save_s"], save_rss = measure(lambda: exp_opt_to_csv(scheduler.experiment, opt_csv))
+        result["size_mb"] = opt_csv.stat().st_size / 1e6
+        result["load_s"], load_rss = measure(lambda: pd.read_csv(opt_csv))
+    else:
+
+        def save():
+            dump_scheduler_data(
+                scheduler,
+                scheduler_filepath=scheduler.scheduler_filepath,
+                opt_filepath=scheduler.opt_csv,
+                dir_=experiment_dir,
+            )
+
+        result["save_s"], save_rss = measure(save)
+        scheduler.flush_save_data()
+        scheduler_files = [
+            path for path in experiment_dir.iterdir() if path.name.startswith(scheduler.scheduler_filepath.stem)
+        ]
+        result["size_mb"] = _files_size(scheduler_files) / 1e6
+
+        add_trials(scheduler, 1, rng=np.random.default_rng(seed + 1))
+        result["resave_s"], _ = measure(save)
+        scheduler.flush_save_data()
+
+        if FORMATS[storage_format]["storage_backend"] == StorageBackend.SQLITE:
+            saved_path = sqlite_path_for(scheduler.scheduler_filepath)
+        else:
+            saved_path = snapshot_path_for(
+                scheduler.scheduler_filepath, FORMATS[storage_format].get("snapshot_compression")
+            )
+        result["load_s"], load_rss = measure(lambda: scheduler_from_json_file(saved_path))
+        result["summary_s"], _ = measure(lambda: SchedulerSnapshot.from_file(saved_path).summary())
+
+    result["save_peak_rss_mb"] = save_rss / 1e6 if save_rss else np.nan
+    result["load_peak_rss_mb"] = load_rss / 1e6 if load_rss else np.nan
+    return result
+
+
+def _benchmark_in_subprocess(n_trials: int, storage_format: str, dir_: pathlib.Path) -> dict:
+    # a fresh interpreter (rather than a multiprocessing child) so nothing is shared with this process
+    output_path = dir_ / f"{storage_format}_{n_trials}.csv"
+    cmd = [sys.executable, "-m", "benchmarks.storage", "-n", str(n_trials), "-f", storage_format]
+    cmd += ["-o", str(output_path), "-d", str(dir_), "--no-isolate"]
+    subprocess.run(cmd, check=True, cwd=BENCHMARKS_DIR.parent, stdout=subprocess.DEVNULL)
+    return pd.read_csv(output_path).iloc[0].to_dict()
+
+
+def run_storage_benchmark(
+    n_trials: Iterable[int] = DEFAULT_N_TRIALS,
+    formats: Iterable[str] = tuple(FORMATS),
+    dir_: Optional[os.PathLike] = None,
+    isolate: bool = True,
+) -> pd.DataFrame:
+    """Benchmark every storage format in ``formats`` at every number of trials in ``n_trials``.
+
+    Parameters
+    ----------
+    n_trials
+        Numbers of trials of the experiments to benchmark
+    formats
+        Storage formats to benchmark, keys of :data:`FORMATS`
+    dir_
+        Directory to save the experiments in, a temporary directory if not given
+    isolate
+        Run each benchmark in a fresh process, so memory measurements aren't affected by earlier ones
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per number of trials and storage format
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dir_ = pathlib.Path(dir_ or tmp_dir)
+        results = []
+        for n in n_trials:
+            for storage_format in formats:
+                if isolate:
+                    result = _benchmark_in_subprocess(n, storage_format, dir_)
+                else:
+                    result = benchmark_storage_format(n, storage_format, dir_)
+                    click.echo(
+                        f"{n} trials, {storage_format}: save {result['save_s']:.3f}s,"
+                        f" load {result['load_s']:.3f}s, {result['size_mb']:.2f} MB",
+                        err=True,
+                    )
+                results.append(result)
+    return pd.DataFrame(results)
+
+
+@click.command()
+@click.option(
+    "-n",
+    "--n-trials",
+    type=int,
+    multiple=True,
+    default=DEFAULT_N_TRIALS,
+    show_default=True,
+    help="Number of trials to benchmark, can be given multiple times.",
+)
+@click.option(
+    "-f",
+    "--format",
+    "formats",
+    type=click.Choice(list(FORMATS)),
+    multiple=True,
+    default=tuple(FORMATS),
+    show_default=True,
+    help="Storage format to benchmark, can be given multiple times.",
+)
+@click.option(
+    "-o",
+    "--output-path",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Also save the results to this CSV file, to compare between versions.",
+)
+@click.option(
+    "-d",
+    "--dir",
+    "dir_",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    help="Directory to save the benchmarked experiments in. A temporary directory if not given.",
+)
+@click.option(
+    "--no-isolate",
+    is_flag=True,
+    default=False,
+    help="Run every benchmark in this process instead of a fresh one (faster, but memory measurements overlap).",
+)
+def main(n_trials, formats, output_path, dir_, no_isolate):
+    """Benchmark saving and loading optimizations of increasing size with each storage format."""
+    df = run_storage_benchmark(n_trials=n_trials, formats=formats, dir_=dir_, isolate=not no_isolate)
+    with pd.option_context("display.max_columns", None, "display.width", None):
+        click.echo(df.to_string(index=False, float_format="{:.3f}".format))
+    if output_path:
+        df.to_csv(output_path, index=False)
+    return df
+
+
+if __name__ == "__main__":
+    main()
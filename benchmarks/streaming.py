@@ -0,0 +1,160 @@
+"""
+###################################
+Streaming Metric Benchmarks
+###################################
+
+Measures the memory and time BOA's metrics take to evaluate ``y_true`` and ``y_pred``
+memory-mapped from ``.npy`` files (see :mod:`.streaming`), compared to loading them first.
+
+For each metric it evaluates the same data loaded in memory (``in_memory``) and streamed
+from the memory-mapped files a chunk at a time (``streamed``), and reports
+
+* ``in_memory_mb`` / ``streamed_mb``: peak memory allocated while evaluating, in MB,
+  including the loaded arrays themselves for ``in_memory``
+* ``in_memory_s`` / ``streamed_s``: seconds per evaluation
+* ``rel_diff``: relative difference between the two values, nonzero for ``NRMSE``
+  whose IQR normalizer is estimated when streamed
+
+Run with::
+
+    python -m benchmarks.streaming
+    python -m benchmarks.streaming -p 50000000 -c 1000000 -o streaming_benchmark.csv
+
+"""
+
+from __future__ import annotations
+
+import pathlib
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import click
+import numpy as np
+import pandas as pd
+
+from boa.metrics.metrics import (
+    Mean,
+    MeanSquaredError,
+    NormalizedRootMeanSquaredError,
+    RootMeanSquaredError,
+    RSquared,
+)
+from boa.metrics.streaming import DEFAULT_CHUNK_SIZE
+
+METRICS = {
+    "Mean": Mean,
+    "MSE": MeanSquaredError,
+    "RMSE": RootMeanSquaredError,
+    "NRMSE": NormalizedRootMeanSquaredError,
+    "R2": RSquared,
+}
+
+
+def _measure(func) -> tuple[float, float, float]:
+    """Value, peak MB allocated, and seconds of calling ``func``"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = func()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, peak / 2**20, seconds
+
+
+def benchmark_metric(name: str, directory: pathlib.Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    y_true = np.load(directory / "y_true.npy", mmap_mode="r")
+    y_pred = np.load(directory / "y_pred.npy", mmap_mode="r")
+    metric = METRICS[name](metric_func_kwargs={"chunk_size": chunk_size})
+    in_memory = METRICS[name]()
+
+    def evaluate(load: bool):
+        true, pred = (np.array(y_true), np.array(y_pred)) if load else (y_true, y_pred)
+        if name == "Mean":
+            return (in_memory if load else metric).f(pred)
+        return (in_memory if load else metric).f(true, pred)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        loaded, loaded_mb, loaded_s = _measure(lambda: evaluate(load=True))
+        streamed, streamed_mb, streamed_s = _measure(lambda: evaluate(load=False))
+    return {
+        "metric": name,
+        "in_memory_mb": loaded_mb,
+        "streamed_mb": streamed_mb,
+        "in_memory_s": loaded_s,
+        "streamed_s": streamed_s,
+        "rel_diff": abs(streamed - loaded) / abs(loaded),
+    }
+
+
+def run_streaming_benchmark(
+    metrics=tuple(METRICS), n_points: int = 10_000_000, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = 0
+) -> pd.DataFrame:
+    """Benchmark evaluating memory-mapped data with each metric in ``metrics``, loaded and streamed.
+
+    Parameters
+    ----------
+    metrics
+        Metrics to benchmark, keys of :data:`METRICS`
+    n_points
+        Number of points in ``y_true`` and ``y_pred``
+    chunk_size
+        Number of values streamed at a time
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per metric
+    """
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = pathlib.Path(tmp)
+        y_true = rng.random(n_points)
+        np.save(directory / "y_true.npy", y_true)
+        np.save(directory / "y_pred.npy", y_true + rng.normal(scale=0.1, size=n_points))
+        del y_true
+        return pd.DataFrame([benchmark_metric(name, directory, chunk_size=chunk_size) for name in metrics])
+
+
+@click.command()
+@click.option(
+    "-m",
+    "--metric",
+    "metrics",
+    type=click.Choice(list(METRICS)),
+    multiple=True,
+    default=tuple(METRICS),
+    show_default=True,
+    help="Metric to benchmark, can be given multiple times.",
+)
+@click.option("-p", "--n-points", type=int, default=10_000_000, show_default=True, help="Number of points in the data.")
+@click.option(
+    "-c",
+    "--chunk-size",
+    type=int,
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Number of values streamed at a time.",
+)
+@click.option(
+    "-o",
+    "--output-path",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Also save the results to this CSV file, to compare between versions.",
+)
+def main(metrics, n_points, chunk_size, output_path):
+    """Benchmark the memory and time taken by metrics on memory-mapped data, loaded and streamed."""
+    df = run_streaming_benchmark(metrics=metrics, n_points=n_points, chunk_size=chunk_size)
+    with pd.option_context("display.max_columns", None, "display.width", None):
+        click.echo(df.to_string(index=False, float_format="{:.3g}".format))
+    if output_path:
+        df.to_csv(output_path, index=False)
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ from boa.plotting import (  # noqa
     plot_pareto_frontier,
     plot_slice,
     scheduler_to_df,
+    summary_view,
 )
 from boa.registry import _add_common_encodes_and_decodes
 from boa.runner import *  # noqa
@@ -9,14 +9,12 @@ import click
 import pandas as pd
 from attrs import fields_dict
 from ax import Data
-from ax.storage.json_store.decoder import object_from_json
 
 from boa.config import BOAConfig, BOAScriptOptions, MetricType
 from boa.controller import Controller
-from boa.storage import scheduler_from_json_file
+from boa.storage import SchedulerSnapshot
 from boa.utils import check_min_package_version
 from boa.wrappers.synthetic_wrapper import SyntheticWrapper
-from boa.wrappers.wrapper_utils import load_jsonlike
 
 
 @click.command()
@@ -31,7 +29,7 @@ from boa.wrappers.wrapper_utils import load_jsonlike
     "--scheduler-path",
     type=click.Path(),
     default="",
-    help="Path to scheduler json file.",
+    help="Path to scheduler json file (or scheduler .db file if saved with the sqlite storage backend).",
 )
 @click.option(
     "-n",
@@ -51,7 +49,15 @@ from boa.wrappers.wrapper_utils import load_jsonlike
     " to ``load_config``. The default ``load_config`` does support this."
     " This is also only done for initial run, not for reloading from scheduler json file.",
 )
-def main(config_path, scheduler_path, num_trials, temporary_dir):
+@click.option(
+    "--summary",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Print a summary of the trials and the best trials of the scheduler at --scheduler-path and exit,"
+    " without restoring the scheduler or running any trials.",
+)
+def main(config_path, scheduler_path, num_trials, temporary_dir, summary):
     """Asynchronous optimization script. Asynchronously run your optimization.
     With this script, you can pass in a configuration file that specifies your
     optimization parameters and objective and BOA will output a
@@ -67,11 +73,17 @@ def main(config_path, scheduler_path, num_trials, temporary_dir):
         Path to scheduler json file.
     num_trials
         Number of trials to run. Overrides trials in config file.
+    summary
+        Only print a summary of the trials and the best trials of the scheduler.
 
     Returns
     -------
-        Scheduler
+        Scheduler (or SchedulerSnapshot if ``summary``)
     """
+    if summary:
+        if not scheduler_path:
+            raise click.UsageError("--summary needs a --scheduler-path to summarize.")
+        return summarize(scheduler_path)
     if temporary_dir:
         with tempfile.TemporaryDirectory() as temp_dir:
             experiment_dir = Path(temp_dir)
@@ -102,13 +114,15 @@ def run(config_path, scheduler_path, num_trials, experiment_dir=None):
     )
 
     config = None
+    snapshot = None
     if config_path:
         config = BOAConfig.from_jsonlike(config_path, **config_kw)
     if scheduler_path:
         scheduler_path = Path(scheduler_path).resolve()
+        # only read the file once, and only decode the config until the scheduler is needed
+        snapshot = SchedulerSnapshot.from_file(scheduler_path)
         if not config:
-            sch_jsn = load_jsonlike(scheduler_path)
-            config = BOAConfig(**{**object_from_json(sch_jsn["wrapper"]["config"]), **config_kw})
+            config = snapshot.load_config(**config_kw)
     if "steps" in config.generation_strategy:
         for step in config.generation_strategy["steps"]:
             step.max_parallelism = None
@@ -120,8 +134,8 @@ def run(config_path, scheduler_path, num_trials, experiment_dir=None):
     if experiment_dir:
         config.script_options.experiment_dir = experiment_dir
 
-    if scheduler_path:
-        scheduler = scheduler_from_json_file(filepath=scheduler_path)
+    if snapshot:
+        scheduler = snapshot.to_scheduler()
         if num_trials:
             scheduler.wrapper.config.scheduler = dataclasses.replace(
                 scheduler.wrapper.config.scheduler, total_trials=num_trials
@@ -174,6 +188,16 @@ def run(config_path, scheduler_path, num_trials, experiment_dir=None):
     return scheduler
 
 
+def summarize(scheduler_path, n_best=5):
+    """Print a table of the trials and the best trials of a saved scheduler,
+    without restoring the scheduler (see :class:`.SchedulerSnapshot`)."""
+    snapshot = SchedulerSnapshot.from_file(Path(scheduler_path).resolve())
+    with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", None):
+        click.echo(f"Trials:\n{snapshot.summary().to_string(index=False)}")
+        click.echo(f"\nBest trials:\n{snapshot.best_trials(n=n_best).to_string(index=False)}")
+    return snapshot
+
+
 def exp_attach_data_from_opt_csv(metric_names, scheduler):
     df = pd.read_csv(scheduler.opt_csv)
     isin = df.columns.isin(metric_names).sum() == len(metric_names)
@@ -64,21 +64,12 @@ def get_scheduler(
     generation_strategy = get_generation_strategy(config=config, experiment=experiment, **kwargs)
 
     _check_moo_has_right_aqf_mode_bridge_cls(experiment, generation_strategy)
-    # db_settings = DBSettings(
-    #     url="sqlite:///foo.db",
-    #     decoder=Decoder(config=SQAConfig()),
-    #     encoder=Encoder(config=SQAConfig()),
-    # )
-
-    # init_engine_and_session_factory(url=db_settings.url)
-    # engine = get_engine()
-    # create_all_tables(engine)
-
+    # storage (json, journal or sqlite) is handled by `boa.storage` in `Scheduler.save_data`,
+    # selected with `script_options.storage_backend`
     return Scheduler(
         experiment=experiment,
         generation_strategy=generation_strategy,
         options=config.scheduler,
-        # db_settings=db_settings,
     )
 
 
@@ -9,7 +9,7 @@ from ax.storage.json_store.decoder import object_from_json
 
 from boa.config import BOAScriptOptions
 from boa.controller import Controller
-from boa.storage import scheduler_from_json_file
+from boa.storage import load_scheduler_snapshot, scheduler_from_json_file
 from boa.wrappers.script_wrapper import ScriptWrapper
 from boa.wrappers.wrapper_utils import cd_and_cd_back, load_jsonlike
 
@@ -26,7 +26,7 @@ from boa.wrappers.wrapper_utils import cd_and_cd_back, load_jsonlike
     "--scheduler-path",
     type=click.Path(),
     default="",
-    help="Path to scheduler json file.",
+    help="Path to scheduler json file (or scheduler .db file if saved with the sqlite storage backend).",
 )
 @click.option(
     "-wp",
@@ -118,7 +118,7 @@ def run(config_path, scheduler_path, rel_to_config, wrapper_path=None, wrapper_n
     if scheduler_path:
         scheduler_path = Path(scheduler_path).resolve()
         if not config:
-            sch_jsn = load_jsonlike(scheduler_path)
+            sch_jsn = load_scheduler_snapshot(scheduler_path)
             config = object_from_json(sch_jsn["wrapper"]["config"])
             config_path = object_from_json(sch_jsn["wrapper"]["config_path"])
             script_options = config.get("script_options", {})
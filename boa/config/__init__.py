@@ -39,6 +39,10 @@ __all__ = [  # noqa: F405
     "BOAScriptOptions",
     "BOAMetric",
     "MetricType",
+    "StorageBackend",
+    "SnapshotCompression",
+    "ExecutorKind",
+    "TimeoutStatus",
     # "SchedulerOptions",
     # "GenerationStep",
 ]
@@ -38,6 +38,10 @@ __all__ = [
     "BOAScriptOptions",
     "BOAMetric",
     "MetricType",
+    "StorageBackend",
+    "SnapshotCompression",
+    "ExecutorKind",
+    "TimeoutStatus",
     # "SchedulerOptions",
     # "GenerationStep",
 ]
@@ -112,6 +116,27 @@ class MetricType(StrEnum):
     INSTANTIATED = "instantiated"
 
 
+class StorageBackend(StrEnum):
+    JSON = "json"
+    JOURNAL = "journal"
+    SQLITE = "sqlite"
+
+
+class SnapshotCompression(StrEnum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class ExecutorKind(StrEnum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class TimeoutStatus(StrEnum):
+    FAILED = "failed"
+    ABANDONED = "abandoned"
+
+
 @define(kw_only=True)
 class BOAMetric(_Utils):
     metric: Optional[str | ModularMetric] = field(
@@ -393,6 +418,266 @@ class BOAScriptOptions(_Utils):
         default=None,
         metadata={"doc": "Shell command to fetch your trial data. See `run_model` for more details. "},
     )
+    script_workers: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to start each of the script commands above once and send it a request for
+            every trial (as a line of JSON on its stdin), instead of launching the command again for
+            every trial and every call. Saves the start up time of the script's interpreter (such as
+            `Rscript`) on every call, including every status check of every trial.
+            Your scripts must follow the protocol in :mod:`.script_worker`, for which there are
+            reference clients for python and R in :mod:`.clients`. The commands can't use the trial's
+            parameters in their jinja templating, since they are only started once. A script that handles
+            its requests one at a time (the reference clients by default) runs the `run_model` of trials
+            running at the same time one after the other, see `max_workers` of the python client to handle
+            them concurrently.
+            Defaults to False if not specified."""
+        },
+    )
+    script_timeouts: Optional[dict] = field(
+        default=None,
+        metadata={
+            "doc": """Seconds each script command above may run for, by script option, such as
+            `{run_model: 3600, set_trial_status: 60}`. A script that runs longer is killed,
+            along with anything it started, and its trial is marked failed.
+            Doesn't apply with `script_workers`, see `trial_timeout` for limiting whole trials.
+            Defaults to no limit if not specified."""
+        },
+    )
+    batch_trials: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to deploy and check the status of trials in batches: all the trials
+            being deployed at once are passed to your wrapper's `run_model_batch`, and all the running
+            trials being checked to `set_trial_status_batch`, instead of calling `run_model` and
+            `set_trial_status` for each trial. For the script commands above, each is then run once
+            per batch, passed a manifest of the batch's trial directories instead of a trial directory,
+            see :meth:`.ScriptWrapper.run_model_batch`. Not used with `script_workers`.
+            Set `run_trials_in_batches` in the scheduler options too, so as many trials as can
+            run at once are generated and deployed together, instead of one at a time.
+            Defaults to False if not specified."""
+        },
+    )
+    write_trial_json: bool = field(
+        default=True,
+        metadata={
+            "doc": """Whether to write `trial.json`, the complete json serialization of the trial, to the
+            trial directory for your script commands (and include it in `data.json`). Serializing the
+            whole trial on every script call can be slow, set to False if your scripts don't need it.
+            (The data files are only rewritten when their content changes either way.)
+            Defaults to True if not specified."""
+        },
+    )
+    script_log_files: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to also write the stdout and stderr of each script command above to a log
+            file in the trial directory, named after the script option (such as `run_model.log`),
+            in addition to BOA's log.
+            Defaults to False if not specified."""
+        },
+    )
+    watch_trial_files: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to watch the trial directories for the status and output files your
+            scripts write (with inotify on Linux, otherwise by scanning them every half second),
+            instead of reading them on every poll and sleeping while waiting for output files.
+            Trials are then checked as soon as they write their files, instead of at the next poll,
+            and only trials that wrote a file since they were last checked are read. With inotify,
+            the trial directories are still scanned every 5 seconds, for files written to a shared
+            file system (such as NFS) from other machines, which inotify doesn't see.
+            See :mod:`.trial_watcher`.
+            Defaults to False if not specified."""
+        },
+    )
+    payload_cache_max_trials: Optional[int] = field(
+        default=None,
+        metadata={
+            "doc": """Maximum number of trials whose fetched data (what your `fetch_trial_data` returns,
+            such as the `y_true` and `y_pred` arrays of RMSE) is kept in memory. The least recently used
+            trials' data is dropped beyond that. The metric values computed from it are kept either way,
+            so dropped data is only fetched again if a metric of that trial still needs it.
+            See :mod:`.metric_cache`.
+            Defaults to no limit if not specified."""
+        },
+    )
+    payload_cache_max_mb: Optional[float] = field(
+        default=None,
+        metadata={
+            "doc": """Maximum size in megabytes of the fetched trial data kept in memory (see
+            `payload_cache_max_trials`), dropping the least recently used trials' data beyond that.
+            Memory-mapped arrays (see :mod:`.array_outputs`) don't count towards it.
+            Defaults to no limit if not specified."""
+        },
+    )
+    persist_metric_results: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to also save the metric values of each trial as they are computed, to
+            `metric_results.jsonl` in the experiment directory. A resumed optimization then reads them
+            from there instead of fetching and computing them again for trials that had already completed.
+            Defaults to False if not specified."""
+        },
+    )
+    memoize_trials: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to reuse the metric values of an already evaluated parameterization instead of
+            running your model again, when a trial has the same parameters (and `model_options`, wrapper,
+            objective and script commands) as one evaluated before, such as duplicate points in spaces
+            of mostly choice or fixed parameters, or resumed or repeated experiments. The metric values
+            of completed trials are saved to a `trial_results` directory in the output directory (the
+            parent of the experiment directory), shared by all the experiments in it. Trials found there
+            are completed right away, without calling any of your wrapper's functions. Only use this with
+            deterministic models.
+            Defaults to False if not specified."""
+        },
+    )
+    storage_backend: Optional[StorageBackend | str] = field(
+        default=StorageBackend.JSON,
+        converter=converters.optional(StorageBackend.from_str_or_enum),
+        metadata={
+            "doc": """How BOA saves the scheduler state as trials finish.
+            `json` rewrites the full scheduler.json snapshot on every save.
+            `journal` appends only what changed since the last save to a
+            scheduler.journal.jsonl file next to the snapshot, and periodically compacts
+            the journal into a new full snapshot. Much faster for experiments with many trials.
+            `sqlite` saves to a local scheduler.db SQLite database next to where the snapshot
+            would go, only upserting what changed since the last save, in one transaction.
+            Resume from it by passing the .db file as the scheduler path.
+            Defaults to `json` if not specified."""
+        },
+    )
+    journal_compaction_interval: int = field(
+        default=1000,
+        metadata={
+            "doc": """Number of journal records to append before compacting the journal into a
+            new full scheduler snapshot. Only used with `storage_backend: journal`.
+            Defaults to 1000 if not specified."""
+        },
+    )
+    background_save: bool = field(
+        default=False,
+        metadata={
+            "doc": """Whether to write the scheduler state and optimization csv to disk on a background
+            thread, so running and polling trials doesn't wait on disk writes. Pending writes are
+            coalesced and always flushed when the optimization run ends, even on an error.
+            Defaults to False if not specified."""
+        },
+    )
+    min_save_interval: float = field(
+        default=0.0,
+        metadata={
+            "doc": """Minimum number of seconds between background writes of the scheduler state.
+            Saves requested in between are coalesced into one write.
+            Only used with `background_save: True`. Defaults to 0 if not specified."""
+        },
+    )
+    snapshot_backups: int = field(
+        default=1,
+        metadata={
+            "doc": """Number of previous scheduler.json snapshots to keep as rotated backups
+            (scheduler.json.1, scheduler.json.2, ...). Snapshots are always written to a temporary
+            file first and renamed into place. When resuming, if the newest snapshot can't be
+            loaded, the newest backup that can be is used instead.
+            Defaults to 1 if not specified."""
+        },
+    )
+    snapshot_compression: Optional[SnapshotCompression | str] = field(
+        default=None,
+        converter=converters.optional(SnapshotCompression.from_str_or_enum),
+        metadata={
+            "doc": """Compress scheduler snapshots, `gzip` (scheduler.json.gz) or `zstd` (scheduler.json.zst,
+            needs the `zstandard` package). Compressed snapshots are written as compact JSON, which
+            makes them much smaller and faster to write and load. The compression of a snapshot is
+            detected automatically when loading. Use `boa-convert` to convert existing snapshots.
+            Defaults to no compression if not specified."""
+        },
+    )
+    poll_workers: int = field(
+        default=1,
+        metadata={
+            "doc": """Number of trials whose status is checked at the same time when the scheduler polls
+            the running trials (each check calls your `set_trial_status`). With more than 1, slow status
+            checks (such as launching a `set_trial_status` script) run in parallel on a pool of this many
+            threads. Defaults to 1 (trials are checked one after another) if not specified."""
+        },
+    )
+    poll_timeout: Optional[float] = field(
+        default=None,
+        metadata={
+            "doc": """Seconds to wait on the status check of any one trial when polling with `poll_workers`
+            greater than 1. A trial whose check takes longer keeps its current status for this poll,
+            and its check keeps running in the background to be picked up by a later poll, so a hung
+            check doesn't hold up the rest of the optimization.
+            Defaults to waiting for every check if not specified."""
+        },
+    )
+    deploy_executor: Optional[ExecutorKind | str] = field(
+        default=ExecutorKind.THREAD,
+        converter=converters.optional(ExecutorKind.from_str_or_enum),
+        metadata={
+            "doc": """What runs your `write_configs` and `run_model` when several trials are deployed at once.
+            `thread` runs them on a pool of threads in the BOA process. `process` runs them on a pool of
+            separate processes, for python wrappers that do CPU heavy work in python before launching the
+            model (your wrapper must then be picklable, and changes it makes to itself or the trial in
+            `run_model` aren't seen by BOA, so neither is anything it starts for `stop_trial` to stop).
+            `process` can't be used with script commands (`run_model`, etc.).
+            The pool is kept for the whole optimization.
+            Defaults to `thread` if not specified."""
+        },
+    )
+    deploy_workers: Optional[int] = field(
+        default=None,
+        metadata={
+            "doc": """Maximum number of trials deployed at the same time.
+            Defaults to python's default number of workers for the `deploy_executor` if not specified."""
+        },
+    )
+    deploy_timeout: Optional[float] = field(
+        default=None,
+        metadata={
+            "doc": """Seconds to wait for any one trial to be deployed (`write_configs` and `run_model` to return)
+            when several trials are deployed at once. Trials that take longer are stopped with your
+            wrapper's `stop_trial` (which for script commands kills them and anything they started) and
+            marked failed, as are trials whose deployment raises an error, while the others carry on.
+            Each trial is timed from when it starts deploying, not while it waits for one of the
+            `deploy_workers`. Defaults to waiting for every trial if not specified."""
+        },
+    )
+    trial_timeout: Optional[float] = field(
+        default=None,
+        metadata={
+            "doc": """Seconds a trial may run for (from when it was deployed) before BOA stops it.
+            Trials running longer are found when polling their status, stopped with your wrapper's
+            `stop_trial` (which for script commands kills them and anything they started), and marked
+            as `trial_timeout_status`. Use this so models that hang or diverge don't hold on to one of
+            the trials that can run at once forever.
+            Defaults to no limit if not specified."""
+        },
+    )
+    trial_timeout_status: Optional[TimeoutStatus | str] = field(
+        default=TimeoutStatus.FAILED,
+        converter=converters.optional(TimeoutStatus.from_str_or_enum),
+        metadata={
+            "doc": """What to mark trials that run longer than `trial_timeout` as, `failed`
+            (which counts towards the failure rate that stops the optimization) or `abandoned`.
+            Defaults to `failed` if not specified."""
+        },
+    )
+    restore_cwd: bool = field(
+        default=True,
+        metadata={
+            "doc": """Whether BOA changes back to the starting directory after each of your wrapper
+            functions, in case they change directory. Changing directory affects the whole process,
+            so concurrent trials (see `deploy_workers` and `poll_workers`) can race on it.
+            Set to False to never change directory: your wrapper functions must then not change
+            directory themselves, but use `boa.current_working_dir()`, which is the `working_dir`,
+            and script commands are run in the `working_dir`.
+            Defaults to True if not specified."""
+        },
+    )
     base_path: Optional[PathLike] = field(
         default=".",
     )
@@ -416,6 +701,14 @@ class BOAScriptOptions(_Utils):
 
     def __attrs_post_init__(self):
 
+        if self.deploy_executor == ExecutorKind.PROCESS and any(
+            (self.run_model, self.write_configs, self.set_trial_status, self.fetch_trial_data)
+        ):
+            raise TypeError(
+                "The `process` deploy_executor can't be used with script commands, BOA needs to keep track"
+                " of the scripts it starts to stop them."
+            )
+
         if not self.base_path:
             if self.rel_to_config:
                 raise TypeError(
@@ -185,6 +185,8 @@ class Controller:
             final_msg = f"Error Completing because of {repr(e)}"
             raise
         finally:
+            scheduler.close_save_data()
+            scheduler.runner.shutdown(wait=False)
             self.logger.info(
                 f"\n{HEADER_BAR}"
                 f"\n{final_msg}"
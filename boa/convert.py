@@ -0,0 +1,36 @@
+"""
+###################################
+Scheduler Conversion CLI
+###################################
+
+Convert a saved scheduler between storage formats::
+
+    boa-convert path/to/scheduler.json path/to/scheduler.json.gz
+    or
+    python -m boa.convert path/to/scheduler.json path/to/scheduler.json.gz
+
+The output format is picked by the output file extension:
+``.json``, ``.json.gz``, ``.json.zst`` or ``.db``.
+
+"""
+
+import click
+
+from boa.storage import convert_scheduler_snapshot
+
+
+@click.command()
+@click.argument("scheduler_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("out_path", type=click.Path(dir_okay=False))
+def main(scheduler_path, out_path):
+    """
+    Convert the saved scheduler at SCHEDULER_PATH to the storage format
+    given by the extension of OUT_PATH (.json, .json.gz, .json.zst or .db).
+    """
+    out_path = convert_scheduler_snapshot(scheduler_path, out_path)
+    click.echo(f"Wrote {out_path}")
+    return out_path
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import logging
 import logging.config
 import logging.handlers
+import os
+import queue as queue_
 
 from boa.definitions import PathLike
 
 DEFAULT_LOG_LEVEL: int = logging.INFO
 ROOT_LOGGER_NAME = "boa"
+QUEUE_LOGGER_NAMES = (ROOT_LOGGER_NAME, "ax")
 
 
 def get_logger(name: str = ROOT_LOGGER_NAME, level: int = DEFAULT_LOG_LEVEL, filename=None) -> logging.Logger:
@@ -33,17 +36,61 @@ def get_logger(name: str = ROOT_LOGGER_NAME, level: int = DEFAULT_LOG_LEVEL, fil
 
 
 def set_handlers(logger, level=DEFAULT_LOG_LEVEL, filename=None):
-    if not any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
+    # a queue handler means this is a worker process that sends its logs to the main process
+    if not any(isinstance(h, (logging.StreamHandler, logging.handlers.QueueHandler)) for h in logger.handlers):
         sh: logging.StreamHandler = build_stream_handler(level=level)
         logger.addHandler(sh)
 
-    if filename is not None:
+    if filename is not None and not any(
+        isinstance(h, logging.FileHandler) and h.baseFilename == os.path.abspath(filename) for h in logger.handlers
+    ):
         fh = build_file_handler(level=level, filename=filename)
         logger.addHandler(fh)
 
     return logger
 
 
+class _DispatchHandler(logging.Handler):
+    """Hands records from the logging queue to the logger of the same name in this process,
+    so they go through the handlers set up here (such as by :meth:`.Controller.start_logger`)."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover  # handle doesn't call emit
+        pass
+
+
+def start_queue_listener(queue: queue_.Queue) -> logging.handlers.QueueListener:
+    """Start a listener in this (the main) process that logs the records other processes put in ``queue``.
+
+    Pair with :func:`init_queue_logging` in the other processes. Stop the listener
+    with ``listener.stop()`` once the other processes are done.
+    """
+    listener = logging.handlers.QueueListener(queue, _DispatchHandler())
+    listener.start()
+    return listener
+
+
+def init_queue_logging(queue: queue_.Queue) -> None:
+    """Send the logs of this (worker) process to ``queue`` instead of its own handlers,
+    to be logged by the main process's :func:`start_queue_listener`.
+
+    Meant as a process pool initializer, it replaces the handlers of the boa and ax
+    loggers, so calling it again doesn't add more handlers.
+    """
+    qh = logging.handlers.QueueHandler(queue)
+    for name in QUEUE_LOGGER_NAMES:
+        logger = logging.getLogger(name)
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(qh)
+        logger.propagate = False
+
+
 def get_formatter():
     fmt = "[%(levelname)s %(asctime)s %(processName)s %(threadName)s {%(filename)s:%(lineno)d}] %(name)s: %(message)s"
     formatter = logging.Formatter(fmt=fmt)
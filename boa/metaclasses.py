@@ -4,7 +4,7 @@ Meta Classes
 ########################
 
 Meta class modify class behaviors. For example, the :class:`.WrapperRegister` ensures that all subclasses of
-:class:`.BaseWrapper` will wrap functions in :func:`.cd_and_cd_back_dec`
+:class:`.BaseWrapper` will wrap functions in :func:`.wrapper_working_dir`
 to make sure that if users do any directory changes inside a wrapper function,
 the original directory is returned to afterwards.
 
@@ -19,7 +19,7 @@ from ax.storage.metric_registry import CORE_METRIC_REGISTRY
 from ax.storage.runner_registry import CORE_RUNNER_REGISTRY
 
 from boa.logger import get_logger
-from boa.wrappers.wrapper_utils import cd_and_cd_back_dec
+from boa.wrappers.wrapper_utils import wrapper_working_dir
 
 logger = get_logger()
 
@@ -36,15 +36,28 @@ def write_exception_to_log(func):
     return wrapper
 
 
+def in_wrapper_working_dir(func):
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with wrapper_working_dir(self):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 class WrapperRegister(ABCMeta):
     def __init__(cls, *args, **kwargs):
-        cls.load_config = write_exception_to_log(cd_and_cd_back_dec()(cls.load_config))
-        cls.mk_experiment_dir = write_exception_to_log(cd_and_cd_back_dec()(cls.mk_experiment_dir))
-        cls.write_configs = write_exception_to_log(cd_and_cd_back_dec()(cls.write_configs))
-        cls.run_model = write_exception_to_log(cd_and_cd_back_dec()(cls.run_model))
-        cls.set_trial_status = write_exception_to_log(cd_and_cd_back_dec()(cls.set_trial_status))
-        cls.fetch_trial_data = write_exception_to_log(cd_and_cd_back_dec()(cls.fetch_trial_data))
-        cls._fetch_trial_data = write_exception_to_log(cd_and_cd_back_dec()(cls._fetch_trial_data))
+        cls.load_config = write_exception_to_log(in_wrapper_working_dir(cls.load_config))
+        cls.mk_experiment_dir = write_exception_to_log(in_wrapper_working_dir(cls.mk_experiment_dir))
+        cls.write_configs = write_exception_to_log(in_wrapper_working_dir(cls.write_configs))
+        cls.run_model = write_exception_to_log(in_wrapper_working_dir(cls.run_model))
+        cls.set_trial_status = write_exception_to_log(in_wrapper_working_dir(cls.set_trial_status))
+        cls.run_model_batch = write_exception_to_log(in_wrapper_working_dir(cls.run_model_batch))
+        cls.set_trial_status_batch = write_exception_to_log(in_wrapper_working_dir(cls.set_trial_status_batch))
+        cls.fetch_trial_data = write_exception_to_log(in_wrapper_working_dir(cls.fetch_trial_data))
+        cls._fetch_trial_data = write_exception_to_log(in_wrapper_working_dir(cls._fetch_trial_data))
+        cls.fetch_trials_data = write_exception_to_log(in_wrapper_working_dir(cls.fetch_trials_data))
+        cls._fetch_trials_data = write_exception_to_log(in_wrapper_working_dir(cls._fetch_trials_data))
         try:
             _path = Path(sys.modules[cls.__module__].__file__)
         except AttributeError:  # running in a jupyter notebook `__file__` doesn't work
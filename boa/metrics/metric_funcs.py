@@ -12,15 +12,15 @@ import numpy as np
 import scipy.stats as stats
 import sklearn.metrics
 from sklearn.metrics import __all__ as sklearn_all
-from sklearn.metrics import mean_squared_error
 
 from boa.logger import get_logger
+from boa.metrics import streaming
 from boa.utils import get_dictionary_from_callable
 
 logger = get_logger()
 
 
-def normalized_root_mean_squared_error(y_true, y_pred, normalizer="iqr", **kwargs):
+def normalized_root_mean_squared_error(y_true, y_pred, normalizer="iqr", chunk_size=None, **kwargs):
     """Normalized root mean squared error
 
     Parameters
@@ -37,6 +37,10 @@ def normalized_root_mean_squared_error(y_true, y_pred, normalizer="iqr", **kwarg
         How to normalize the RMSE, options include iqr, std, mean, and range.
         (default iqr)
 
+    chunk_size : int, optional
+        Evaluate the arrays a chunk of this many values at a time, as is done for memory-mapped
+        arrays and iterators of chunks (see :mod:`.streaming`), whose IQR is estimated
+
     **kwargs
         see sklearn.metrics.mean_squared_error for additional options
 
@@ -45,7 +49,11 @@ def normalized_root_mean_squared_error(y_true, y_pred, normalizer="iqr", **kwarg
     nrmse : float or numpy.ndarray[float]
         A normalized version of RMSE
     """
-    rmse = mean_squared_error(y_true, y_pred, squared=False, **get_dictionary_from_callable(mean_squared_error, kwargs))
+    if streaming.is_streamed(y_true, y_pred, kwargs.get("sample_weight"), chunk_size=chunk_size):
+        func = streaming.normalized_root_mean_squared_error
+        return func(y_true, y_pred, normalizer, chunk_size=chunk_size, **get_dictionary_from_callable(func, kwargs))
+    func = streaming.mean_squared_error
+    rmse = func(y_true, y_pred, squared=False, **get_dictionary_from_callable(func, kwargs))
     if normalizer == "iqr":
         norm = stats.iqr(y_pred)
     elif normalizer == "std":
@@ -88,9 +88,8 @@ from __future__ import annotations
 
 from typing import Iterable, Type
 
-import numpy as np
-
 from boa.config import BOAMetric, MetricType
+from boa.metrics import streaming
 from boa.metrics.metric_funcs import get_sklearn_func
 from boa.metrics.metric_funcs import (
     normalized_root_mean_squared_error as normalized_root_mean_squared_error_,
@@ -164,11 +163,13 @@ class MeanSquaredError(BOASklearnMetric):
     ========
     :external:py:func:`sklearn.metrics.mean_squared_error`
         for the function parameters to guide your json attribute-value pairs needed.
+    :mod:`.streaming`
+        for evaluating ``y_true`` and ``y_pred`` too large to load in memory at once.
     :class:`.ModularMetric`
         For information on all parameters various metrics in general can be supplied
     """
 
-    _metric_to_eval = "mean_squared_error"
+    _metric_to_eval = streaming.mean_squared_error
 
     def __init__(self, lower_is_better=True, *args, **kwargs):
         super().__init__(lower_is_better=lower_is_better, *args, **kwargs)
@@ -186,11 +187,13 @@ class RootMeanSquaredError(BOASklearnMetric):
     ========
     :external:py:func:`sklearn.metrics.mean_squared_error`
         with  squared=False for the function parameters to guide your json attribute-value pairs needed.
+    :mod:`.streaming`
+        for evaluating ``y_true`` and ``y_pred`` too large to load in memory at once.
     :class:`.ModularMetric`
         For information on all parameters various metrics in general can be supplied
     """
 
-    _metric_to_eval = "mean_squared_error"
+    _metric_to_eval = streaming.mean_squared_error
 
     def __init__(
         self,
@@ -228,11 +231,13 @@ class RSquared(BOASklearnMetric):
     ========
     :external:py:func:`sklearn.metrics.r2_score`
         for the function parameters to guide your json attribute-value pairs needed.
+    :mod:`.streaming`
+        for evaluating ``y_true`` and ``y_pred`` too large to load in memory at once.
     :class:`.ModularMetric`
         For information on all parameters various metrics in general can be supplied
     """
 
-    _metric_to_eval = "r2_score"
+    _metric_to_eval = streaming.r2_score
 
     def __init__(self, lower_is_better=True, *args, **kwargs):
         super().__init__(lower_is_better=lower_is_better, *args, **kwargs)
@@ -252,11 +257,13 @@ class Mean(ModularMetric):
     ========
     :external:py:func:`numpy.mean`
         for the function parameters to guide your json attribute-value pairs needed.
+    :mod:`.streaming`
+        for evaluating ``y_true`` and ``y_pred`` too large to load in memory at once.
     :class:`.ModularMetric`
         For information on all parameters various metrics in general can be supplied
     """
 
-    _metric_to_eval = np.mean
+    _metric_to_eval = streaming.mean
 
     def __init__(self, lower_is_better=True, *args, **kwargs):
         super().__init__(lower_is_better=lower_is_better, *args, **kwargs)
@@ -276,6 +283,8 @@ class NormalizedRootMeanSquaredError(ModularMetric):
     ========
     :func:`.normalized_root_mean_squared_error`
         for the function parameters to guide your json attribute-value pairs needed.
+    :mod:`.streaming`
+        for evaluating ``y_true`` and ``y_pred`` too large to load in memory at once.
     :class:`.ModularMetric`
         For information on all parameters various metrics in general can be supplied
     """
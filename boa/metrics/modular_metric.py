@@ -8,12 +8,16 @@ Modular Metric
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
+from collections.abc import MutableMapping
 from functools import partial
 from typing import Any, Callable, Optional
 
+import numpy as np
 import pandas as pd
-from ax import Data, Metric, Trial
-from ax.core.metric import MetricFetchE
+from ax import Data, Experiment, Metric, Trial
+from ax.core.base_trial import BaseTrial
+from ax.core.metric import MetricFetchE, MetricFetchResult
 from ax.core.types import TParameterization
 from ax.metrics.noisy_function import NoisyFunctionMetric
 from ax.utils.common.result import Err, Ok
@@ -26,6 +30,7 @@ from boa.utils import (
     serialize_init_args,
 )
 from boa.wrappers.base_wrapper import BaseWrapper
+from boa.wrappers.metric_cache import ResultCache, trial_key
 
 logger = logging.getLogger(__file__)
 
@@ -156,7 +161,7 @@ class ModularMetric(NoisyFunctionMetric, metaclass=MetricRegister):
             **get_dictionary_from_callable(NoisyFunctionMetric.__init__, kwargs),
         )
         self.properties = properties or {}
-        self._trial_data_cache = {}
+        self._result_cache = None  # made on first use, by when the wrapper is set
         self.check_for_nans = check_for_nans
 
     @classmethod
@@ -167,9 +172,143 @@ class ModularMetric(NoisyFunctionMetric, metaclass=MetricRegister):
     def weight(self):
         return self._weight
 
+    @property
+    def _trial_data_cache(self) -> MutableMapping:
+        """This metric's results by :func:`.trial_key`, see :meth:`.BaseWrapper.make_result_cache`"""
+        if getattr(self, "_result_cache", None) is None:
+            self._result_cache = self.wrapper.make_result_cache(self.name) if self.wrapper else ResultCache(self.name)
+        return self._result_cache
+
+    @property
+    def fetch_multi_group_by_metric(self) -> type[Metric]:
+        # fetch the data of all modular metrics of an experiment together, see `bulk_fetch_experiment_data`
+        return ModularMetric
+
     def fetch_trial_data(self, trial: Trial, **kwargs):
-        if trial.index in self._trial_data_cache:
-            return Ok(Data(df=pd.DataFrame(self._trial_data_cache[trial.index])))
+        columns = self._fetch_trial_columns(trial, **kwargs)
+        if isinstance(columns, Err):
+            return columns
+        return Ok(Data(df=pd.DataFrame(columns)))
+
+    def bulk_fetch_trial_data(self, trial: Trial, metrics: list[Metric], **kwargs) -> dict[str, MetricFetchResult]:
+        return self.bulk_fetch_experiment_data(trial.experiment, metrics, trials=[trial], **kwargs)[trial.index]
+
+    def bulk_fetch_experiment_data(
+        self,
+        experiment: Experiment,
+        metrics: list[Metric],
+        trials: Optional[list[BaseTrial]] = None,
+        **kwargs,
+    ) -> dict[int, dict[str, MetricFetchResult]]:
+        """Fetch the data of several metrics for several trials at once.
+
+        The inputs of all the metrics for all the trials are first fetched with one call to
+        each wrapper's :meth:`~.BaseWrapper.fetch_trials_data`, and the metric values are
+        gathered into one data frame, instead of one per trial and metric.
+        """
+        trials = list(experiment.trials.values()) if trials is None else trials
+        experiment.validate_trials(trials=trials)
+        trials = [trial for trial in trials if trial.status.expecting_data]
+        results = {trial.index: {} for trial in trials}
+        if not trials:
+            return results
+
+        # one call per wrapper for every metric's inputs for all the trials
+        wrappers = {}
+        for metric in metrics:
+            if isinstance(metric, ModularMetric) and metric.wrapper is not None:
+                wrappers.setdefault(id(metric.wrapper), (metric.wrapper, {}))[1][metric.name] = metric.param_names
+        keys = {trial.index: trial_key(trial) for trial in trials}
+        for wrapper, param_names in wrappers.values():
+            uncached = [
+                trial
+                for trial in trials
+                if not trial.run_metadata.get("memoized")
+                and any(keys[trial.index] not in m._trial_data_cache for m in metrics if m.name in param_names)
+            ]
+            try:
+                wrapper._fetch_trials_data(uncached, param_names=param_names, **kwargs)
+            except Exception as e:
+                # each trial's data is fetched on its own below instead
+                logger.exception(f"Error fetching the data of trials {[t.index for t in uncached]} at once: {e!r}")
+
+        chunks = []  # the columns of each trial and metric
+        for trial in trials:
+            for metric in metrics:
+                if not isinstance(metric, ModularMetric) or type(metric).fetch_trial_data is not (
+                    ModularMetric.fetch_trial_data
+                ):
+                    results[trial.index][metric.name] = metric.fetch_trial_data(trial, **kwargs)
+                    continue
+                trial_columns = metric._fetch_trial_columns(trial, **kwargs)
+                if isinstance(trial_columns, Err):
+                    results[trial.index][metric.name] = trial_columns
+                    continue
+                chunks.append(trial_columns)
+        if chunks:
+            # some metrics can have columns others don't, such as wrapped Ax metrics
+            names = list(dict.fromkeys(name for chunk in chunks for name in chunk))
+            columns = {name: [] for name in names}
+            for chunk in chunks:
+                n_rows = len(chunk["arm_name"])
+                for name in names:
+                    columns[name].extend(chunk.get(name, [None] * n_rows))
+            data = Data(df=pd.DataFrame(columns))
+            for (trial_index, metric_name), df in data.df.groupby(["trial_index", "metric_name"], sort=False):
+                results[trial_index][metric_name] = Ok(Data(df=df))
+        return results
+
+    def fetch_data_prefer_lookup(
+        self,
+        experiment: Experiment,
+        metrics: list[Metric],
+        trials: Optional[list[BaseTrial]] = None,
+        **kwargs,
+    ) -> tuple[dict[int, dict[str, MetricFetchResult]], bool]:
+        """The same as Ax's, except that the data not yet on the experiment is fetched for
+        all the completed trials with one call to :meth:`bulk_fetch_experiment_data`
+        (per set of missing metrics), instead of one call per trial."""
+        if self.is_available_while_running():
+            return super().fetch_data_prefer_lookup(experiment, metrics, trials=trials, **kwargs)
+        completed_trials = (
+            experiment.completed_trials if trials is None else [t for t in trials if t.status.is_completed]
+        )
+        if not completed_trials:
+            return {}, False
+
+        metric_names = [metric.name for metric in metrics]
+        results = {trial.index: {} for trial in completed_trials}
+        cached = experiment.lookup_data(trial_indices=list(results)).df
+        if not cached.empty:
+            cached = cached[cached["metric_name"].isin(metric_names)]
+            for (trial_index, metric_name), df in cached.groupby(["trial_index", "metric_name"], sort=False):
+                results[trial_index][metric_name] = Ok(Data(df=df))
+
+        # trials by the names of their metrics with no data yet
+        trials_by_missing = defaultdict(list)
+        for trial in completed_trials:
+            missing = tuple(name for name in metric_names if name not in results[trial.index])
+            if missing:
+                trials_by_missing[missing].append(trial)
+        contains_new_data = False
+        for missing, missing_trials in trials_by_missing.items():
+            missing_metrics = [metric for metric in metrics if metric.name in missing]
+            fetched = self.bulk_fetch_experiment_data(experiment, missing_metrics, trials=missing_trials, **kwargs)
+            for trial_index, trial_results in fetched.items():
+                results[trial_index].update(trial_results)
+                contains_new_data = contains_new_data or any(result.is_ok() for result in trial_results.values())
+        return results, contains_new_data
+
+    def _fetch_trial_columns(self, trial: Trial, **kwargs) -> dict[str, list] | Err:
+        """The data of ``trial`` for this metric as data frame columns, or the error fetching it"""
+        key = trial_key(trial)
+        if key in self._trial_data_cache:
+            return self._trial_data_cache[key]
+        if trial.run_metadata.get("memoized"):
+            columns = self._memoized_columns(trial)
+            if not isinstance(columns, Err):
+                self._trial_data_cache[key] = columns
+            return columns
         wrapper_kwargs = (
             self.wrapper._fetch_trial_data(
                 parameters=trial.arm.parameters,
@@ -211,20 +350,84 @@ class ModularMetric(NoisyFunctionMetric, metaclass=MetricRegister):
                     trial=trial,
                     **get_dictionary_from_callable(self.metric_to_eval.fetch_trial_data, safe_kwargs),
                 )
+                if isinstance(trial_data, Err):
+                    return trial_data
+                columns = trial_data.unwrap().df.to_dict(orient="list")
             else:
-                trial_data = super().fetch_trial_data(trial=trial, **safe_kwargs)
-            if "sem" in safe_kwargs and not isinstance(trial_data, Err):
-                trial_df = trial_data.unwrap().df
-                trial_df["sem"] = safe_kwargs["sem"]
-                trial_data = Ok(Data(df=trial_df))
-            if not isinstance(trial_data, Err):
-                self._trial_data_cache[trial.index] = trial_data.unwrap().df.to_dict(
-                    orient="list"
-                )  # the format ax uses to put them in
+                columns = self._evaluate_columns(trial, noisy=safe_kwargs.get("noisy", True))
+                if isinstance(columns, Err):
+                    return columns
+            if "sem" in safe_kwargs:
+                columns["sem"] = [safe_kwargs["sem"]] * len(columns["arm_name"])
+            self._trial_data_cache[key] = columns  # the format ax uses to put them in
         finally:
             # We remove the extra parameters from the arms for json serialization
             [arm._parameters.pop("kwargs") for arm in trial.arms_by_name.values()]
-        return trial_data
+        self._memoize(trial, columns)
+        return columns
+
+    def _memoized_columns(self, trial: Trial) -> dict[str, list] | Err:
+        """The data of a memoized trial (see ``memoize_trials``), from its wrapper's trial store"""
+        store = self.wrapper._get_trial_store() if self.wrapper else None
+        entry = store.get(trial.run_metadata["memoized"]) if store is not None else None
+        if entry is None or self.name not in entry["metrics"]:
+            m = f"No memoized results of trial {trial.index} for metric {self.name}"
+            return Err(MetricFetchE(message=m, exception=KeyError(m)))
+        result = entry["metrics"][self.name]
+        sem = result["sem"] if result["sem"] is not None else float("nan")
+        return {
+            "arm_name": [trial.arm.name],
+            "metric_name": [self.name],
+            "mean": [result["mean"]],
+            "sem": [sem],
+            "trial_index": [trial.index],
+            "n": [10000],
+            "frac_nonnull": [result["mean"]],
+        }
+
+    def _memoize(self, trial: Trial, columns: dict[str, list]) -> None:
+        """Add the value of a trial to its wrapper's trial store, if it has one"""
+        store = self.wrapper._get_trial_store() if self.wrapper else None
+        if store is None or len(trial.arms) != 1:
+            return
+        try:
+            store.add(
+                self.wrapper.memoization_key(trial),
+                parameters=trial.arm.parameters,
+                metric_name=self.name,
+                mean=columns["mean"][0],
+                sem=columns["sem"][0],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to save the results of trial {trial.index} for metric {self.name}: {e!r}")
+
+    def _evaluate_columns(self, trial: Trial, noisy: bool = True) -> dict[str, list] | Err:
+        """The same as :meth:`NoisyFunctionMetric.fetch_trial_data`, without making a data frame"""
+        try:
+            noise_sd = self.noise_sd if noisy else 0.0
+            arm_names = []
+            mean = []
+            for name, arm in trial.arms_by_name.items():
+                arm_names.append(name)
+                val = self._evaluate(params=arm.parameters)
+                if noise_sd:
+                    val = val + noise_sd * np.random.randn()
+                mean.append(val)
+            # indicate unknown noise level in data
+            if noise_sd is None:
+                noise_sd = float("nan")
+            n_arms = len(arm_names)
+            return {
+                "arm_name": arm_names,
+                "metric_name": [self.name] * n_arms,
+                "mean": mean,
+                "sem": [noise_sd] * n_arms,
+                "trial_index": [trial.index] * n_arms,
+                "n": [10000 / n_arms] * n_arms,
+                "frac_nonnull": list(mean),
+            }
+        except Exception as e:
+            return Err(MetricFetchE(message=f"Failed to fetch {self.name}", exception=e))
 
     def _evaluate(self, params: TParameterization, **kwargs) -> float:
         kwargs.update(params.pop("kwargs"))
@@ -240,7 +443,9 @@ class ModularMetric(NoisyFunctionMetric, metaclass=MetricRegister):
         """Create a copy of this Metric."""
         cls = type(self)
         return cls(
-            **serialize_init_args(self, parents=[NoisyFunctionMetric], match_private=True),
+            **serialize_init_args(
+                self, parents=[NoisyFunctionMetric], match_private=True, exclude_fields=["result_cache"]
+            ),
         )
 
     def to_dict(self) -> dict:
@@ -267,7 +472,7 @@ class ModularMetric(NoisyFunctionMetric, metaclass=MetricRegister):
         parents_b4_metric = parents[:index_of_metric]
 
         return serialize_init_args(
-            class_=obj, parents=parents_b4_metric, match_private=True, exclude_fields=["wrapper"]
+            class_=obj, parents=parents_b4_metric, match_private=True, exclude_fields=["wrapper", "result_cache"]
         )
 
     @classmethod
@@ -0,0 +1,396 @@
+"""
+########################
+Streaming Metrics
+########################
+
+Metric functions that can evaluate ``y_true`` and ``y_pred`` too large to hold in memory,
+by reading them a chunk at a time and only keeping running sums (sufficient statistics).
+:class:`.MeanSquaredError`, :class:`.RootMeanSquaredError`, :class:`.RSquared`,
+:class:`.Mean` and :class:`.NormalizedRootMeanSquaredError` use them.
+
+Inputs are streamed when they are
+
+* memory-mapped arrays (:class:`numpy.memmap`), such as ``.npy`` and uncompressed ``.npz``
+  output files (see :mod:`.array_outputs`), read ``chunk_size`` values at a time
+* iterators of chunks, such as a generator reading your model output one file or time step
+  at a time. The chunks of ``y_true``, ``y_pred`` (and ``sample_weight``) don't need to line up,
+  as long as they add up to the same number of rows (samples)
+
+or when you pass a ``chunk_size``, which you can set in your metric's ``metric_func_kwargs``.
+Otherwise, the results are exactly the same as scikit-learn's and numpy's.
+
+The ``iqr`` normalizer of :func:`.normalized_root_mean_squared_error` is computed from a
+:class:`StreamingHistogram` of ``y_pred``, accurate to within ``4 * (max(y_pred) - min(y_pred)) / bins``.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Optional
+
+import numpy as np
+import sklearn.metrics
+
+# number of values read at a time from memory-mapped arrays by default, 8 MB of float64
+DEFAULT_CHUNK_SIZE = 2**20
+DEFAULT_BINS = 2**14
+
+
+def is_streamed(*arrays, chunk_size: Optional[int] = None) -> bool:
+    """Whether any of ``arrays`` is memory-mapped or an iterator of chunks, or a ``chunk_size`` is given"""
+    return chunk_size is not None or any(isinstance(a, (np.memmap, Iterator)) for a in arrays)
+
+
+def _iter_chunks(array, chunk_size: int) -> Iterator[np.ndarray]:
+    if isinstance(array, Iterator):
+        for chunk in array:
+            yield np.asarray(chunk)
+        return
+    array = array if isinstance(array, np.ndarray) else np.asarray(array)
+    row_size = int(np.prod(array.shape[1:])) if array.ndim > 1 else 1
+    rows = max(1, chunk_size // max(row_size, 1))
+    for start in range(0, len(array), rows):
+        yield np.asarray(array[start : start + rows])
+
+
+def iter_aligned_chunks(*arrays, chunk_size: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Iterate over ``arrays`` (arrays, memory-mapped arrays, or iterators of chunks) together,
+    a chunk of the same rows of each at a time. Arrays that are None stay None.
+
+    Raises
+    ------
+    ValueError
+        If the arrays don't have the same number of rows
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    present = [i for i, array in enumerate(arrays) if array is not None]
+    iterators = {i: _iter_chunks(arrays[i], chunk_size) for i in present}
+    buffers = {i: None for i in present}
+    while True:
+        for i in present:
+            while buffers[i] is None or len(buffers[i]) == 0:
+                buffers[i] = next(iterators[i], None)
+                if buffers[i] is None:
+                    break
+        done = [buffers[i] is None for i in present]
+        if all(done):
+            return
+        if any(done):
+            raise ValueError("Found input variables with inconsistent numbers of samples")
+        n_rows = min(len(buffers[i]) for i in present)
+        chunks = [None] * len(arrays)
+        for i in present:
+            chunks[i], buffers[i] = buffers[i][:n_rows], buffers[i][n_rows:]
+        yield tuple(chunks)
+
+
+def _as_2d(chunk: np.ndarray) -> np.ndarray:
+    chunk = np.asarray(chunk, dtype=np.float64)
+    return chunk.reshape(-1, 1) if chunk.ndim == 1 else chunk
+
+
+class StreamingMoments:
+    """
+    Running (weighted) count, mean and sum of squared deviations from the mean of each column,
+    merged chunk by chunk (Chan et al.'s parallel algorithm), so the variance of data larger
+    than memory can be computed without losing precision.
+    """
+
+    def __init__(self):
+        self.count = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray, weights: Optional[np.ndarray] = None, axis: Optional[int] = 0):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        if weights is None:
+            count = values.shape[0] if axis == 0 else values.size
+            mean = values.mean(axis=axis)
+            m2 = ((values - mean) ** 2).sum(axis=axis)
+        else:
+            weights = np.asarray(weights, dtype=np.float64).reshape((-1,) + (1,) * (values.ndim - 1))
+            count = weights.sum()
+            mean = (weights * values).sum(axis=0) / count
+            m2 = (weights * (values - mean) ** 2).sum(axis=0)
+        self.min = np.minimum(self.min, values.min(axis=axis))
+        self.max = np.maximum(self.max, values.max(axis=axis))
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.m2 = self.m2 + m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def variance(self, ddof: int = 0):
+        return self.m2 / (self.count - ddof)
+
+
+class StreamingHistogram:
+    """
+    Histogram of a stream of values with a fixed number of equal width ``bins``, whose range
+    doubles as values outside of it come in, to estimate quantiles in fixed memory.
+    Quantiles are accurate to within one bin width, at most ``4 * (max - min) / bins``.
+
+    Parameters
+    ----------
+    bins
+        Number of bins, even
+    """
+
+    def __init__(self, bins: int = DEFAULT_BINS):
+        if bins < 2 or bins % 2:
+            raise ValueError("bins must be an even number of at least 2")
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.has_nan = False
+        self.lo = None
+        self.width = None
+
+    @property
+    def hi(self) -> float:
+        return self.lo + self.width * self.bins
+
+    def _merge_pairs(self) -> np.ndarray:
+        self.width *= 2
+        return self.counts.reshape(-1, 2).sum(axis=1)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        nan = np.isnan(values)
+        if nan.any():
+            self.has_nan = True
+            values = values[~nan]
+        if values.size == 0:
+            return
+        vmin, vmax = values.min(), values.max()
+        self.min, self.max = min(self.min, vmin), max(self.max, vmax)
+        if self.lo is None:
+            self.lo = vmin
+            span = vmax - vmin
+            self.width = span / self.bins if span > 0 else max(abs(vmin), 1.0) * 2**-30
+            # so the maximum falls in the last bin instead of just past it
+            self.width = np.nextafter(self.width, np.inf)
+        while vmin < self.lo:
+            self.lo -= self.width * self.bins
+            self.counts = np.concatenate([np.zeros(self.bins // 2, dtype=np.int64), self._merge_pairs()])
+        while vmax >= self.hi:
+            self.counts = np.concatenate([self._merge_pairs(), np.zeros(self.bins // 2, dtype=np.int64)])
+        index = ((values - self.lo) / self.width).astype(np.int64)
+        np.clip(index, 0, self.bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.bins)
+        self.count += values.size
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the ``q`` quantile (between 0 and 1), interpolated like :func:`numpy.quantile`"""
+        if self.has_nan:
+            return np.nan
+        if self.count == 0:
+            raise ValueError("No values to take the quantile of")
+        if q <= 0 or q >= 1:
+            return float(self.min if q <= 0 else self.max)
+        rank = (self.count - 1) * q
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, rank, side="right"))
+        before = cumulative[index - 1] if index > 0 else 0
+        # values are taken to be evenly spread across their bin
+        fraction = (rank - before + 0.5) / self.counts[index]
+        return float(np.clip(self.lo + (index + fraction) * self.width, self.min, self.max))
+
+
+def _average(values: np.ndarray, multioutput, variance_weights: Optional[np.ndarray] = None):
+    if isinstance(multioutput, str):
+        if multioutput == "raw_values":
+            return values
+        if multioutput == "uniform_average":
+            return float(np.average(values))
+        if multioutput == "variance_weighted" and variance_weights is not None:
+            if not np.any(variance_weights):
+                return float(np.average(values))
+            return float(np.average(values, weights=variance_weights))
+        raise ValueError(f"Invalid multioutput: {multioutput!r}")
+    return float(np.average(values, weights=multioutput))
+
+
+def _squared_errors(y_true, y_pred, sample_weight=None, chunk_size=None) -> tuple[np.ndarray, float]:
+    """Sum of (weighted) squared errors of each output, and the sum of weights"""
+    sum_squares, total_weight = 0.0, 0.0
+    for true, pred, weight in iter_aligned_chunks(y_true, y_pred, sample_weight, chunk_size=chunk_size):
+        squares = (_as_2d(true) - _as_2d(pred)) ** 2
+        if weight is None:
+            sum_squares = sum_squares + squares.sum(axis=0)
+            total_weight += squares.shape[0]
+        else:
+            weight = np.asarray(weight, dtype=np.float64)
+            sum_squares = sum_squares + (weight[:, None] * squares).sum(axis=0)
+            total_weight += weight.sum()
+    if not total_weight:
+        raise ValueError("Found empty input arrays")
+    return np.atleast_1d(sum_squares), total_weight
+
+
+def mean_squared_error(
+    y_true,
+    y_pred,
+    *,
+    sample_weight=None,
+    multioutput="uniform_average",
+    squared: bool = True,
+    chunk_size: Optional[int] = None,
+):
+    """
+    Mean squared error (or its root, with ``squared=False``), the same as
+    :func:`sklearn.metrics.mean_squared_error`, except that streamed inputs (see
+    :mod:`.streaming`) are evaluated a chunk at a time.
+
+    Parameters
+    ----------
+    chunk_size
+        Number of values to read at a time from memory-mapped arrays, evaluates
+        in-memory arrays a chunk at a time too if given
+    """
+    if not is_streamed(y_true, y_pred, sample_weight, chunk_size=chunk_size):
+        kwargs = dict(sample_weight=sample_weight, multioutput=multioutput)
+        if squared:
+            return sklearn.metrics.mean_squared_error(y_true, y_pred, **kwargs)
+        if hasattr(sklearn.metrics, "root_mean_squared_error"):
+            return sklearn.metrics.root_mean_squared_error(y_true, y_pred, **kwargs)
+        return sklearn.metrics.mean_squared_error(y_true, y_pred, squared=False, **kwargs)
+    sum_squares, total_weight = _squared_errors(y_true, y_pred, sample_weight, chunk_size=chunk_size)
+    errors = sum_squares / total_weight
+    if not squared:
+        errors = np.sqrt(errors)
+    return _average(errors, multioutput)
+
+
+def r2_score(
+    y_true,
+    y_pred,
+    *,
+    sample_weight=None,
+    multioutput="uniform_average",
+    force_finite: bool = True,
+    chunk_size: Optional[int] = None,
+):
+    """
+    :math:`R^2` (coefficient of determination), the same as :func:`sklearn.metrics.r2_score`,
+    except that streamed inputs (see :mod:`.streaming`) are evaluated a chunk at a time.
+
+    Parameters
+    ----------
+    chunk_size
+        Number of values to read at a time from memory-mapped arrays, evaluates
+        in-memory arrays a chunk at a time too if given
+    """
+    if not is_streamed(y_true, y_pred, sample_weight, chunk_size=chunk_size):
+        return sklearn.metrics.r2_score(
+            y_true, y_pred, sample_weight=sample_weight, multioutput=multioutput, force_finite=force_finite
+        )
+    residual, total = 0.0, StreamingMoments()
+    for true, pred, weight in iter_aligned_chunks(y_true, y_pred, sample_weight, chunk_size=chunk_size):
+        true, pred = _as_2d(true), _as_2d(pred)
+        squares = (true - pred) ** 2
+        if weight is not None:
+            squares = np.asarray(weight, dtype=np.float64)[:, None] * squares
+        residual = residual + squares.sum(axis=0)
+        total.update(true, weights=weight)
+    if total.count < 2:
+        return np.nan  # sklearn warns and returns nan for less than two samples too
+    residual, variance = np.atleast_1d(residual), np.atleast_1d(total.m2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = 1 - residual / variance
+    if force_finite:
+        constant = variance == 0
+        scores[constant] = np.where(residual[constant] == 0, 1.0, 0.0)
+    return _average(scores, multioutput, variance_weights=variance)
+
+
+def mean(a, axis: Optional[int] = None, dtype=None, *, chunk_size: Optional[int] = None):
+    """
+    Arithmetic mean, the same as :func:`numpy.mean`, except that streamed inputs (see
+    :mod:`.streaming`) are evaluated a chunk at a time, over all values or along ``axis=0``.
+
+    Parameters
+    ----------
+    chunk_size
+        Number of values to read at a time from memory-mapped arrays, evaluates
+        in-memory arrays a chunk at a time too if given
+    """
+    if not is_streamed(a, chunk_size=chunk_size):
+        return np.mean(a, axis=axis, dtype=dtype)
+    if axis not in (None, 0):
+        raise ValueError("The mean of streamed arrays can only be taken over all values or along axis 0")
+    total, count = 0.0, 0
+    for (chunk,) in iter_aligned_chunks(a, chunk_size=chunk_size):
+        chunk = np.asarray(chunk)
+        total = total + chunk.sum(axis=axis, dtype=dtype or np.float64)
+        count += chunk.size if axis is None else chunk.shape[0]
+    result = np.divide(total, count)
+    return result.astype(dtype) if dtype is not None else result
+
+
+def normalized_root_mean_squared_error(
+    y_true,
+    y_pred,
+    normalizer: str = "iqr",
+    sample_weight=None,
+    multioutput="uniform_average",
+    chunk_size: Optional[int] = None,
+    bins: int = DEFAULT_BINS,
+):
+    """
+    Normalized root mean squared error of streamed inputs (see :mod:`.streaming`), evaluated
+    a chunk at a time, see :func:`.metric_funcs.normalized_root_mean_squared_error`.
+
+    Parameters
+    ----------
+    bins
+        Number of bins of the histogram of ``y_pred`` the ``iqr`` normalizer is estimated from
+    """
+    if normalizer not in ("iqr", "std", "mean", "range"):
+        raise ValueError("normalizer must be 'iqr', 'std', 'mean', or 'range'.")
+    sum_squares, total_weight = 0.0, 0.0
+    histogram, moments = StreamingHistogram(bins), StreamingMoments()
+    for true, pred, weight in iter_aligned_chunks(y_true, y_pred, sample_weight, chunk_size=chunk_size):
+        squares = (_as_2d(true) - _as_2d(pred)) ** 2
+        if weight is None:
+            sum_squares = sum_squares + squares.sum(axis=0)
+            total_weight += squares.shape[0]
+        else:
+            weight = np.asarray(weight, dtype=np.float64)
+            sum_squares = sum_squares + (weight[:, None] * squares).sum(axis=0)
+            total_weight += weight.sum()
+        # the normalizers are of all the predicted values, unweighted
+        if normalizer == "iqr":
+            histogram.update(pred)
+        else:
+            moments.update(pred, axis=None)
+    if not total_weight:
+        raise ValueError("Found empty input arrays")
+    rmse = _average(np.sqrt(np.atleast_1d(sum_squares) / total_weight), multioutput)
+    if normalizer == "iqr":
+        norm = histogram.quantile(0.75) - histogram.quantile(0.25)
+    elif normalizer == "std":
+        norm = np.sqrt(moments.variance(ddof=1))
+    elif normalizer == "mean":
+        norm = moments.mean
+    else:
+        norm = moments.max - moments.min
+    return rmse / norm
+
+
+__all__ = [
+    "StreamingHistogram",
+    "StreamingMoments",
+    "is_streamed",
+    "iter_aligned_chunks",
+    "mean",
+    "mean_squared_error",
+    "normalized_root_mean_squared_error",
+    "r2_score",
+]
@@ -10,6 +10,8 @@ of your optimization with::
     or
     python -m boa.plot path/to/scheduler.json
 
+For large optimizations, ``--summary-only`` shows just the trials and
+best trials, without restoring the whole scheduler, which is much faster.
 
 """
 
@@ -20,11 +22,13 @@ import click
 import panel as pn
 
 import boa.plotting
-from boa.plotting import app_view
+from boa.plotting import app_view, summary_view
+
+_VIEWS = ("app_view", "summary_view")
 
 
 @click.command(
-    epilog=f"Name of Plots to be added here: {', '.join(plot for plot in boa.plotting.__all__ if plot != 'app_view')}"
+    epilog=f"Name of Plots to be added here: {', '.join(plot for plot in boa.plotting.__all__ if plot not in _VIEWS)}"
 )
 @click.option(
     "-sp",
@@ -33,13 +37,22 @@ from boa.plotting import app_view
     default="",
     help="Path to scheduler json file.",
 )
-def main(scheduler_path):
+@click.option(
+    "--summary-only",
+    is_flag=True,
+    default=False,
+    help="Only show a table of the trials and the best trials, without restoring the whole scheduler.",
+)
+def main(scheduler_path, summary_only):
     """
     Launch a basic EDA plot view of your optimization.
     Creating a web app with the scheduler json file.
 
     """
-    template = app_view(scheduler=scheduler_path)
+    if summary_only:
+        template = summary_view(scheduler=scheduler_path)
+    else:
+        template = app_view(scheduler=scheduler_path)
     pn.serve({pathlib.Path(__file__).name: template})
 
 
@@ -26,9 +26,14 @@ from ax.service.utils.report_utils import exp_to_df
 
 from boa.definitions import PathLike_tup
 from boa.scheduler import Scheduler
-from boa.storage import scheduler_from_json_file
+from boa.storage import (
+    SchedulerSnapshot,
+    scheduler_from_json_file,
+    scheduler_to_json_snapshot,
+)
 
 SchedulerOrPath = Union[Scheduler, os.PathLike, str]
+SchedulerOrSnapshot = Union[Scheduler, SchedulerSnapshot, os.PathLike, str]
 SchedulersOrPathList = Union[List[Scheduler], List[Union[os.PathLike, str]], Scheduler, os.PathLike, str]
 
 
@@ -43,6 +48,7 @@ __all__ = [
     "plot_slice",
     "scheduler_to_df",
     "app_view",
+    "summary_view",
 ]
 
 
@@ -69,7 +75,7 @@ def _maybe_load_schedulers(schedulers: SchedulersOrPathList):
     return schedulers
 
 
-def scheduler_to_df(scheduler: SchedulerOrPath, **kwargs) -> pd.DataFrame:
+def scheduler_to_df(scheduler: SchedulerOrSnapshot, **kwargs) -> pd.DataFrame:
     """
     Transforms an scheduler's experiment to a DataFrame with rows keyed by trial_index
     and arm_name, metrics pivoted into one row. If the pivot results in more than
@@ -81,7 +87,9 @@ def scheduler_to_df(scheduler: SchedulerOrPath, **kwargs) -> pd.DataFrame:
     Parameters
     ----------
     scheduler
-        Initialized scheduler or path to `scheduler.json file`.
+        Initialized scheduler, :class:`.SchedulerSnapshot` or path to `scheduler.json file`.
+        For a snapshot or path, without any ``kwargs``, the table is made with
+        :meth:`.SchedulerSnapshot.summary` without restoring the scheduler.
     **kwargs
         key word arguments to pass to AXs `exp_to_df`
 
@@ -91,6 +99,10 @@ def scheduler_to_df(scheduler: SchedulerOrPath, **kwargs) -> pd.DataFrame:
     ``map_keys``, if present). If no trials are available, returns an empty
     dataframe.
     """
+    if isinstance(scheduler, PathLike_tup):
+        scheduler = SchedulerSnapshot.from_file(scheduler)
+    if isinstance(scheduler, SchedulerSnapshot) and not kwargs:
+        return scheduler.summary()
     experiment = scheduler.experiment
     return exp_to_df(exp=experiment, **kwargs)
 
@@ -446,3 +458,35 @@ def app_view(
     )
 
     return template.servable()
+
+
+def summary_view(scheduler: SchedulerOrSnapshot, n_best: int = 5):
+    """Creates a web view of the trials and the best trials of a scheduler,
+    without restoring the whole scheduler if given a path to one (see :class:`.SchedulerSnapshot`).
+
+    Parameters
+    ----------
+    scheduler
+        Initialized scheduler, :class:`.SchedulerSnapshot` or path to `scheduler.json file`.
+    n_best
+        Number of best trials to show for single objective optimizations
+        (multi objective optimizations show the whole Pareto front)
+    """
+    if isinstance(scheduler, PathLike_tup):
+        scheduler = SchedulerSnapshot.from_file(scheduler)
+    if isinstance(scheduler, Scheduler):
+        scheduler = SchedulerSnapshot(scheduler_to_json_snapshot(scheduler), filepath=scheduler.scheduler_filepath)
+    view = pn.Column(
+        "## Best Trials",
+        pn.pane.DataFrame(scheduler.best_trials(n=n_best), index=False),
+        "## Trials",
+        pn.pane.DataFrame(scheduler.summary(), index=False),
+        sizing_mode="stretch_width",
+    )
+
+    template = pn.template.BootstrapTemplate(
+        site="BOA",
+        main=[view],
+    )
+
+    return template.servable()
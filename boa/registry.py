@@ -28,11 +28,22 @@ def config_to_dict(inst):
 def _add_common_encodes_and_decodes():
     """Add common encodes and decodes all at once when function is ran"""
 
-    from boa.config import BOAConfig, MetricType
+    from boa.config import (
+        BOAConfig,
+        ExecutorKind,
+        MetricType,
+        SnapshotCompression,
+        StorageBackend,
+        TimeoutStatus,
+    )
 
     CORE_ENCODER_REGISTRY[BOAConfig] = config_to_dict
     # CORE_DECODER_REGISTRY[BOAConfig.__name__] = BOAConfig
     CORE_DECODER_REGISTRY[MetricType.__name__] = MetricType
+    CORE_DECODER_REGISTRY[StorageBackend.__name__] = StorageBackend
+    CORE_DECODER_REGISTRY[SnapshotCompression.__name__] = SnapshotCompression
+    CORE_DECODER_REGISTRY[ExecutorKind.__name__] = ExecutorKind
+    CORE_DECODER_REGISTRY[TimeoutStatus.__name__] = TimeoutStatus
 
     CORE_CLASS_DECODER_REGISTRY["Type[Kernel]"] = class_from_json
     CORE_CLASS_ENCODER_REGISTRY[gpytorch.kernels.Kernel] = botorch_modular_to_dict
@@ -8,51 +8,133 @@ Runner that calls your :mod:`.wrappers` to run your model and poll the trial sta
 """
 
 import concurrent.futures
-import logging
+import logging.handlers
 import multiprocessing
+import time
 from collections import defaultdict
-from typing import Any, Dict, Iterable, Set
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from ax.core.base_trial import TrialStatus
 from ax.core.runner import Runner
 from ax.core.trial import Trial
 
-from boa.logger import get_logger
+from boa.config import ExecutorKind, TimeoutStatus
+from boa.logger import get_logger, init_queue_logging, start_queue_listener
 from boa.metaclasses import RunnerRegister
 from boa.utils import serialize_init_args
 from boa.wrappers.base_wrapper import BaseWrapper
+from boa.wrappers.script_wrapper import ScriptWrapper
 
 logger = get_logger()
 
+# seconds between checks for queued deployments starting, when timing them for ``deploy_timeout``
+DEPLOY_START_POLL_INTERVAL = 0.1
+
 
 class WrappedJobRunner(Runner, metaclass=RunnerRegister):
+    # state of the current run, that isn't saved with the runner
+    _run_state_fields = (
+        "_queue",
+        "_poll_executor",
+        "_pending_polls",
+        "_deploy_executor",
+        "_failed_deployments",
+        "_queue_listener",
+    )
+
     def __init__(self, wrapper: BaseWrapper = None, *args, **kwargs):
 
         self.wrapper = wrapper or BaseWrapper()
-        self.queue = multiprocessing.Manager().Queue()
+        # logging queue for process based deployment, made when first needed
+        self._queue: Optional[multiprocessing.Queue] = None
+        self._poll_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # status checks still running from an earlier poll, by trial index
+        self._pending_polls: Dict[int, concurrent.futures.Future] = {}
+        self._deploy_executor: Optional[concurrent.futures.Executor] = None
+        # trials whose deployment failed, to be reported as failed on the next poll, with why
+        self._failed_deployments: Dict[int, str] = {}
+        self._queue_listener: Optional[logging.handlers.QueueListener] = None
         super().__init__(*args, **kwargs)
 
+    def __getstate__(self):
+        # executors, their futures and the logging queue can't be pickled (or deep copied),
+        # such as when the runner is sent to a process pool with its trials
+        state = self.__dict__.copy()
+        state.update({name: None for name in self._run_state_fields})
+        state["_pending_polls"] = {}
+        state["_failed_deployments"] = {}
+        return state
+
+    @property
+    def queue(self) -> multiprocessing.Queue:
+        """Queue the worker processes of a ``process`` ``deploy_executor`` send their logs through.
+
+        Only made when first used, so runners that only deploy in this process
+        (or are only loaded to look at results) don't start anything for it.
+        """
+        if self._queue is None:
+            self._queue = multiprocessing.Queue()
+        return self._queue
+
+    def _get_deploy_executor(self) -> concurrent.futures.Executor:
+        if self._deploy_executor is None:
+            kind = self._get_script_option("deploy_executor", ExecutorKind.THREAD)
+            max_workers = self._get_script_option("deploy_workers")
+            if kind == ExecutorKind.PROCESS:
+                if isinstance(self.wrapper, ScriptWrapper):
+                    raise TypeError(
+                        "The `process` deploy_executor can't be used with a ScriptWrapper, which needs to keep"
+                        " track of the scripts it starts to stop them."
+                    )
+                # the worker processes log to the queue, which is logged here by one listener
+                self._queue_listener = start_queue_listener(self.queue)
+                self._deploy_executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers, initializer=init_queue_logging, initargs=(self.queue,)
+                )
+            else:
+                self._deploy_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="boa-deploy"
+                )
+        return self._deploy_executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pools used to deploy and poll trials, they are recreated if needed again,
+        and :meth:`~.BaseWrapper.close` the wrapper."""
+        for executor in (self._deploy_executor, self._poll_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=True)
+        if self._queue_listener is not None:
+            self._queue_listener.stop()
+        self._deploy_executor = None
+        self._poll_executor = None
+        self._pending_polls = {}
+        self._queue_listener = None
+        self.wrapper.close()
+
+    def _get_script_option(self, name: str, default=None):
+        config = getattr(self.wrapper, "config", None)
+        if config is None:
+            return default
+        value = getattr(config.script_options, name, None)
+        return value if value is not None else default
+
     def run(self, trial: Trial) -> Dict[str, Any]:
         """Deploys a trial based on custom runner subclass implementation.
 
-        Add a logging queue handler to the boa and ax root loggers to capture logs from the
-        wrapper.
-
         Args:
             trial: The trial to deploy.
 
         Returns:
             Dict of run metadata from the deployment process.
         """
-        qh = logging.handlers.QueueHandler(self.queue)
-        logger = logging.getLogger()
-        logger.addHandler(qh)
-        ax_logger = logging.getLogger("ax")
-        ax_logger.addHandler(qh)
-
         if not isinstance(trial, Trial):
             raise ValueError("This runner only handles `Trial`.")
 
+        memoized = self._run_memoized(trial)
+        if memoized is not None:
+            return memoized
+
         self.wrapper.write_configs(trial)
 
         self.wrapper.run_model(trial)
@@ -65,8 +147,15 @@ class WrappedJobRunner(Runner, metaclass=RunnerRegister):
         multiple trials at once is more efficient than deploying them one-by-one.
         Used in Ax ``Scheduler``.
 
-        NOTE: By default simply loops over `run_trial`. Should be overwritten
-        if deploying multiple trials in batch is preferable.
+        Trials are deployed with :meth:`run` on a pool kept by the runner, configured by the
+        ``deploy_executor``, ``deploy_workers`` and ``deploy_timeout`` script options
+        (or with the ``batch_trials`` script option, all at once by the wrapper's
+        :meth:`~.BaseWrapper.run_model_batch`).
+        A trial whose deployment raises or times out doesn't stop the others, it is
+        reported as failed on the next poll.
+
+        With the ``memoize_trials`` script option, trials whose parameterization was already
+        evaluated aren't deployed, see :meth:`_run_memoized`.
 
         Args:
             trials: Iterable of trials to be deployed, each containing arms with
@@ -79,19 +168,125 @@ class WrappedJobRunner(Runner, metaclass=RunnerRegister):
             process.
         """
         results = {}
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            trial_runs = {executor.submit(self.run, trial=trial): trial.index for trial in trials}
-            for future in concurrent.futures.as_completed(trial_runs):
-                trial_index = trial_runs[future]
+        to_deploy = []
+        for trial in trials:
+            memoized = self._run_memoized(trial)
+            if memoized is not None:
+                results[trial.index] = memoized
+            else:
+                to_deploy.append(trial)
+        if not to_deploy:
+            return results
+        if self._get_script_option("batch_trials", False):
+            return {**results, **self._run_batch(to_deploy)}
+
+        executor = self._get_deploy_executor()
+        timeout = self._get_script_option("deploy_timeout")
+        trial_runs = {executor.submit(self.run, trial=trial): trial for trial in to_deploy}
+        timed_out = self._wait_for_deployments(list(trial_runs), timeout)
+
+        for future, trial in trial_runs.items():
+            if future in timed_out:
+                error = f"Deployment of trial {trial.index} took longer than the deploy_timeout of {timeout} seconds"
+                logger.error(f"{error}, stopping it and marking it failed.")
+                if not future.cancel():
+                    # already deploying, stop what it started so far, and what it starts before it returns
+                    self._stop_failed_deployment(trial, reason=error)
+                    future.add_done_callback(
+                        lambda _, trial=trial, error=error: self._stop_failed_deployment(trial, error)
+                    )
+            else:
                 try:
-                    results[trial_index] = future.result()
+                    results[trial.index] = future.result()
+                    continue
                 except Exception as e:
-                    logger.exception(f"Error completing run because of {e}!")
-                    raise
-            concurrent.futures.wait(trial_runs)
+                    logger.exception(f"Error deploying trial {trial.index} because of {e}, marking it failed.")
+                    error = repr(e)
+            self._failed_deployments[trial.index] = error
+            results[trial.index] = {"job_id": trial.index, "deploy_error": error}
 
         return results
 
+    @staticmethod
+    def _wait_for_deployments(
+        futures: List[concurrent.futures.Future], timeout: Optional[float]
+    ) -> Set[concurrent.futures.Future]:
+        """Wait for the deployments in ``futures`` (in the order they were submitted), each for up to
+        ``timeout`` seconds from when it starts running on the deploy pool, so trials queued for a
+        worker aren't timed while they wait. Returns the deployments that timed out.
+
+        A deployment that times out still holds its worker until it returns, so the clock of the
+        next queued deployment starts then instead, as if it had that worker (as does the first one's
+        if none of them can start), which keeps deployments stuck behind hung ones from waiting forever."""
+        if timeout is None:
+            concurrent.futures.wait(futures)
+            return set()
+        pending = list(futures)
+        clocks: Dict[concurrent.futures.Future, float] = {}
+        running = set()
+        timed_out = set()
+        while pending:
+            now = time.monotonic()
+            for future in pending:
+                if future not in running and (future.running() or future.done()):
+                    running.add(future)
+                    clocks[future] = now
+            if not any(f in clocks for f in pending):
+                # the workers are all held by earlier deployments that timed out
+                clocks[pending[0]] = now
+            for future in [f for f in pending if f in clocks and now - clocks[f] >= timeout and not f.done()]:
+                pending.remove(future)
+                timed_out.add(future)
+                queued = next((f for f in pending if f not in clocks), None)
+                if queued is not None:
+                    clocks[queued] = now
+            if not pending:
+                break
+            wait_timeout = min((clocks[f] + timeout - now for f in pending if f in clocks), default=timeout)
+            if any(f not in running for f in pending):
+                wait_timeout = min(wait_timeout, DEPLOY_START_POLL_INTERVAL)
+            done, _ = concurrent.futures.wait(
+                pending, timeout=max(wait_timeout, 0), return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            pending = [f for f in pending if f not in done]
+        return timed_out
+
+    def _stop_failed_deployment(self, trial: Trial, reason: str) -> None:
+        try:
+            self.wrapper.stop_trial(trial, reason=reason)
+        except Exception as e:
+            logger.exception(f"Error stopping trial {trial.index} because of {e}!")
+
+    def _run_memoized(self, trial: Trial) -> Optional[Dict[str, Any]]:
+        """Run metadata of a trial whose parameterization was already evaluated, with the metric
+        values of all the experiment's metrics in the wrapper's :meth:`~.BaseWrapper.make_trial_store`,
+        or None if it has to be run. Memoized trials are completed on the next poll, without calling
+        the wrapper, and their metrics are fetched from the store."""
+        store = self.wrapper._get_trial_store()
+        if store is None or not isinstance(trial, Trial):
+            return None
+        key = self.wrapper.memoization_key(trial)
+        entry = store.get(key)
+        if entry is None or any(name not in entry["metrics"] for name in trial.experiment.metrics):
+            return None
+        logger.info(
+            f"The parameters of trial {trial.index} were already evaluated, using their results instead of running it."
+        )
+        return {"job_id": trial.index, "memoized": key}
+
+    def _run_batch(self, trials: Iterable[Trial]) -> Dict[int, Dict[str, Any]]:
+        """Deploys the trials all at once with the wrapper's :meth:`~.BaseWrapper.run_model_batch`.
+        If it raises, all of the trials are reported as failed on the next poll."""
+        trials = list(trials)
+        try:
+            self.wrapper.run_model_batch(trials)
+        except Exception as e:
+            trial_indices = [trial.index for trial in trials]
+            logger.exception(f"Error deploying trials {trial_indices} because of {e}, marking them failed.")
+            self._failed_deployments.update({trial.index: repr(e) for trial in trials})
+            return {trial.index: {"job_id": trial.index, "deploy_error": repr(e)} for trial in trials}
+        return {trial.index: {"job_id": trial.index} for trial in trials}
+
     def poll_trial_status(self, trials: Iterable[Trial]) -> Dict[TrialStatus, Set[int]]:
         """Checks the status of any non-terminal trials and returns their
         indices as a mapping from TrialStatus to a list of indices. Required
@@ -100,6 +295,11 @@ class WrappedJobRunner(Runner, metaclass=RunnerRegister):
         NOTE: Does not need to handle waiting between polling calls while trials
         are running; this function should just perform a single poll.
 
+        With the ``poll_workers`` script option greater than 1, the trials are checked
+        concurrently, see ``poll_timeout`` for not waiting on slow checks. With the ``batch_trials``
+        script option, they are all checked at once by the wrapper's
+        :meth:`~.BaseWrapper.set_trial_status_batch`.
+
         Args:
             trials: Trials to poll.
 
@@ -109,11 +309,135 @@ class WrappedJobRunner(Runner, metaclass=RunnerRegister):
             include trials that at the time of polling already have a terminal
             (ABANDONED, FAILED, COMPLETED) status (but it may).
         """
+        trials = list(trials)
+        failed_deployments = {trial.index for trial in trials} & self._failed_deployments.keys()
+        for trial in trials:
+            if trial.index in failed_deployments:
+                trial.mark_failed(reason=self._failed_deployments.pop(trial.index), unsafe=True)
+        trials = [trial for trial in trials if trial.index not in failed_deployments]
+        memoized = set()
+        if self.wrapper._get_trial_store() is not None:
+            memoized = {trial.index for trial in trials if trial.run_metadata.get("memoized")}
+            for trial in trials:
+                if trial.index in memoized and trial.status.is_running:
+                    trial.mark_completed()
+            trials = [trial for trial in trials if trial.index not in memoized]
+        timed_out = self._stop_timed_out_trials(trials)
+        trials = [trial for trial in trials if trial.index not in timed_out]
+
+        poll_workers = self._get_script_option("poll_workers", 1)
+        if self._get_script_option("batch_trials", False):
+            self.wrapper.set_trial_status_batch(trials)
+            status_dict = defaultdict(set)
+            for trial in trials:
+                status_dict[trial.status].add(trial.index)
+        elif poll_workers > 1:
+            status_dict = self._poll_trial_status_concurrently(
+                trials, max_workers=poll_workers, timeout=self._get_script_option("poll_timeout")
+            )
+        else:
+            status_dict = defaultdict(set)
+            for trial in trials:
+                self.wrapper.set_trial_status(trial)
+                status_dict[trial.status].add(trial.index)
+
+        if failed_deployments:
+            status_dict[TrialStatus.FAILED] |= failed_deployments
+        if memoized:
+            status_dict[TrialStatus.COMPLETED] |= memoized
+        for trial_index, status in timed_out.items():
+            status_dict[status].add(trial_index)
+        return status_dict
+
+    def _stop_timed_out_trials(self, trials: Iterable[Trial]) -> Dict[int, TrialStatus]:
+        """Stop the running trials that have run longer than the ``trial_timeout`` script option,
+        marking them as ``trial_timeout_status``.
+
+        Returns:
+            The new status of the stopped trials, by trial index.
+        """
+        timeout = self._get_script_option("trial_timeout")
+        if timeout is None:
+            return {}
+        timeout_status = self._get_script_option("trial_timeout_status", TimeoutStatus.FAILED)
+        now = datetime.now()
+        timed_out = {}
+        for trial in trials:
+            if not trial.status.is_running or trial.time_run_started is None:
+                continue
+            run_time = (now - trial.time_run_started).total_seconds()
+            if run_time <= timeout:
+                continue
+            reason = f"Trial {trial.index} ran for longer than the trial_timeout of {timeout} seconds"
+            logger.error(f"{reason}, stopping it and marking it {timeout_status}.")
+            # marked first, so the wrapper doesn't mark it failed when its model run is killed
+            if timeout_status == TimeoutStatus.ABANDONED:
+                trial.mark_abandoned(reason=reason)
+            else:
+                trial.mark_failed(reason=reason)
+            try:
+                self.stop(trial, reason=reason)
+            except Exception as e:
+                logger.exception(f"Error stopping trial {trial.index} because of {e}!")
+            timed_out[trial.index] = trial.status
+        return timed_out
+
+    def stop(self, trial: Trial, reason: Optional[str] = None) -> Dict[str, Any]:
+        """Stops a trial with the wrapper's :meth:`~.BaseWrapper.stop_trial`.
+        Used in Ax ``Scheduler`` such as for early stopping.
+
+        Args:
+            trial: The trial to stop.
+            reason: A message containing information why the trial is to be stopped.
+
+        Returns:
+            A dictionary of run metadata from the stopping process.
+        """
+        self.wrapper.stop_trial(trial, reason=reason)
+        return {"reason": reason} if reason else {}
+
+    def _poll_trial_status_concurrently(
+        self, trials: Iterable[Trial], max_workers: int, timeout: Optional[float] = None
+    ) -> Dict[TrialStatus, Set[int]]:
+        """Checks the status of the trials on a pool of ``max_workers`` threads, waiting at most
+        ``timeout`` seconds for them. Trials whose status check isn't done by then are reported
+        with their current status, and their check is picked up again on the next poll instead
+        of starting another one.
+        """
+        if self._poll_executor is None:
+            self._poll_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="boa-poll"
+            )
+        trials = list(trials)
+        futures = {}
+        for trial in trials:
+            future = self._pending_polls.get(trial.index)
+            if future is None:
+                future = self._poll_executor.submit(self.wrapper.set_trial_status, trial)
+                self._pending_polls[trial.index] = future
+            futures[future] = trial
+
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        errors = []
+        for future in done:
+            trial = futures[future]
+            del self._pending_polls[trial.index]
+            try:
+                future.result()
+            except Exception as e:
+                logger.exception(f"Error polling the status of trial {trial.index} because of {e}!")
+                errors.append(e)
+        if not_done:
+            logger.warning(
+                f"Status checks of trials {sorted(futures[future].index for future in not_done)} didn't finish"
+                f" within {timeout} seconds, checking them again on the next poll."
+            )
+        if errors:
+            raise errors[0]
+
         status_dict = defaultdict(set)
         for trial in trials:
-            self.wrapper.set_trial_status(trial)
             status_dict[trial.status].add(trial.index)
-
         return status_dict
 
     def to_dict(self) -> dict:
@@ -121,7 +445,8 @@ class WrappedJobRunner(Runner, metaclass=RunnerRegister):
 
         parents = self.__class__.mro()[1:]  # index 0 is the class itself
 
-        properties = serialize_init_args(self, parents=parents, match_private=True, exclude_fields=["wrapper", "queue"])
+        exclude_fields = ["wrapper", *(name.lstrip("_") for name in self._run_state_fields)]
+        properties = serialize_init_args(self, parents=parents, match_private=True, exclude_fields=exclude_fields)
 
         properties["__type"] = self.__class__.__name__
         return properties
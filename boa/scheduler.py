@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import pathlib
+import time
 from pprint import pformat
-from typing import Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 from ax.core.optimization_config import OptimizationConfig
 from ax.modelbridge.base import ModelBridge
+from ax.service.scheduler import MAX_SECONDS_BETWEEN_REPORTS
 from ax.service.scheduler import Scheduler as AxScheduler
 
 from boa.definitions import PathLike
@@ -24,6 +26,10 @@ class Scheduler(AxScheduler):
         self._model: Optional[ModelBridge] = None
         self._scheduler_filepath: pathlib.Path = pathlib.Path("scheduler.json")
         self._opt_csv: pathlib.Path = pathlib.Path("optimization.csv")
+        self._journal = None  # set by the journal storage backend on first save
+        self._sqlite_store = None  # set by the sqlite storage backend on first save
+        self._opt_csv_writer = None  # set on first save of the optimization csv
+        self._background_writer = None  # set on first save if saving in the background
 
     @property
     def wrapper(self) -> BaseWrapper:
@@ -39,7 +45,11 @@ class Scheduler(AxScheduler):
 
     @property
     def scheduler_filepath(self) -> pathlib.Path:
-        return self.wrapper.experiment_dir / self._scheduler_filepath
+        """Path the scheduler is saved to, with the extension of its ``snapshot_compression``
+        or ``storage_backend`` script options"""
+        from boa.storage import scheduler_save_path
+
+        return scheduler_save_path(self, self.wrapper.experiment_dir / self._scheduler_filepath)
 
     @scheduler_filepath.setter
     def scheduler_filepath(self, path: PathLike):
@@ -85,6 +95,48 @@ class Scheduler(AxScheduler):
         )
         logger.info(update)
 
+    def wait_for_completed_trials_and_report_results(
+        self,
+        idle_callback: Optional[Callable[[AxScheduler], None]] = None,
+        force_refit: bool = False,
+    ) -> Dict[str, Any]:
+        """Poll the running trials until one of them completes, and report the results.
+
+        The same as Ax's, except that between polls it waits in
+        :meth:`~.BaseWrapper.wait_for_trial_updates` instead of sleeping, so wrappers that
+        know when a trial writes its results (such as :class:`.ScriptWrapper` with the
+        ``watch_trial_files`` script option) can poll again right away.
+        """
+        if self.options.init_seconds_between_polls is None and self.options.early_stopping_strategy is None:
+            # let Ax raise its error
+            return super().wait_for_completed_trials_and_report_results(idle_callback, force_refit)
+
+        seconds_between_polls = self.options.init_seconds_between_polls
+        backoff_factor = self.options.seconds_between_polls_backoff_factor
+        if self.options.early_stopping_strategy is not None:
+            seconds_between_polls = self.options.early_stopping_strategy.seconds_between_polls
+            # Do not backoff with early stopping, a constant heartbeat is preferred
+            backoff_factor = 1
+
+        start = time.monotonic()
+        while len(self.pending_trials) > 0 and not self.poll_and_process_results():
+            if time.monotonic() - start > MAX_SECONDS_BETWEEN_REPORTS:
+                break  # check the stopping criterion again and re-attempt scheduling more trials
+
+            if idle_callback is not None:
+                idle_callback(self)
+
+            self.logger.info(
+                f"Waiting for completed trials (for up to {seconds_between_polls:.3g} sec, "
+                f"currently running trials: {len(self.running_trials)})."
+            )
+            self.wrapper.wait_for_trial_updates(seconds_between_polls)
+            seconds_between_polls *= backoff_factor
+
+        if idle_callback is not None:
+            idle_callback(self)
+        return self.report_results(force_refit=force_refit)
+
     def best_fitted_trials(
         self,
         optimization_config: Optional[OptimizationConfig] = None,
@@ -263,3 +315,16 @@ class Scheduler(AxScheduler):
             )
         except Exception as e:
             logger.exception("failed to save scheduler to json! Reason: %s" % repr(e))
+
+    def flush_save_data(self, timeout: Optional[float] = None) -> None:
+        """Block until scheduler data being saved in the background
+        (``script_options.background_save``) is written to disk."""
+        if self._background_writer is not None and not self._background_writer.flush(timeout=timeout):
+            logger.warning("Timed out waiting for scheduler data to be saved in the background.")
+
+    def close_save_data(self) -> None:
+        """Write the scheduler data being saved in the background to disk and stop the thread
+        writing it. Later saves start a new one."""
+        if self._background_writer is not None:
+            self._background_writer.close()
+            self._background_writer = None
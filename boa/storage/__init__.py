@@ -0,0 +1,551 @@
+"""
+########################
+Saving and Loading
+########################
+
+Functions for saving and loading your experiment to
+stop and restart.
+
+"""
+
+import logging
+import pathlib
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional, Type
+
+from ax import Experiment
+from ax.exceptions.core import AxError
+from ax.exceptions.storage import JSONDecodeError as AXJSONDecodeError
+from ax.exceptions.storage import JSONEncodeError as AXJSONEncodeError
+from ax.service.scheduler import SchedulerOptions
+from ax.storage.json_store.decoder import (
+    generation_strategy_from_json,
+    object_from_json,
+)
+from ax.storage.json_store.encoder import object_to_json
+from ax.storage.json_store.registry import (
+    CORE_CLASS_DECODER_REGISTRY,
+    CORE_CLASS_ENCODER_REGISTRY,
+    CORE_DECODER_REGISTRY,
+    CORE_ENCODER_REGISTRY,
+)
+
+from boa.__version__ import __version__
+from boa.config import StorageBackend
+from boa.definitions import PathLike
+from boa.logger import get_logger
+from boa.metrics.modular_metric import ModularMetric
+from boa.runner import WrappedJobRunner
+from boa.scheduler import Scheduler
+from boa.storage.atomic import atomic_write, iter_snapshot_candidates
+from boa.storage.background import BackgroundWriter, write_or_submit
+from boa.storage.formats import (
+    copy_json,
+    encode_snapshot,
+    read_snapshot_file,
+    snapshot_path_for,
+)
+from boa.storage.journal import (
+    JOURNAL_ID_KEY,
+    SchedulerJournal,
+    journal_path_for,
+    new_journal_id,
+    read_journal,
+    replay_journal,
+)
+from boa.storage.opt_csv import IncrementalOptCSVWriter, experiment_opt_df
+from boa.storage.snapshot import SchedulerSnapshot  # noqa: F401
+from boa.storage.sqlite import (
+    SQLITE_SUFFIXES,
+    SQLiteSchedulerStore,
+    is_sqlite_file,
+    read_sqlite_snapshot,
+    sqlite_path_for,
+    write_sqlite_snapshot,
+)
+from boa.utils import (
+    _load_attr_from_module,
+    _load_module_from_path,
+    get_dictionary_from_callable,
+)
+from boa.wrappers.base_wrapper import BaseWrapper
+from boa.wrappers.script_wrapper import ScriptWrapper
+
+logger = get_logger()
+
+
+def scheduler_to_json_file(
+    scheduler,
+    scheduler_filepath: PathLike = "scheduler.json",
+    dir_: PathLike = None,
+    background_writer: Optional[BackgroundWriter] = None,
+    **kwargs,
+) -> None:
+    """Save a JSON-serialized snapshot of this `Scheduler`'s settings and state
+    to a .json file by the given path.
+    """
+    if dir_:
+        scheduler_filepath = pathlib.Path(dir_) / scheduler_filepath
+    _write_json_snapshot(
+        scheduler_to_json_snapshot(scheduler),
+        scheduler_filepath,
+        backups=_get_script_option(scheduler, "snapshot_backups", 1),
+        background_writer=background_writer,
+    )
+
+
+def _write_json_snapshot(
+    serialized: Dict[str, Any],
+    scheduler_filepath: PathLike,
+    backups: int = 0,
+    background_writer: Optional[BackgroundWriter] = None,
+) -> None:
+    def write():
+        # written to a temp file and renamed, so a crash mid write can't leave a truncated snapshot
+        atomic_write(scheduler_filepath, encode_snapshot(serialized, scheduler_filepath), backups=backups)
+        logger.info(
+            f"Saved JSON-serialized state of optimization to `{scheduler_filepath}`." f"\nBoa version: {__version__}"
+        )
+
+    write_or_submit(background_writer, scheduler_filepath, write, replaces=True)
+
+
+def scheduler_to_journal(
+    scheduler: Scheduler,
+    scheduler_filepath: PathLike = "scheduler.json",
+    dir_: PathLike = None,
+    compaction_interval: Optional[int] = None,
+    background_writer: Optional[BackgroundWriter] = None,
+    **kwargs,
+) -> None:
+    """Save the changes to this `Scheduler` since its last save to an append-only
+    journal next to its JSON snapshot (``scheduler.json`` -> ``scheduler.journal.jsonl``).
+
+    The first save, and every save after ``compaction_interval`` journal records
+    have been written, compacts the journal into a new full JSON snapshot.
+    """
+    if dir_:
+        scheduler_filepath = pathlib.Path(dir_) / scheduler_filepath
+    scheduler_filepath = pathlib.Path(scheduler_filepath)
+    if compaction_interval is None:
+        compaction_interval = _get_script_option(scheduler, "journal_compaction_interval", 1000)
+
+    journal: Optional[SchedulerJournal] = getattr(scheduler, "_journal", None)
+    if journal is None or journal.path != journal_path_for(scheduler_filepath):
+        compact_scheduler_journal(scheduler, scheduler_filepath=scheduler_filepath, background_writer=background_writer)
+        return
+
+    journal.writer = background_writer
+    n_records = journal.record_changes(scheduler)
+    logger.info(f"Appended {n_records} records to scheduler journal `{journal.path}`.")
+    if journal.n_records >= compaction_interval:
+        compact_scheduler_journal(scheduler, scheduler_filepath=scheduler_filepath, background_writer=background_writer)
+
+
+def compact_scheduler_journal(
+    scheduler: Scheduler,
+    scheduler_filepath: PathLike = "scheduler.json",
+    background_writer: Optional[BackgroundWriter] = None,
+    **kwargs,
+) -> None:
+    """Write a full JSON snapshot of this `Scheduler` and start a new empty journal for it."""
+    scheduler_filepath = pathlib.Path(scheduler_filepath)
+    journal = SchedulerJournal(
+        path=journal_path_for(scheduler_filepath), journal_id=new_journal_id(), writer=background_writer
+    )
+    serialized = scheduler_to_json_snapshot(scheduler)
+    serialized[JOURNAL_ID_KEY] = journal.journal_id
+    _write_json_snapshot(
+        serialized,
+        scheduler_filepath,
+        backups=_get_script_option(scheduler, "snapshot_backups", 1),
+        background_writer=background_writer,
+    )
+    journal.start(scheduler)
+    scheduler._journal = journal
+
+
+def scheduler_to_sqlite(
+    scheduler: Scheduler,
+    scheduler_filepath: PathLike = "scheduler.json",
+    dir_: PathLike = None,
+    background_writer: Optional[BackgroundWriter] = None,
+    **kwargs,
+) -> None:
+    """Save this `Scheduler` to a local SQLite database next to its JSON snapshot path
+    (``scheduler.json`` -> ``scheduler.db``).
+
+    The first save writes the full state of the scheduler, every save after that
+    only writes the trials, data and generator runs that changed since the last save.
+    """
+    if dir_:
+        scheduler_filepath = pathlib.Path(dir_) / scheduler_filepath
+    db_path = sqlite_path_for(scheduler_filepath)
+
+    store: Optional[SQLiteSchedulerStore] = getattr(scheduler, "_sqlite_store", None)
+    if store is None or store.path != db_path:
+        store = SQLiteSchedulerStore(path=db_path, writer=background_writer)
+        store.write_snapshot(scheduler, scheduler_to_json_snapshot(scheduler))
+        scheduler._sqlite_store = store
+        return
+    store.writer = background_writer
+    store.write_changes(scheduler)
+
+
+def load_scheduler_snapshot(filepath: PathLike = "scheduler.json") -> Dict[str, Any]:
+    """Load the JSON-serialized snapshot of a `Scheduler` from any of the storage backends,
+    a JSON file (replaying its journal if it has one) or an SQLite database.
+
+    If a JSON snapshot is missing or can't be decoded (for example truncated by a crash),
+    falls back to the newest rotated backup of it (``scheduler.json.1``, ...) that can be.
+    """
+    if is_sqlite_file(filepath):
+        return read_sqlite_snapshot(filepath)
+    errors = []
+    for candidate in iter_snapshot_candidates(filepath):
+        try:
+            serialized = read_snapshot_file(candidate)
+        except (OSError, EOFError, ValueError) as e:  # missing, truncated or otherwise corrupt
+            errors.append(e)
+            continue
+        if errors:
+            logger.warning(
+                f"Could not load scheduler snapshot `{filepath}` because of: {errors[0]!r}"
+                f"\nFalling back to backup snapshot `{candidate}`."
+            )
+        if JOURNAL_ID_KEY in serialized:
+            records = read_journal(journal_path_for(filepath), journal_id=serialized.pop(JOURNAL_ID_KEY))
+            serialized = replay_journal(serialized, records)
+        return serialized
+    raise errors[0]
+
+
+def convert_scheduler_snapshot(filepath: PathLike, out_filepath: PathLike) -> pathlib.Path:
+    """Convert a saved `Scheduler` to another storage format.
+
+    The format is picked by the extension of ``out_filepath``: ``.json`` (plain JSON),
+    ``.json.gz`` or ``.json.zst`` (compressed JSON) or ``.db`` (SQLite database).
+    Snapshots saved with the journal storage backend have their journal folded in.
+    """
+    out_filepath = pathlib.Path(out_filepath)
+    serialized = load_scheduler_snapshot(filepath)
+    if out_filepath.suffix in SQLITE_SUFFIXES:
+        if out_filepath.exists():
+            out_filepath.unlink()
+        write_sqlite_snapshot(out_filepath, serialized)
+    else:
+        atomic_write(out_filepath, encode_snapshot(serialized, out_filepath))
+    logger.info(f"Converted scheduler `{filepath}` to `{out_filepath}`.")
+    return out_filepath
+
+
+def scheduler_from_json_file(filepath: PathLike = "scheduler.json", wrapper=None, **kwargs) -> Scheduler:
+    """Restore an `Scheduler` and its state from a JSON-serialized snapshot,
+    residing in a .json file by the given path.
+
+    If the snapshot was saved with the journal storage backend, the journal
+    next to it is replayed on top of the snapshot. `filepath` can also be an
+    SQLite database saved with the sqlite storage backend.
+
+    To only read parts of a large snapshot (like a summary of its trials),
+    see :class:`.SchedulerSnapshot`, which decodes lazily.
+    """
+    serialized = load_scheduler_snapshot(filepath)
+    return _scheduler_from_loaded_snapshot(serialized, filepath=filepath, **kwargs)
+
+
+def _scheduler_from_loaded_snapshot(serialized: Dict[str, Any], filepath: PathLike, **kwargs) -> Scheduler:
+    scheduler = scheduler_from_json_snapshot(serialized=serialized, filepath=filepath, **kwargs)
+
+    wrapper = scheduler.wrapper
+
+    if wrapper is not None:
+        for trial in scheduler.running_trials:
+            wrapper.set_trial_status(trial)  # try and complete or fail any leftover trials
+
+        for trial in scheduler.running_trials:  # any trial that was marked above is no longer here
+            trial.mark_failed()  # fail anything leftover from above
+    return scheduler
+
+
+def scheduler_to_json_snapshot(
+    scheduler: Scheduler,
+    encoder_registry: Optional[Dict[Type, Callable[[Any], Dict[str, Any]]]] = None,
+    class_encoder_registry: Optional[Dict[Type, Callable[[Any], Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """Serialize this `Scheduler` to JSON to be able to interrupt and restart
+    optimization and save it to file by the provided path.
+
+    Returns:
+        A JSON-safe dict representation of this `Scheduler`.
+    """
+    if encoder_registry is None:
+        encoder_registry = CORE_ENCODER_REGISTRY
+
+    if class_encoder_registry is None:
+        class_encoder_registry = CORE_CLASS_ENCODER_REGISTRY
+
+    options = asdict(scheduler.options)
+    options.pop("global_stopping_strategy", None)
+
+    options = SchedulerOptions(**options)
+
+    try:
+        wrapper_serialization = object_to_json(
+            scheduler.experiment.runner.wrapper,
+            encoder_registry=encoder_registry,
+            class_encoder_registry=class_encoder_registry,
+        )
+    except AXJSONEncodeError as e:
+        logger.error(e)
+        wrapper_serialization = scheduler.experiment.runner.wrapper.to_dict()
+
+    gs = object_to_json(
+        scheduler.generation_strategy,
+        encoder_registry=encoder_registry,
+        class_encoder_registry=class_encoder_registry,
+    )
+
+    serialization = {
+        "_type": scheduler.__class__.__name__,
+        "experiment": object_to_json(
+            scheduler.experiment,
+            encoder_registry=encoder_registry,
+            class_encoder_registry=class_encoder_registry,
+        ),
+        "generation_strategy": gs,
+        "options": object_to_json(
+            options,
+            encoder_registry=encoder_registry,
+            class_encoder_registry=class_encoder_registry,
+        ),
+        "scheduler_filepath": object_to_json(
+            scheduler.scheduler_filepath,
+            encoder_registry=encoder_registry,
+            class_encoder_registry=class_encoder_registry,
+        ),
+        "opt_csv": object_to_json(
+            scheduler.opt_csv,
+            encoder_registry=encoder_registry,
+            class_encoder_registry=class_encoder_registry,
+        ),
+        "boa_version": __version__,
+    }
+    if wrapper_serialization:
+        serialization["wrapper"] = wrapper_serialization
+    return serialization
+
+
+def scheduler_from_json_snapshot(
+    serialized: Dict[str, Any],
+    decoder_registry: Optional[Dict[str, Type]] = None,
+    class_decoder_registry: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+    wrapper_path=None,
+    filepath: PathLike = None,
+    **kwargs,
+) -> Scheduler:
+    """Recreate an `Scheduler` from a JSON snapshot."""
+    if decoder_registry is None:
+        decoder_registry = CORE_DECODER_REGISTRY
+
+    if class_decoder_registry is None:
+        class_decoder_registry = CORE_CLASS_DECODER_REGISTRY
+
+    if "options" in serialized:
+        options = object_from_json(
+            serialized.pop("options"),
+            decoder_registry=decoder_registry,
+            class_decoder_registry=class_decoder_registry,
+        )
+    else:
+        options = SchedulerOptions()
+
+    experiment = object_from_json(
+        serialized.pop("experiment"),
+        decoder_registry=decoder_registry,
+        class_decoder_registry=class_decoder_registry,
+    )
+
+    wrapper = None
+    if "wrapper" in serialized:
+        wrapper_dict = serialized.pop("wrapper", {})
+        config = object_from_json(
+            copy_json(wrapper_dict["config"]),
+            decoder_registry=decoder_registry,
+            class_decoder_registry=class_decoder_registry,
+        )
+        # sometimes the way people write their to_dict methods wrap it in a list
+        if isinstance(wrapper_dict, list) and len(wrapper_dict) == 1:
+            wrapper_dict = wrapper_dict[0]
+
+        # experiment dir doesn't exist anymore, either bc it was deleted or bc we changed computers
+        # we also need to do this before we try and deserialize the wrapper b/c the config deserilization
+        # is the wrapper responsibility in wrapper deserialization, and if things got moved,
+        # the config path will be wrong
+        exp_dir = wrapper_dict.get("experiment_dir")
+
+        if exp_dir:
+            exp_dir = object_from_json(
+                copy_json(exp_dir),
+                decoder_registry=decoder_registry,
+                class_decoder_registry=class_decoder_registry,
+            )
+        if not exp_dir or not pathlib.Path(exp_dir).exists():
+            wrapper_dict["experiment_dir"] = str(pathlib.Path(filepath).parent)
+            logger = get_logger(filename=str(pathlib.Path(wrapper_dict["experiment_dir"]) / "optimization.log"))
+            for handler in logger.handlers:
+                if isinstance(handler, logging.FileHandler):
+                    if not pathlib.Path(handler.baseFilename).exists():
+                        logger.removeHandler(handler)
+            # setup file handler on ax logger too
+            get_logger("ax", filename=str(pathlib.Path(wrapper_dict["experiment_dir"]) / "optimization.log"))
+            logger.info(
+                f"Making new experiment dir here: {wrapper_dict['experiment_dir']}."
+                f"\nOld experiment directory not found. "
+                f"\nMost likely because it was deleted or because of reloading on a different computer than"
+                f" originally ran on."
+            )
+
+        try:
+            wrapper = object_from_json(
+                copy_json(wrapper_dict),
+                decoder_registry=decoder_registry,
+                class_decoder_registry=class_decoder_registry,
+            )
+        except Exception as e:  # pragma: no cover  # The only way to test this is to have a bad wrapper
+            deserialized = recursive_deserialize(
+                wrapper_dict,
+                decoder_registry=decoder_registry,
+                class_decoder_registry=class_decoder_registry,
+            )
+
+            if ("path" in wrapper_dict and pathlib.Path(deserialized["path"]).exists()) or (
+                wrapper_path is not None and pathlib.Path(wrapper_path).exists()
+            ):
+
+                path = pathlib.Path(wrapper_path) if wrapper_path is not None else pathlib.Path(deserialized["path"])
+                try:
+                    module = _load_module_from_path(path)
+                    WrapperCls: Type[BaseWrapper] = _load_attr_from_module(module, wrapper_dict["name"])
+                    wrapper = WrapperCls.from_dict(**{**wrapper_dict, "config": config})
+                except Exception as e:
+                    raise AxError(f"Failed to deserialize wrapper because of: {e!r}")
+
+            else:
+                logger.exception(
+                    f"Failed to deserialize wrapper because of: {e!r}" f"\n\nUsing basic ScriptWrapper as back up"
+                )
+                wrapper = ScriptWrapper.from_dict(**get_dictionary_from_callable(ScriptWrapper.from_dict, wrapper_dict))
+
+    serialized_generation_strategy = serialized.pop("generation_strategy")
+    generation_strategy = generation_strategy_from_json(
+        generation_strategy_json=serialized_generation_strategy, experiment=experiment
+    )
+
+    scheduler = Scheduler(generation_strategy=generation_strategy, experiment=experiment, options=options, **kwargs)
+    scheduler.scheduler_filepath = pathlib.Path(filepath)
+    if wrapper:
+        if isinstance(scheduler.experiment.runner, WrappedJobRunner):
+            scheduler.experiment.runner.wrapper = wrapper
+        for metric in scheduler.experiment.metrics.values():
+            if isinstance(metric, ModularMetric):
+                metric.wrapper = wrapper
+    return scheduler
+
+
+def recursive_deserialize(obj, **kwargs):
+    if isinstance(obj, dict):
+        try:
+            if "__type" not in obj:  # at least this out dict isn't serialized in AX format, let's check inners
+                raise AXJSONDecodeError("obj is not a AX JSON deserializable object")
+            obj = object_from_json(obj, **kwargs)
+        except (AXJSONDecodeError, TypeError):  # TypeError until https://github.com/facebook/Ax/pull/1418 is merged
+            for key, value in obj.items():
+                obj[key] = recursive_deserialize(value, **kwargs)
+    return obj
+
+
+def exp_opt_to_csv(
+    experiment: Experiment,
+    opt_filepath: PathLike = "optimization.csv",
+    dir_: PathLike = None,
+    *,
+    metrics_to_end: bool = False,
+    ax_kwargs: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> pathlib.Path:
+    if dir_:
+        opt_filepath = pathlib.Path(dir_) / opt_filepath
+    df = experiment_opt_df(experiment, metrics_to_end=metrics_to_end, ax_kwargs=ax_kwargs)
+    kwargs.setdefault("na_rep", "NA")
+    df.to_csv(path_or_buf=opt_filepath, index=False, **kwargs)
+    logger.info(f"Saved optimization parametrization and objective to `{opt_filepath}`.")
+    return opt_filepath
+
+
+def scheduler_opt_to_csv(
+    scheduler: Scheduler,
+    opt_filepath: PathLike = "optimization.csv",
+    dir_: PathLike = None,
+    *,
+    metrics_to_end: bool = False,
+    ax_kwargs: Optional[Dict[str, Any]] = None,
+    background_writer: Optional[BackgroundWriter] = None,
+    **kwargs,
+) -> pathlib.Path:
+    """Save the trial table of this `Scheduler`'s experiment to a csv file.
+
+    The scheduler keeps an :class:`.IncrementalOptCSVWriter` between calls, so only the rows
+    of trials that changed since the last call are rebuilt and written.
+    """
+    if dir_:
+        opt_filepath = pathlib.Path(dir_) / opt_filepath
+    writer: Optional[IncrementalOptCSVWriter] = getattr(scheduler, "_opt_csv_writer", None)
+    if writer is None or not writer.matches(opt_filepath, metrics_to_end=metrics_to_end, ax_kwargs=ax_kwargs, **kwargs):
+        writer = IncrementalOptCSVWriter(opt_filepath, metrics_to_end=metrics_to_end, ax_kwargs=ax_kwargs, **kwargs)
+        scheduler._opt_csv_writer = writer
+    writer.background_writer = background_writer
+    opt_csv = writer.write(scheduler.experiment)
+    logger.info(f"Saved optimization parametrization and objective to `{opt_csv}`.")
+    scheduler.opt_csv = opt_csv
+    return opt_csv
+
+
+def scheduler_save_path(scheduler: Scheduler, scheduler_filepath: PathLike) -> pathlib.Path:
+    """Path of the file ``scheduler`` is saved to with its storage script options,
+    ``scheduler.json`` -> ``scheduler.json.gz`` with gzip ``snapshot_compression``,
+    or ``scheduler.db`` with the ``sqlite`` ``storage_backend``.
+    """
+    scheduler_filepath = pathlib.Path(scheduler_filepath)
+    compression = _get_script_option(scheduler, "snapshot_compression")
+    if compression:
+        scheduler_filepath = snapshot_path_for(scheduler_filepath, compression)
+    if _get_script_option(scheduler, "storage_backend", StorageBackend.JSON) == StorageBackend.SQLITE:
+        scheduler_filepath = sqlite_path_for(scheduler_filepath)
+    return scheduler_filepath
+
+
+def dump_scheduler_data(scheduler, scheduler_filepath, opt_filepath, **kwargs):
+    if _get_script_option(scheduler, "background_save", False):
+        if scheduler._background_writer is None:
+            scheduler._background_writer = BackgroundWriter(
+                min_interval=_get_script_option(scheduler, "min_save_interval", 0.0)
+            )
+        kwargs.setdefault("background_writer", scheduler._background_writer)
+    scheduler_opt_to_csv(scheduler, opt_filepath=opt_filepath, **kwargs)
+    storage_backend = _get_script_option(scheduler, "storage_backend", StorageBackend.JSON)
+    scheduler_filepath = scheduler_save_path(scheduler, scheduler_filepath)
+    if storage_backend == StorageBackend.JOURNAL:
+        scheduler_to_journal(scheduler, scheduler_filepath=scheduler_filepath, **kwargs)
+    elif storage_backend == StorageBackend.SQLITE:
+        scheduler_to_sqlite(scheduler, scheduler_filepath=scheduler_filepath, **kwargs)
+    else:
+        scheduler_to_json_file(scheduler, scheduler_filepath=scheduler_filepath, **kwargs)
+
+
+def _get_script_option(scheduler: Scheduler, name: str, default=None):
+    config = getattr(scheduler.wrapper, "config", None)
+    if config is None:
+        return default
+    value = getattr(config.script_options, name, None)
+    return value if value is not None else default
@@ -0,0 +1,110 @@
+"""
+########################
+Atomic Writes
+########################
+
+Crash-safe file writes for scheduler snapshots.
+
+Files are written to a temporary file in the same directory, fsynced and then
+renamed over the destination, so a process killed mid write never leaves a
+truncated snapshot behind. Optionally the previous versions of the file are
+kept as rotated backups (``scheduler.json.1``, ``scheduler.json.2``, ...) to fall
+back on when the newest one can't be loaded.
+
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import secrets
+import shutil
+from typing import Iterator, Union
+
+from boa.definitions import PathLike
+
+
+def backup_path(path: PathLike, n: int) -> pathlib.Path:
+    """Path of the ``n``-th rotated backup of ``path``, ``scheduler.json`` -> ``scheduler.json.n``"""
+    path = pathlib.Path(path)
+    return path.with_name(f"{path.name}.{n}")
+
+
+def iter_snapshot_candidates(path: PathLike) -> Iterator[pathlib.Path]:
+    """``path`` followed by its existing rotated backups, newest first"""
+    path = pathlib.Path(path)
+    yield path
+    n = 1
+    while backup_path(path, n).exists():
+        yield backup_path(path, n)
+        n += 1
+
+
+def _fsync_dir(dir_: pathlib.Path) -> None:
+    if os.name != "posix":  # pragma: no cover
+        return
+    fd = os.open(dir_, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+
+
+def _open_temp(path: pathlib.Path) -> tuple[int, pathlib.Path]:
+    # unlike tempfile.mkstemp (only readable by the owner), new files get the usual permissions from the umask
+    while True:
+        tmp = _temp_path(path)
+        try:
+            return os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), tmp
+        except FileExistsError:  # pragma: no cover
+            continue
+
+
+def _rotate_backups(path: pathlib.Path, backups: int) -> None:
+    if backups < 1 or not path.exists():
+        return
+    for n in range(backups - 1, 0, -1):
+        if backup_path(path, n).exists():
+            os.replace(backup_path(path, n), backup_path(path, n + 1))
+    # link (or copy) instead of moving the file, so it is at ``path`` until the new one replaces it
+    tmp = _temp_path(path)
+    try:
+        os.link(path, tmp)
+    except OSError:
+        shutil.copy2(path, tmp)
+    os.replace(tmp, backup_path(path, 1))
+
+
+def atomic_write(path: PathLike, content: Union[str, bytes], backups: int = 0) -> None:
+    """Atomically replace the contents of ``path`` with ``content``.
+
+    Parameters
+    ----------
+    path
+        File to write
+    content
+        Text or bytes to write
+    backups
+        Number of previous versions of the file to keep as rotated backups
+    """
+    path = pathlib.Path(path)
+    mode = "wb" if isinstance(content, bytes) else "w"
+    fd, tmp = _open_temp(path)
+    try:
+        with os.fdopen(fd, mode) as file:
+            if path.exists():
+                os.chmod(tmp, path.stat().st_mode)
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        _rotate_backups(path, backups)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _fsync_dir(path.parent)
@@ -0,0 +1,130 @@
+"""
+########################
+Background Saving
+########################
+
+Write scheduler state to disk on a background thread.
+
+The (now mostly incremental) serialization of the scheduler still happens on the
+scheduler thread when :meth:`.Scheduler.save_data` is called, so the background thread
+never reads the live experiment. Only the disk writes (``json.dumps`` of the snapshot,
+file writes, SQLite transactions) are handed to the :class:`BackgroundWriter`, which
+coalesces pending writes: a pending full rewrite of a file replaces any earlier
+pending writes to that same file.
+
+"""
+
+from __future__ import annotations
+
+import atexit
+import pathlib
+import threading
+import time
+from typing import Callable, Optional
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+
+logger = get_logger()
+
+
+class BackgroundWriter:
+    """Single background thread that runs submitted disk writes in order.
+
+    Parameters
+    ----------
+    min_interval
+        Minimum number of seconds between batches of writes. Writes submitted
+        in between are coalesced into the next batch.
+    """
+
+    def __init__(self, min_interval: float = 0.0):
+        self.min_interval = min_interval
+        self._pending: list[tuple[pathlib.Path, Callable[[], None]]] = []
+        self._cond = threading.Condition()
+        self._n_submitted = 0
+        self._n_done = 0
+        self._last_write = 0.0
+        self._n_flushing = 0  # callers waiting on a flush
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="boa-background-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, path: PathLike, func: Callable[[], None], replaces: bool = False) -> None:
+        """Queue ``func`` (which writes to ``path``) to run on the background thread.
+
+        If ``replaces`` is True, ``func`` rewrites the whole file, so any pending writes
+        to the same path are dropped.
+        """
+        path = pathlib.Path(path)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Background writer is closed")
+            if replaces:
+                n_pending = len(self._pending)
+                self._pending = [(p, f) for p, f in self._pending if p != path]
+                self._n_done += n_pending - len(self._pending)
+            self._pending.append((path, func))
+            self._n_submitted += 1
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # debounce, unless somebody is waiting on a flush
+                wait = self._last_write + self.min_interval - time.monotonic()
+                while wait > 0 and not (self._n_flushing or self._closed):
+                    self._cond.wait(wait)
+                    wait = self._last_write + self.min_interval - time.monotonic()
+                batch, self._pending = self._pending, []
+            for path, func in batch:
+                try:
+                    func()
+                except Exception as e:
+                    logger.exception(f"failed to save `{path}` in the background! Reason: {e!r}")
+            with self._cond:
+                self._last_write = time.monotonic()
+                self._n_done += len(batch)
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every write submitted so far is on disk.
+
+        Returns
+        -------
+        bool
+            False if ``timeout`` ran out first
+        """
+        with self._cond:
+            target = self._n_submitted
+            self._n_flushing += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: self._n_done >= target, timeout=timeout)
+            finally:
+                self._n_flushing -= 1
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending writes and stop the background thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        atexit.unregister(self.close)
+        self._thread.join(timeout=timeout)
+
+
+def write_or_submit(
+    writer: Optional[BackgroundWriter], path: PathLike, func: Callable[[], None], replaces: bool = False
+) -> None:
+    """Run ``func`` on ``writer``'s background thread if there is a writer, else right away."""
+    if writer is None:
+        func()
+    else:
+        writer.submit(path, func, replaces=replaces)
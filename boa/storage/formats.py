@@ -0,0 +1,103 @@
+"""
+########################
+Snapshot Formats
+########################
+
+Reading and writing scheduler snapshots as plain or compressed JSON.
+
+Plain ``.json`` snapshots are pretty printed. Compressed snapshots (``.json.gz`` with
+gzip, or ``.json.zst`` with zstd if the ``zstandard`` package is installed) are written
+as compact JSON. When reading, the format is detected from the file's magic bytes,
+so renamed files still load.
+
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import pathlib
+from typing import Any, Dict, Optional, Union
+
+from boa.config import SnapshotCompression
+from boa.definitions import PathLike
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+COMPRESSION_SUFFIXES = {
+    SnapshotCompression.GZIP: ".gz",
+    SnapshotCompression.ZSTD: ".zst",
+}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "Reading or writing zstd compressed scheduler snapshots requires the `zstandard` package."
+            " Install it with `pip install zstandard` or use gzip compression instead."
+        ) from e
+    return zstandard
+
+
+def compression_for(path: PathLike) -> Optional[SnapshotCompression]:
+    """Compression of a snapshot file from its extension"""
+    suffix = pathlib.Path(path).suffix
+    for compression, compression_suffix in COMPRESSION_SUFFIXES.items():
+        if suffix == compression_suffix:
+            return compression
+    return None
+
+
+def snapshot_path_for(path: PathLike, compression: Optional[SnapshotCompression | str] = None) -> pathlib.Path:
+    """Path of a snapshot with the extension for ``compression``,
+    ``scheduler.json`` -> ``scheduler.json.gz``
+    """
+    path = pathlib.Path(path)
+    if compression_for(path):
+        path = path.with_suffix("")
+    if compression:
+        path = path.with_name(path.name + COMPRESSION_SUFFIXES[SnapshotCompression.from_str_or_enum(compression)])
+    return path
+
+
+def encode_snapshot(serialized: Dict[str, Any], path: PathLike) -> Union[str, bytes]:
+    """Encode a JSON snapshot in the format given by the extension of ``path``"""
+    compression = compression_for(path)
+    if compression is None:
+        return json.dumps(serialized, indent=4)
+    data = json.dumps(serialized, separators=(",", ":")).encode()
+    if compression == SnapshotCompression.GZIP:
+        return gzip.compress(data, compresslevel=6)
+    return _zstandard().ZstdCompressor().compress(data)
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """Decode a JSON snapshot, detecting compression from its magic bytes"""
+    if data.startswith(GZIP_MAGIC):
+        data = gzip.decompress(data)
+    elif data.startswith(ZSTD_MAGIC):
+        data = _zstandard().ZstdDecompressor().decompress(data)
+    return json.loads(data)
+
+
+def read_snapshot_file(path: PathLike) -> Dict[str, Any]:
+    """Read a plain or compressed JSON snapshot file"""
+    with open(path, "rb") as file:
+        return decode_snapshot(file.read())
+
+
+def copy_json(obj: Any) -> Any:
+    """Copy a decoded JSON object (nested dicts and lists of plain values).
+
+    Ax's ``object_from_json`` pops keys out of what it decodes, so anything decoded
+    more than once needs a copy. This is much faster than ``copy.deepcopy``
+    because it doesn't need to track already copied objects.
+    """
+    if isinstance(obj, dict):
+        return {k: copy_json(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [copy_json(v) for v in obj]
+    return obj
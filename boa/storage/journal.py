@@ -0,0 +1,183 @@
+"""
+########################
+Scheduler Journal
+########################
+
+Append-only journal of changes to a scheduler since its last full JSON snapshot.
+
+Instead of re-serializing the whole experiment and generation strategy every time
+a trial finishes, the journal storage backend writes one JSON line per trial state
+change, data attachment and batch of new generator runs. Every so often the journal
+is compacted into a new full snapshot and truncated.
+
+On loading, :func:`.scheduler_from_json_file` replays the journal on top of
+the snapshot it belongs to.
+
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import uuid
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional, Type
+
+from ax.storage.json_store.encoder import object_to_json
+from ax.storage.json_store.registry import (
+    CORE_CLASS_ENCODER_REGISTRY,
+    CORE_ENCODER_REGISTRY,
+)
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+from boa.scheduler import Scheduler
+from boa.storage.background import BackgroundWriter, write_or_submit
+from boa.storage.tracking import SchedulerChangeTracker
+
+logger = get_logger()
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+JOURNAL_ID_KEY = "journal_id"
+
+
+def journal_path_for(scheduler_filepath: PathLike) -> pathlib.Path:
+    """Path of the journal that goes with a scheduler snapshot,
+    ``scheduler.json`` -> ``scheduler.journal.jsonl``
+    """
+    scheduler_filepath = pathlib.Path(scheduler_filepath)
+    return scheduler_filepath.with_name(scheduler_filepath.name.split(".")[0] + JOURNAL_SUFFIX)
+
+
+def new_journal_id() -> str:
+    return uuid.uuid4().hex
+
+
+class SchedulerJournal:
+    """Append-only record of the changes made to a scheduler since its last snapshot.
+
+    Parameters
+    ----------
+    path
+        Path to the journal file
+    journal_id
+        Id of the snapshot this journal belongs to. It is written as the first
+        record, so a journal left over from an older snapshot is never replayed.
+    writer
+        Optional :class:`.BackgroundWriter` to do the file writes on
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        journal_id: str,
+        encoder_registry: Optional[Dict[Type, Callable[[Any], Dict[str, Any]]]] = None,
+        class_encoder_registry: Optional[Dict[Type, Callable[[Any], Dict[str, Any]]]] = None,
+        writer: Optional[BackgroundWriter] = None,
+    ):
+        self.path = pathlib.Path(path)
+        self.journal_id = journal_id
+        self.writer = writer
+        self.encoder_registry = encoder_registry or CORE_ENCODER_REGISTRY
+        self.class_encoder_registry = class_encoder_registry or CORE_CLASS_ENCODER_REGISTRY
+        self.tracker = SchedulerChangeTracker()
+        self.n_records = 0
+
+    def start(self, scheduler: Scheduler) -> None:
+        """Truncate the journal and mark the current state of ``scheduler`` as
+        already saved (it was just written out as a full snapshot)."""
+        header = json.dumps({"record": "header", JOURNAL_ID_KEY: self.journal_id}) + "\n"
+        write_or_submit(self.writer, self.path, partial(self._write, "w", header), replaces=True)
+        self.tracker.mark_saved(scheduler)
+        self.n_records = 0
+
+    def _write(self, mode: str, text: str) -> None:
+        with open(self.path, mode) as file:
+            file.write(text)
+
+    def _to_json(self, obj):
+        return object_to_json(
+            obj, encoder_registry=self.encoder_registry, class_encoder_registry=self.class_encoder_registry
+        )
+
+    def record_changes(self, scheduler: Scheduler) -> int:
+        """Append a record for everything that changed since the last save.
+
+        Returns
+        -------
+        int
+            The number of records written
+        """
+        changes = self.tracker.collect_changes(scheduler)
+        records = []
+        if changes["generator_runs"] or changes["curr_index"] is not None:
+            records.append(
+                {
+                    "record": "generator_runs",
+                    "start": changes["generator_runs_start"],
+                    "curr_index": changes["curr_index"],
+                    "generator_runs": self._to_json(changes["generator_runs"]),
+                }
+            )
+        for idx, trial in changes["trials"].items():
+            records.append({"record": "trial", "trial_index": idx, "trial": self._to_json(trial)})
+        for idx, data_by_timestamp in changes["data"].items():
+            records.append({"record": "data", "trial_index": idx, "data": self._to_json(data_by_timestamp)})
+
+        if records:
+            text = "".join(json.dumps(record) + "\n" for record in records)
+            write_or_submit(self.writer, self.path, partial(self._write, "a", text))
+            self.n_records += len(records)
+        return len(records)
+
+
+def read_journal(path: PathLike, journal_id: str) -> list[dict]:
+    """Read the records of a journal file.
+
+    Returns no records if the journal doesn't exist or belongs to a different snapshot
+    than ``journal_id``. A truncated last line (from being killed mid write) is skipped.
+    """
+    path = pathlib.Path(path)
+    if not path.exists():
+        return []
+    with open(path, "r") as file:
+        lines = file.read().splitlines()
+    records = []
+    for line_num, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            if line_num == len(lines) - 1:
+                logger.warning(f"Skipping incomplete last record of journal `{path}`.")
+                break
+            raise
+    if not records or records[0].get("record") != "header" or records[0].get(JOURNAL_ID_KEY) != journal_id:
+        logger.info(f"Journal `{path}` does not belong to the loaded snapshot, not replaying it.")
+        return []
+    return records[1:]
+
+
+def replay_journal(serialized: Dict[str, Any], records: Iterable[dict]) -> Dict[str, Any]:
+    """Apply journal records to a JSON scheduler snapshot (in place) before it is decoded."""
+    experiment = serialized["experiment"]
+    gs = serialized["generation_strategy"]
+    n_records = 0
+    for record in records:
+        kind = record["record"]
+        if kind == "trial":
+            experiment["trials"][str(record["trial_index"])] = record["trial"]
+        elif kind == "data":
+            experiment["data_by_trial"][str(record["trial_index"])] = record["data"]
+        elif kind == "generator_runs":
+            # slice assignment so replaying a record twice is harmless
+            gs["generator_runs"][record["start"] :] = record["generator_runs"]  # noqa: E203  # black bug
+            if record["curr_index"] is not None:
+                gs["curr_index"] = record["curr_index"]
+        else:
+            raise ValueError(f"Unknown journal record type: {kind}")
+        n_records += 1
+    if n_records:
+        logger.info(f"Replayed {n_records} journal records on top of scheduler snapshot.")
+    return serialized
@@ -0,0 +1,179 @@
+"""
+########################
+Optimization CSV
+########################
+
+Incremental writing of the optimization.csv trial table.
+
+Rendering the whole table to csv and rewriting the file every time trials finish gets
+slow for experiments with many trials. :class:`IncrementalOptCSVWriter` builds the table
+with :func:`ax.service.utils.report_utils.exp_to_df`, but only renders the rows of the
+trials that changed since its last write, appends them to the file if they are all new
+trials, and otherwise rewrites the file from its already rendered rows. It renders the whole
+table again when its columns or their types change (a new metric, a failed trial's reason,
+a column of integers getting a missing value, etc.), so the file is always the same as a
+full render of the table.
+
+"""
+
+from __future__ import annotations
+
+import pathlib
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from ax import Experiment
+from ax.service.utils.report_utils import exp_to_df
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+from boa.storage.atomic import atomic_write
+from boa.storage.background import BackgroundWriter, write_or_submit
+from boa.storage.tracking import TrialChangeTracker
+
+logger = get_logger()
+
+
+def experiment_opt_df(
+    experiment: Experiment, metrics_to_end: bool = False, ax_kwargs: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """Trial table of ``experiment`` as written to optimization.csv"""
+    df = exp_to_df(experiment, **(ax_kwargs or {}))
+    metrics = list(experiment.metrics.keys())
+    isin = df.columns.isin(metrics).sum() == len(metrics)
+    if metrics_to_end and isin:
+        df = df[[col for col in df.columns if col not in metrics] + metrics]
+    return df
+
+
+class IncrementalOptCSVWriter:
+    """Writes the optimization.csv trial table, only rendering the rows of trials
+    that changed since the last write.
+
+    Parameters
+    ----------
+    path
+        Path to the csv file
+    metrics_to_end
+        Move the metric columns to the end of the table
+    ax_kwargs
+        Keyword arguments passed to :func:`ax.service.utils.report_utils.exp_to_df`
+    background_writer
+        Optional :class:`.BackgroundWriter` to do the file writes on
+    kwargs
+        Keyword arguments passed to :meth:`pandas.DataFrame.to_csv`
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        metrics_to_end: bool = False,
+        ax_kwargs: Optional[Dict[str, Any]] = None,
+        background_writer: Optional[BackgroundWriter] = None,
+        **kwargs,
+    ):
+        self.path = pathlib.Path(path)
+        self.background_writer = background_writer
+        self.metrics_to_end = metrics_to_end
+        self.ax_kwargs = ax_kwargs or {}
+        kwargs.setdefault("na_rep", "NA")
+        self.to_csv_kwargs = kwargs
+        self.tracker = TrialChangeTracker()
+        self._header: Optional[list[str]] = None
+        self._dtypes: Optional[pd.Series] = None
+        self._header_line: str = ""
+        self._rows: dict[int, str] = {}
+        # size and modification time of the file after our last write, set by the thread doing the writes
+        self._file_stat: Optional[tuple[int, int]] = None
+        self._file_lock = threading.Lock()
+
+    def matches(self, path: PathLike, metrics_to_end: bool = False, ax_kwargs=None, **kwargs) -> bool:
+        """Whether this writer writes to ``path`` with the same settings"""
+        kwargs.setdefault("na_rep", "NA")
+        return (
+            self.path == pathlib.Path(path)
+            and self.metrics_to_end == metrics_to_end
+            and self.ax_kwargs == (ax_kwargs or {})
+            and self.to_csv_kwargs == kwargs
+        )
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _render_rows(self, df: pd.DataFrame) -> dict[int, str]:
+        if df.empty:
+            return {}
+        text = df.to_csv(index=False, header=False, lineterminator="\n", **self.to_csv_kwargs)
+        lines = text.splitlines(keepends=True)
+        rows: dict[int, str] = {}
+        if len(lines) == len(df):
+            for idx, line in zip(df["trial_index"], lines):
+                rows[int(idx)] = rows.get(int(idx), "") + line
+        else:  # some value has a newline in it, render trial by trial
+            for idx, trial_df in df.groupby("trial_index", sort=False):
+                rows[int(idx)] = trial_df.to_csv(index=False, header=False, lineterminator="\n", **self.to_csv_kwargs)
+        return rows
+
+    def _write_file(self, mode: str, text: str) -> None:
+        def write():
+            with self._file_lock:
+                if mode == "w":
+                    atomic_write(self.path, text)
+                else:
+                    with open(self.path, mode) as file:
+                        file.write(text)
+                self._file_stat = self._stat()
+
+        write_or_submit(self.background_writer, self.path, write, replaces=mode == "w")
+
+    def rewrite(self, experiment: Experiment) -> pathlib.Path:
+        """Rebuild the whole table and rewrite the file"""
+        df = experiment_opt_df(experiment, metrics_to_end=self.metrics_to_end, ax_kwargs=self.ax_kwargs)
+        self.tracker.mark_saved(experiment)
+        return self._rewrite_table(df)
+
+    def _rewrite_table(self, df: pd.DataFrame) -> pathlib.Path:
+        self._header = list(df.columns)
+        self._dtypes = df.dtypes
+        self._header_line = df.head(0).to_csv(index=False, lineterminator="\n", **self.to_csv_kwargs)
+        self._rows = self._render_rows(df) if "trial_index" in df.columns else {}
+        self._write_file("w", self._header_line + "".join(self._rows[idx] for idx in sorted(self._rows)))
+        return self.path
+
+    def _file_changed(self) -> bool:
+        # not while a write is in progress, which would look like somebody else changed the file
+        with self._file_lock:
+            return self._stat() != self._file_stat
+
+    def write(self, experiment: Experiment) -> pathlib.Path:
+        """Write the rows of the trials that changed since the last write"""
+        if self._header is None or "trial_index" not in self._header or self._file_changed():
+            # first write, no trials yet, or somebody else changed the file
+            return self.rewrite(experiment)
+
+        trials, data = self.tracker.collect_changes(experiment)
+        changed = set(trials) | set(data)
+        if not changed:
+            return self.path
+
+        df = experiment_opt_df(experiment, metrics_to_end=self.metrics_to_end, ax_kwargs=self.ax_kwargs)
+        if list(df.columns) != self._header or not df.dtypes.equals(self._dtypes):
+            # the rendering of the already written rows could change as well
+            logger.debug("Columns of the optimization csv changed, rewriting the whole file.")
+            return self._rewrite_table(df)
+        rows = self._render_rows(df[df["trial_index"].isin(changed)])
+        if not rows:
+            return self.path
+
+        only_new_trials = min(rows) > max(self._rows, default=-1)
+        self._rows.update(rows)
+        if only_new_trials:
+            self._write_file("a", "".join(rows[idx] for idx in sorted(rows)))
+        else:
+            self._write_file("w", self._header_line + "".join(self._rows[idx] for idx in sorted(self._rows)))
+        return self.path
@@ -0,0 +1,262 @@
+"""
+########################
+Lazy Snapshot Loading
+########################
+
+Read parts of a saved scheduler without restoring the whole thing.
+
+Restoring a :class:`.Scheduler` decodes every trial, every trial's data, the
+generation strategy and the wrapper, which for a large optimization can take minutes.
+:class:`SchedulerSnapshot` instead only decodes what is asked for, when it is asked for,
+and can summarize the trials (a trial table plus the best trials) straight from the
+JSON, without decoding any Ax objects beyond the optimization config.
+
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+from ax import Data, Experiment, Metric, OptimizationConfig, SearchSpace
+from ax.core.objective import MultiObjective, ScalarizedObjective
+from ax.core.types import ComparisonOp
+from ax.storage.json_store.decoder import data_from_json, object_from_json
+from ax.storage.json_store.registry import (
+    CORE_CLASS_DECODER_REGISTRY,
+    CORE_DECODER_REGISTRY,
+)
+
+from boa.config import BOAConfig
+from boa.definitions import PathLike
+from boa.scheduler import Scheduler
+from boa.storage.formats import copy_json
+
+SUMMARY_COLUMNS = ["trial_index", "arm_name", "trial_status", "generation_method"]
+
+
+class SchedulerSnapshot:
+    """A saved scheduler, decoded lazily.
+
+    Nothing is decoded into Ax objects until it is accessed, and then only the part
+    of the snapshot needed is decoded, once. Use :meth:`summary` and :meth:`best_trials`
+    for a quick look at an optimization (for dashboards or checking on a long run) and
+    :meth:`to_scheduler` to restore the full scheduler.
+
+    Parameters
+    ----------
+    serialized
+        JSON snapshot of the scheduler (from :func:`.scheduler_to_json_snapshot`
+        or :func:`.load_scheduler_snapshot`)
+    filepath
+        Path the snapshot was loaded from
+    """
+
+    def __init__(
+        self,
+        serialized: Dict[str, Any],
+        filepath: Optional[PathLike] = None,
+        decoder_registry: Optional[Dict[str, Type]] = None,
+        class_decoder_registry: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+    ):
+        self.serialized = serialized
+        self.filepath = pathlib.Path(filepath) if filepath is not None else None
+        self.decoder_registry = decoder_registry or CORE_DECODER_REGISTRY
+        self.class_decoder_registry = class_decoder_registry or CORE_CLASS_DECODER_REGISTRY
+
+    @classmethod
+    def from_file(cls, filepath: PathLike = "scheduler.json", **kwargs) -> SchedulerSnapshot:
+        """Load a snapshot from any of the storage backends (see :func:`.load_scheduler_snapshot`)"""
+        from boa.storage import load_scheduler_snapshot
+
+        return cls(load_scheduler_snapshot(filepath), filepath=filepath, **kwargs)
+
+    def _decode(self, obj):
+        # object_from_json consumes what it decodes, decode a copy so the snapshot can be decoded again
+        return object_from_json(
+            copy_json(obj), decoder_registry=self.decoder_registry, class_decoder_registry=self.class_decoder_registry
+        )
+
+    @property
+    def _experiment_json(self) -> Dict[str, Any]:
+        return self.serialized["experiment"]
+
+    def _trial_entry(self, key: str, trial_index: int):
+        entries = self._experiment_json[key]
+        # keys are only strings once the snapshot has been through a JSON file
+        return entries.get(str(trial_index), entries.get(trial_index))
+
+    @property
+    def boa_version(self) -> Optional[str]:
+        return self.serialized.get("boa_version")
+
+    @property
+    def trial_indices(self) -> List[int]:
+        return sorted(int(idx) for idx in self._experiment_json["trials"])
+
+    @cached_property
+    def search_space(self) -> SearchSpace:
+        return self._decode(self._experiment_json["search_space"])
+
+    @cached_property
+    def optimization_config(self) -> Optional[OptimizationConfig]:
+        return self._decode(self._experiment_json["optimization_config"])
+
+    @cached_property
+    def metrics(self) -> Dict[str, Metric]:
+        metrics = dict(self.optimization_config.metrics) if self.optimization_config else {}
+        for metric in self._decode(self._experiment_json.get("tracking_metrics") or []):
+            metrics[metric.name] = metric
+        return metrics
+
+    @cached_property
+    def experiment(self) -> Experiment:
+        """The full experiment, without the generation strategy or wrapper"""
+        return self._decode(self._experiment_json)
+
+    def load_config(self, **kwargs) -> BOAConfig:
+        """The config the scheduler was run with.
+
+        Parameters
+        ----------
+        **kwargs
+            Options to override in the config
+        """
+        wrapper_json = self.serialized["wrapper"]
+        # sometimes the way people write their to_dict methods wrap it in a list
+        if isinstance(wrapper_json, list) and len(wrapper_json) == 1:
+            wrapper_json = wrapper_json[0]
+        return BOAConfig(**{**self._decode(wrapper_json["config"]), **kwargs})
+
+    def trial_data(self, trial_index: int) -> Data:
+        """The most recent data attached to a trial"""
+        data_json = self._trial_entry("data_by_trial", trial_index)
+        if not data_json:
+            return Data()
+        data_by_ts = data_from_json(
+            {str(trial_index): copy_json(data_json)},
+            decoder_registry=self.decoder_registry,
+            class_decoder_registry=self.class_decoder_registry,
+        )[trial_index]
+        return data_by_ts[max(data_by_ts)] if data_by_ts else Data()
+
+    def fetch_data(self, trial_indices: Optional[Iterable[int]] = None) -> Data:
+        """The most recent data of each trial (or of ``trial_indices``), decoding only those trials' data"""
+        trial_indices = self.trial_indices if trial_indices is None else trial_indices
+        data = [self.trial_data(idx) for idx in trial_indices]
+        data = [d for d in data if not d.df.empty]
+        if not data:
+            return Data()
+        return Data.from_multiple_data(data)
+
+    def _latest_data_rows(self, data_json) -> Dict[str, List]:
+        if not data_json:
+            return {}
+        # data is saved as an OrderedDict of timestamp -> Data, whose df is a JSON string
+        _, latest = max(data_json["value"], key=lambda ts_data: int(ts_data[0]))
+        columns = json.loads(latest["df"]["value"])
+        rows = sorted(columns.get("mean", {}), key=int)
+        return {name: [column.get(row) for row in rows] for name, column in columns.items()}
+
+    def summary(self) -> pd.DataFrame:
+        """A table of the trials, one row per arm, with each arm's trial status, generation method,
+        parameters and most recent metric means.
+
+        Made straight from the JSON of the snapshot, without decoding the trials or their data.
+        """
+        records = OrderedDict()
+        for idx in self.trial_indices:
+            trial_json = self._trial_entry("trials", idx)
+            if trial_json.get("generator_run") is not None:
+                generator_runs = [trial_json["generator_run"]]
+            else:  # batch trial
+                generator_runs = [struct["generator_run"] for struct in trial_json.get("generator_run_structs", [])]
+
+            generation_methods = {gr["model_key"] for gr in generator_runs if gr.get("model_key") is not None}
+            if any(gr.get("generator_run_type") == "MANUAL" for gr in generator_runs):
+                generation_methods.add("Manual")
+            generation_method = (trial_json.get("properties") or {}).get("generation_model_key") or (
+                ", ".join(generation_methods) if generation_methods else "Unknown"
+            )
+
+            for gr in generator_runs:
+                for arm in gr["arms"]:
+                    records[arm["name"]] = {
+                        "trial_index": idx,
+                        "arm_name": arm["name"],
+                        "trial_status": trial_json["status"]["name"],
+                        "generation_method": generation_method,
+                        **arm["parameters"],
+                    }
+
+            data = self._latest_data_rows(self._trial_entry("data_by_trial", idx))
+            for arm_name, metric_name, mean in zip(
+                data.get("arm_name", []), data.get("metric_name", []), data.get("mean", [])
+            ):
+                if arm_name in records:
+                    records[arm_name][metric_name] = mean
+
+        df = pd.DataFrame.from_records(list(records.values()), columns=SUMMARY_COLUMNS if not records else None)
+        for metric_name in self.metrics:
+            if metric_name not in df:
+                df[metric_name] = np.nan
+        return df
+
+    def best_trials(self, n: int = 1) -> pd.DataFrame:
+        """The best completed arms by their observed metric means, from :meth:`summary`.
+
+        Arms that violate an (absolute) outcome constraint are left out. For multi objective
+        optimizations, returns the arms on the Pareto front, otherwise the ``n`` best arms.
+        """
+        df = self.summary()
+        df = df[df["trial_status"] == "COMPLETED"]
+        if self.optimization_config is None or df.empty:
+            return df.iloc[:0]
+        for constraint in self.optimization_config.outcome_constraints:
+            if constraint.relative or constraint.metric.name not in df:
+                continue
+            values = df[constraint.metric.name]
+            df = df[values <= constraint.bound if constraint.op == ComparisonOp.LEQ else values >= constraint.bound]
+
+        objective = self.optimization_config.objective
+        if isinstance(objective, MultiObjective):
+            objectives = objective.objectives
+            df = df.dropna(subset=[obj.metric.name for obj in objectives])
+            # flip the sign of minimized objectives so the Pareto front is where everything is maximized
+            y = np.column_stack([df[obj.metric.name] * (-1 if obj.minimize else 1) for obj in objectives])
+            return df[_pareto_mask(y)]
+
+        if isinstance(objective, ScalarizedObjective):
+            values = sum(df[metric.name] * weight for metric, weight in zip(objective.metrics, objective.weights))
+        else:
+            values = df[objective.metric.name]
+        best = values.dropna().sort_values(ascending=objective.minimize, kind="stable").index[:n]
+        return df.loc[best]
+
+    def to_scheduler(self, **kwargs) -> Scheduler:
+        """Restore the full scheduler (see :func:`.scheduler_from_json_file`)"""
+        from boa.storage import _scheduler_from_loaded_snapshot
+
+        return _scheduler_from_loaded_snapshot(
+            copy_json(self.serialized),
+            filepath=self.filepath,
+            decoder_registry=self.decoder_registry,
+            class_decoder_registry=self.class_decoder_registry,
+            **kwargs,
+        )
+
+
+def _pareto_mask(y: np.ndarray) -> np.ndarray:
+    """Mask of the rows of ``y`` not dominated by any other row, where larger is better"""
+    efficient = np.ones(len(y), dtype=bool)
+    for i, point in enumerate(y):
+        if efficient[i]:
+            # keep everything better in at least one objective, or equal to this point
+            efficient[efficient] = np.any(y[efficient] > point, axis=1) | np.all(y[efficient] == point, axis=1)
+            efficient[i] = True
+    return efficient
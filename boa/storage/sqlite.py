@@ -0,0 +1,210 @@
+"""
+########################
+SQLite Storage
+########################
+
+Local SQLite storage of scheduler state.
+
+The scheduler is stored as one row per trial, per trial's data and per generator run,
+plus the rest of the JSON snapshot (search space, optimization config, wrapper, options, ...)
+as a single row. The first save of a scheduler writes everything, every save after that
+only upserts the rows that changed since the last save, in a single transaction.
+A crash mid save leaves the database at the previous save.
+
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sqlite3
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Type
+
+from ax.storage.json_store.encoder import object_to_json
+from ax.storage.json_store.registry import (
+    CORE_CLASS_ENCODER_REGISTRY,
+    CORE_ENCODER_REGISTRY,
+)
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+from boa.scheduler import Scheduler
+from boa.storage.background import BackgroundWriter, write_or_submit
+from boa.storage.tracking import SchedulerChangeTracker
+
+logger = get_logger()
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS trials (trial_index INTEGER PRIMARY KEY, trial TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS data (trial_index INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS generator_runs (gr_index INTEGER PRIMARY KEY, generator_run TEXT NOT NULL);
+"""
+
+
+def sqlite_path_for(scheduler_filepath: PathLike) -> pathlib.Path:
+    """Path of the SQLite database that goes with a scheduler file,
+    ``scheduler.json`` (or ``scheduler.json.gz``) -> ``scheduler.db``
+    """
+    scheduler_filepath = pathlib.Path(scheduler_filepath)
+    if scheduler_filepath.suffix in SQLITE_SUFFIXES:
+        return scheduler_filepath
+    return scheduler_filepath.with_name(scheduler_filepath.name.split(".")[0] + ".db")
+
+
+def is_sqlite_file(path: PathLike) -> bool:
+    """Whether ``path`` is an SQLite database, by its header if it exists, else its extension."""
+    path = pathlib.Path(path)
+    if path.is_file():
+        with open(path, "rb") as file:
+            return file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    return path.suffix in SQLITE_SUFFIXES
+
+
+def _connect(path: PathLike) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path))
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class SQLiteSchedulerStore:
+    """Saves a scheduler to a local SQLite database, only writing what changed since the last save.
+
+    Parameters
+    ----------
+    path
+        Path to the SQLite database file
+    writer
+        Optional :class:`.BackgroundWriter` to run the database transactions on
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        encoder_registry: Optional[Dict[Type, Callable[[Any], Dict[str, Any]]]] = None,
+        class_encoder_registry: Optional[Dict[Type, Callable[[Any], Dict[str, Any]]]] = None,
+        writer: Optional[BackgroundWriter] = None,
+    ):
+        self.path = pathlib.Path(path)
+        self.writer = writer
+        self.encoder_registry = encoder_registry or CORE_ENCODER_REGISTRY
+        self.class_encoder_registry = class_encoder_registry or CORE_CLASS_ENCODER_REGISTRY
+        self.tracker = SchedulerChangeTracker()
+
+    def _to_json(self, obj) -> str:
+        return json.dumps(
+            object_to_json(
+                obj, encoder_registry=self.encoder_registry, class_encoder_registry=self.class_encoder_registry
+            )
+        )
+
+    def write_snapshot(self, scheduler: Scheduler, serialized: Dict[str, Any]) -> None:
+        """Replace the contents of the database with a full JSON snapshot of ``scheduler``
+        (from :func:`.scheduler_to_json_snapshot`)."""
+        write_or_submit(self.writer, self.path, partial(write_sqlite_snapshot, self.path, serialized), replaces=True)
+        self.tracker.mark_saved(scheduler)
+
+    def write_changes(self, scheduler: Scheduler) -> int:
+        """Upsert the trials, data and generator runs that changed since the last save.
+
+        Returns
+        -------
+        int
+            The number of rows written
+        """
+        changes = self.tracker.collect_changes(scheduler)
+        trials = [(idx, self._to_json(trial)) for idx, trial in changes["trials"].items()]
+        data = [(idx, self._to_json(data_by_timestamp)) for idx, data_by_timestamp in changes["data"].items()]
+        start = changes["generator_runs_start"]
+        generator_runs = [(start + i, self._to_json(gr)) for i, gr in enumerate(changes["generator_runs"])]
+        curr_index = changes["curr_index"]
+
+        def write():
+            conn = _connect(self.path)
+            try:
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO trials (trial_index, trial) VALUES (?, ?)", trials)
+                    conn.executemany("INSERT OR REPLACE INTO data (trial_index, data) VALUES (?, ?)", data)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO generator_runs (gr_index, generator_run) VALUES (?, ?)", generator_runs
+                    )
+                    if curr_index is not None:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO meta (key, value) VALUES ('curr_index', ?)",
+                            (json.dumps(curr_index),),
+                        )
+            finally:
+                conn.close()
+
+        write_or_submit(self.writer, self.path, write)
+        n_rows = len(trials) + len(data) + len(generator_runs)
+        logger.debug(f"Upserted {n_rows} rows to SQLite database `{self.path}`.")
+        return n_rows
+
+
+def write_sqlite_snapshot(path: PathLike, serialized: Dict[str, Any]) -> None:
+    """Replace the contents of an SQLite database with a JSON scheduler snapshot
+    (from :func:`.scheduler_to_json_snapshot`)."""
+    serialized = dict(serialized)
+    experiment = serialized["experiment"] = dict(serialized["experiment"])
+    gs = serialized["generation_strategy"] = dict(serialized["generation_strategy"])
+    trials = experiment.pop("trials")
+    data_by_trial = experiment.pop("data_by_trial")
+    generator_runs = gs.pop("generator_runs")
+    curr_index = gs.pop("curr_index")
+    gs["experiment"] = None  # duplicate of the experiment, not needed to decode the generation strategy
+
+    conn = _connect(path)
+    try:
+        with conn:
+            for table in ("meta", "trials", "data", "generator_runs"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [("snapshot", json.dumps(serialized)), ("curr_index", json.dumps(curr_index))],
+            )
+            conn.executemany(
+                "INSERT INTO trials (trial_index, trial) VALUES (?, ?)",
+                [(int(idx), json.dumps(trial)) for idx, trial in trials.items()],
+            )
+            conn.executemany(
+                "INSERT INTO data (trial_index, data) VALUES (?, ?)",
+                [(int(idx), json.dumps(data)) for idx, data in data_by_trial.items()],
+            )
+            conn.executemany(
+                "INSERT INTO generator_runs (gr_index, generator_run) VALUES (?, ?)",
+                [(i, json.dumps(gr)) for i, gr in enumerate(generator_runs)],
+            )
+    finally:
+        conn.close()
+    logger.info(f"Saved state of optimization to SQLite database `{path}`.")
+
+
+def read_sqlite_snapshot(path: PathLike) -> Dict[str, Any]:
+    """Reassemble the JSON scheduler snapshot stored in an SQLite database,
+    in the same format :func:`.scheduler_to_json_snapshot` produces."""
+    conn = sqlite3.connect(f"file:{pathlib.Path(path).as_posix()}?mode=ro", uri=True)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        if "snapshot" not in meta:
+            raise ValueError(f"No scheduler saved in SQLite database `{path}`.")
+        serialized = json.loads(meta["snapshot"])
+        experiment = serialized["experiment"]
+        gs = serialized["generation_strategy"]
+        experiment["trials"] = {
+            str(idx): json.loads(trial) for idx, trial in conn.execute("SELECT trial_index, trial FROM trials")
+        }
+        experiment["data_by_trial"] = {
+            str(idx): json.loads(data) for idx, data in conn.execute("SELECT trial_index, data FROM data")
+        }
+        gs["generator_runs"] = [
+            json.loads(gr) for (gr,) in conn.execute("SELECT generator_run FROM generator_runs ORDER BY gr_index")
+        ]
+        gs["curr_index"] = json.loads(meta["curr_index"])
+    finally:
+        conn.close()
+    return serialized
@@ -0,0 +1,150 @@
+"""
+########################
+Change Tracking
+########################
+
+Track which parts of a scheduler's state changed since it was last saved,
+so incremental storage backends only have to write what is new.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Hashable
+
+from ax import Experiment
+from ax.core.base_trial import BaseTrial
+
+from boa.scheduler import Scheduler
+
+
+def _metadata_fingerprint(metadata: dict) -> str:
+    try:
+        encoded = json.dumps(metadata, sort_keys=True, default=repr)
+    except (TypeError, ValueError):  # keys that can't be sorted, or circular references
+        encoded = repr(metadata)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def trial_fingerprint(trial: BaseTrial) -> tuple[Hashable, ...]:
+    """Cheap fingerprint of the mutable state of a trial.
+
+    Anything that changes when a trial is staged, run, completed, failed, etc.
+    is part of the fingerprint (its run and stop metadata by content), so comparing
+    fingerprints avoids encoding every trial on every save.
+    """
+    return (
+        trial.status,
+        trial.time_staged,
+        trial.time_run_started,
+        trial.time_completed,
+        trial.abandoned_reason,
+        trial.failed_reason,
+        _metadata_fingerprint(trial.run_metadata),
+        _metadata_fingerprint(trial.stop_metadata),
+        len(trial.generator_runs),
+    )
+
+
+def data_fingerprint(data_by_timestamp: dict[int, Any]) -> tuple[tuple[int, int], ...]:
+    """Cheap fingerprint of the data of a trial, the timestamp and number of rows of each of
+    its data. Ax adds data under a new timestamp, or combines it with the last data, adding rows."""
+    return tuple((ts, len(data.df)) for ts, data in data_by_timestamp.items())
+
+
+class TrialChangeTracker:
+    """Remembers which trials of an experiment, and which of their data,
+    have already been persisted.
+
+    Call :meth:`mark_saved` after writing out the whole experiment and
+    :meth:`collect_changes` to get (and mark as saved) every trial and trial
+    data that changed since then.
+    """
+
+    def __init__(self):
+        self._trial_fingerprints: dict[int, tuple] = {}
+        self._data_fingerprints: dict[int, tuple[tuple[int, int], ...]] = {}
+
+    def mark_saved(self, experiment: Experiment) -> None:
+        """Record the current state of ``experiment``'s trials as saved."""
+        self._trial_fingerprints = {idx: trial_fingerprint(trial) for idx, trial in experiment.trials.items()}
+        self._data_fingerprints = {idx: data_fingerprint(data) for idx, data in experiment.data_by_trial.items()}
+
+    def collect_changes(self, experiment: Experiment) -> tuple[dict[int, BaseTrial], dict[int, Any]]:
+        """Return the trials and trial data that changed since the last save
+        and mark them as saved.
+
+        Returns
+        -------
+        tuple[dict, dict]
+            dict of trial index to changed trial, and dict of trial index to that
+            trial's full timestamp to data mapping for trials whose data changed.
+        """
+        trials = {}
+        for idx, trial in experiment.trials.items():
+            fingerprint = trial_fingerprint(trial)
+            if self._trial_fingerprints.get(idx) != fingerprint:
+                trials[idx] = trial
+                self._trial_fingerprints[idx] = fingerprint
+
+        data = {}
+        for idx, data_by_timestamp in experiment.data_by_trial.items():
+            fingerprint = data_fingerprint(data_by_timestamp)
+            if self._data_fingerprints.get(idx) != fingerprint:
+                data[idx] = data_by_timestamp
+                self._data_fingerprints[idx] = fingerprint
+        return trials, data
+
+
+class SchedulerChangeTracker:
+    """Remembers what state of a scheduler has already been persisted.
+
+    Call :meth:`mark_saved` after writing a full snapshot and
+    :meth:`collect_changes` to get (and mark as saved) everything that
+    changed since then.
+    """
+
+    def __init__(self):
+        self._trials = TrialChangeTracker()
+        self._n_generator_runs: int = 0
+        self._curr_index: int = 0
+
+    def mark_saved(self, scheduler: Scheduler) -> None:
+        """Record the current state of ``scheduler`` as saved."""
+        self._trials.mark_saved(scheduler.experiment)
+        self._n_generator_runs = len(scheduler.generation_strategy._generator_runs)
+        self._curr_index = scheduler.generation_strategy.current_step_index
+
+    def collect_changes(self, scheduler: Scheduler) -> dict[str, Any]:
+        """Return the trials, data and generator runs that changed since the last save
+        and mark them as saved.
+
+        Returns
+        -------
+        dict
+            ``trials``: dict of trial index to changed trial,
+            ``data``: dict of trial index to that trial's full timestamp to data mapping,
+            ``generator_runs``: list of new generator runs on the generation strategy,
+            ``generator_runs_start``: index of the first new generator run,
+            ``curr_index``: current generation step index, or None if unchanged.
+        """
+        gs = scheduler.generation_strategy
+        trials, data = self._trials.collect_changes(scheduler.experiment)
+
+        generator_runs_start = self._n_generator_runs
+        generator_runs = gs._generator_runs[generator_runs_start:]
+        self._n_generator_runs = len(gs._generator_runs)
+
+        curr_index = gs.current_step_index
+        curr_index_changed = curr_index != self._curr_index
+        self._curr_index = curr_index
+
+        return dict(
+            trials=trials,
+            data=data,
+            generator_runs=generator_runs,
+            generator_runs_start=generator_runs_start,
+            curr_index=curr_index if curr_index_changed or generator_runs else None,
+        )
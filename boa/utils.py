@@ -13,8 +13,10 @@ from __future__ import annotations
 import importlib
 import inspect
 import sys
+import threading
 import types
 import warnings
+import weakref
 from collections.abc import Iterable, Mapping
 from enum import Enum
 from importlib.metadata import version
@@ -123,8 +125,68 @@ logger = get_logger()
 # sys.meta_path.append(NotebookFinder())
 
 
+class _SignatureInfo:
+    """A callable's signature, and what :func:`get_dictionary_matching_signature` needs from it"""
+
+    __slots__ = ("signature", "has_kwargs", "fingerprint")
+
+    def __init__(self, signature: inspect.Signature, fingerprint: tuple):
+        self.signature = signature
+        self.has_kwargs = any(param.kind == inspect.Parameter.VAR_KEYWORD for param in signature.parameters.values())
+        # what the signature was made from, to tell if the callable was changed in place since
+        self.fingerprint = fingerprint
+
+
+# signatures by callable (by function for bound methods), dropped with the callable, such as
+# when its module is reloaded and it is replaced by a new function
+_signature_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_bound_signature_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_signature_cache_lock = threading.Lock()
+
+
+def _fingerprint(callable: Callable) -> tuple:
+    # reloaders like IPython's autoreload update functions and classes in place, instead of replacing them
+    func = inspect.unwrap(callable) if isinstance(callable, types.FunctionType) else callable
+    if isinstance(func, types.FunctionType):
+        return func.__code__, func.__defaults__, func.__kwdefaults__
+    cls = callable if isinstance(callable, type) else type(callable)
+    return tuple(getattr(cls, name, None) for name in ("__init__", "__new__", "__call__", "__signature__"))
+
+
+def _get_signature_info(callable: Callable) -> _SignatureInfo:
+    if isinstance(callable, types.MethodType):
+        # bound methods are made anew on each attribute access, so cache them by their function
+        cache, key = _bound_signature_cache, callable.__func__
+    else:
+        cache, key = _signature_cache, callable
+    fingerprint = _fingerprint(key)
+    try:
+        with _signature_cache_lock:
+            info = cache.get(key)
+    except TypeError:  # not hashable or can't be weakly referenced
+        return _SignatureInfo(inspect.signature(callable), fingerprint)
+    if info is not None and info.fingerprint == fingerprint:
+        return info
+    info = _SignatureInfo(inspect.signature(callable), fingerprint)
+    with _signature_cache_lock:
+        cache[key] = info
+    return info
+
+
+def clear_signature_cache() -> None:
+    """Clear the cached signatures of :func:`get_callable_signature` and :func:`get_dictionary_from_callable`.
+
+    Callables reloaded by re-importing their module (such as :func:`importlib.reload`), or changed in
+    place by reloaders like IPython's autoreload, are noticed without this.
+    """
+    with _signature_cache_lock:
+        _signature_cache.clear()
+        _bound_signature_cache.clear()
+
+
 def get_callable_signature(callable: Callable) -> inspect.Signature:
-    return inspect.signature(callable)
+    """:func:`inspect.signature` of ``callable``, cached for as long as ``callable`` exists and isn't changed"""
+    return _get_signature_info(callable).signature
 
 
 def get_dictionary_matching_signature(
@@ -133,12 +195,22 @@ def get_dictionary_matching_signature(
     match_private: bool = False,
     exclude_fields: Optional[list[str]] = None,
     accept_all_kwargs: bool = True,
+) -> dict:
+    has_kwargs = any(param.kind == inspect.Parameter.VAR_KEYWORD for param in signature.parameters.values())
+    return _match_signature(signature.parameters, has_kwargs, d, match_private, exclude_fields, accept_all_kwargs)
+
+
+def _match_signature(
+    params: Mapping[str, inspect.Parameter],
+    has_kwargs: bool,
+    d: dict,
+    match_private: bool = False,
+    exclude_fields: Optional[list[str]] = None,
+    accept_all_kwargs: bool = True,
 ) -> dict:
     args = {}
     exclude_fields = exclude_fields or []
-    params = signature.parameters
 
-    has_kwargs = inspect.Parameter.VAR_KEYWORD in [param.kind for param in params.values()]
     if accept_all_kwargs and has_kwargs:
         for key, value in d.items():
             if match_private and (key.startswith("_") or key.startswith("__")):
@@ -156,8 +228,8 @@ def get_dictionary_matching_signature(
 
 
 def get_dictionary_from_callable(callable: Callable, d: dict, **kwargs) -> dict:
-    signature = get_callable_signature(callable)
-    return get_dictionary_matching_signature(signature, d, **kwargs)
+    info = _get_signature_info(callable)
+    return _match_signature(info.signature.parameters, info.has_kwargs, d, **kwargs)
 
 
 def serialize_init_args(class_, *, parents: list[Type] = None, match_private: bool = False, **kwargs):
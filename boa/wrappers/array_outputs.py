@@ -0,0 +1,182 @@
+"""
+########################
+Array Outputs
+########################
+
+Reading large arrays your scripts write for ``fetch_trial_data``, such as the ``y_true``
+and ``y_pred`` of :class:`.RMSE`, from binary files instead of JSON.
+
+The output file of a trial can be an ``output.npz``, ``output.parquet`` or
+``output.arrow`` (or ``.feather``) file, with an array (or column) for each of your
+metric function's keyword arguments. Name them ``<metric name>/<argument>``, such as
+``RMSE/y_true``, to pass them to one metric when you have several. An ``output.npy``
+file is passed as your metric function's first argument.
+
+Or the metric arguments in a JSON (or YAML) output file can point to array files, relative
+to the trial directory, with ``#name`` to pick one array of an ``.npz`` file or column of a table::
+
+    {"RMSE": {"y_true": "observed.npy", "y_pred": "simulated.parquet#flow"}}
+
+Only the arguments themselves (or the items of a list argument) are read as array files,
+strings nested deeper in them are left as they are.
+
+``.npy`` files, and arrays of ``.npz`` files saved without compression
+(:func:`numpy.savez`), are memory-mapped, so they are only read as your metric function
+uses them. ``.arrow`` and ``.feather`` files are memory-mapped too, and ``.parquet``
+files are read into memory (both need the ``pyarrow`` package).
+"""
+from __future__ import annotations
+
+import pathlib
+import zipfile
+from typing import Any
+
+import numpy as np
+
+from boa.definitions import PathLike
+
+ARRAY_SUFFIXES = (".npy", ".npz", ".parquet", ".arrow", ".feather")
+# separates a name in an array file from the file, `simulated.parquet#flow`
+NAME_SEPARATOR = "#"
+# separates the metric name from its argument in array file names, `RMSE/y_true`
+KEY_SEPARATOR = "/"
+
+# from the zip file format spec, the local file header of each member
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_NAME_LENGTH_OFFSET = 26
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "Reading `.parquet`, `.arrow` and `.feather` output files requires the `pyarrow` package."
+            " Install it with `pip install pyarrow` or write `.npy` or `.npz` files instead."
+        ) from e
+    return pyarrow
+
+
+def is_array_file(path: PathLike) -> bool:
+    """Whether ``path`` is an array file this module can load (ignoring any ``#name``)"""
+    return pathlib.Path(str(path).split(NAME_SEPARATOR)[0]).suffix.lower() in ARRAY_SUFFIXES
+
+
+def _load_npz(path: pathlib.Path) -> dict[str, np.ndarray]:
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            name = info.filename[: -len(".npy")] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:  # savez_compressed, can't be memory-mapped
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            f.seek(info.header_offset + _LOCAL_HEADER_NAME_LENGTH_OFFSET)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + _LOCAL_HEADER_SIZE + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Array {name} in {path} has Python objects, which can't be memory-mapped")
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order="F" if fortran_order else "C"
+            )
+    return arrays
+
+
+def _load_table(path: pathlib.Path) -> dict[str, np.ndarray]:
+    pa = _pyarrow()
+    if path.suffix.lower() == ".parquet":
+        table = pa.parquet.read_table(path, memory_map=True)
+    else:
+        table = pa.feather.read_table(path, memory_map=True)
+    return {name: column.to_numpy() for name, column in zip(table.column_names, table.columns)}
+
+
+def load_array_file(path: PathLike) -> np.ndarray | dict[str, np.ndarray]:
+    """
+    Load an array file: the array of an ``.npy`` file, or the arrays of an ``.npz`` file or
+    the columns of a ``.parquet``, ``.arrow`` or ``.feather`` file by name. A ``#name`` after the
+    file path loads just that array or column.
+
+    Parameters
+    ----------
+    path
+        Path to the array file
+
+    Returns
+    -------
+    np.ndarray | dict[str, np.ndarray]
+        The array, or arrays by name
+    """
+    path, _, name = str(path).partition(NAME_SEPARATOR)
+    path = pathlib.Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Array file {path} not found")
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        arrays = np.load(path, mmap_mode="r")
+        if name:
+            raise ValueError(f"Can't load `{name}` from {path}, `.npy` files have one array")
+        return arrays
+    arrays = _load_npz(path) if suffix == ".npz" else _load_table(path)
+    if name:
+        if name not in arrays:
+            raise KeyError(f"{path} has no array named `{name}`, it has {list(arrays)}")
+        return arrays[name]
+    return arrays
+
+
+def load_array_output(path: PathLike) -> dict[str, Any]:
+    """
+    Load an array output file into the data of a trial, as if it were a JSON output file,
+    nesting names like ``RMSE/y_true`` as ``{"RMSE": {"y_true": ...}}``. An ``.npy`` file is
+    the first argument of the metric function, ``{"wrapper_args": [array]}``.
+    """
+    arrays = load_array_file(path)
+    if isinstance(arrays, np.ndarray):
+        return {"wrapper_args": [arrays]}
+    data = {}
+    for name, array in arrays.items():
+        *parents, key = name.split(KEY_SEPARATOR)
+        nested = data
+        for parent in parents:
+            nested = nested.setdefault(parent, {})
+        nested[key] = array
+    return data
+
+
+def _resolve_array_file(value: Any, base_dir: PathLike) -> Any:
+    if isinstance(value, str) and is_array_file(value):
+        return load_array_file(pathlib.Path(base_dir) / value)
+    return value
+
+
+def _resolve_argument(value: Any, base_dir: PathLike) -> Any:
+    if isinstance(value, list):
+        return [_resolve_array_file(item, base_dir) for item in value]
+    return _resolve_array_file(value, base_dir)
+
+
+def resolve_array_references(data: Any, base_dir: PathLike) -> Any:
+    """Replace the metric arguments in ``data`` (from a JSON or YAML output file) that are paths
+    to array files, relative to ``base_dir``, with the arrays they point to.
+
+    The metric arguments are the values of ``data`` and of the dictionaries in it (the arguments
+    by metric name), or the items of lists among those. Strings nested any deeper are left as they are.
+    """
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: (
+            {name: _resolve_argument(value, base_dir) for name, value in arguments.items()}
+            if isinstance(arguments, dict)
+            else _resolve_argument(arguments, base_dir)
+        )
+        for key, arguments in data.items()
+    }
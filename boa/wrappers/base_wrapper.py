@@ -9,6 +9,8 @@ from __future__ import annotations
 
 import copy
 import pathlib
+import time
+from collections.abc import MutableMapping
 from typing import Optional
 
 from ax import Trial
@@ -20,6 +22,14 @@ from boa.definitions import PathLike
 from boa.logger import get_logger
 from boa.metaclasses import WrapperRegister
 from boa.utils import yaml_dump
+from boa.wrappers.metric_cache import (
+    RESULTS_FILE_NAME,
+    TRIAL_STORE_DIR_NAME,
+    PayloadCache,
+    ResultCache,
+    TrialResultStore,
+    parameterization_key,
+)
 from boa.wrappers.wrapper_utils import (
     initialize_wrapper,
     load_jsonlike,
@@ -48,7 +58,7 @@ class BaseWrapper(metaclass=WrapperRegister):
         self._output_dir = None
         self.model_settings = None
         self.script_options = None
-        self._metric_cache = {}
+        self._metric_cache = None  # made on first use by make_metric_cache, once the config is loaded
         self._metric_properties = {}
         self._metric_names = kwargs.get("metric_names", [])
 
@@ -397,13 +407,10 @@ class BaseWrapper(metaclass=WrapperRegister):
         param_names: list[str] = None,
         **kwargs,
     ):
-        # in case users don't subclass with super
-        if not hasattr(self, "_metric_cache"):
-            self._metric_cache = {}
-        if trial.index not in self._metric_cache:
-            self._metric_cache[trial.index] = {}
-        if metric_name in self._metric_cache[trial.index]:
-            return self._metric_cache[trial.index][metric_name]
+        metric_cache = self._get_metric_cache()
+        cached = metric_cache.get(trial.index, {})
+        if metric_name in cached:
+            return cached[metric_name]
         res = self.fetch_trial_data(
             parameters=parameters,
             metric_name=metric_name,
@@ -423,16 +430,18 @@ class BaseWrapper(metaclass=WrapperRegister):
             res = {"wrapper_args": res}
         if metric_name not in res:
             res = {metric_name: res}
-        self._metric_cache[trial.index].update(res)
+        # set (not update) the trial's entry, so the cache can account for its size
+        cached = {**cached, **res}
+        metric_cache[trial.index] = cached
 
-        for name in self._metric_cache[trial.index].keys():
+        for name in cached.keys():
             if self.metric_names and name not in self.metric_names:
                 raise ValueError(
                     f"found extra returned metric: {name} in returned metrics from fetch_trial_data"
                     "Check the name of your metrics in your config file line up with the metric names "
                     "you return from your wrapper class or wrapper script."
                 )
-        return self._metric_cache[trial.index][metric_name]
+        return cached[metric_name]
 
     def fetch_trial_data(
         self,
@@ -556,6 +565,206 @@ class BaseWrapper(metaclass=WrapperRegister):
         ...     return {"a": funcs[metric_properties[metric_name]["function"]](parameters)}
         """
 
+    def _fetch_trials_data(self, trials: list[Trial], param_names: dict[str, list[str]] = None, **kwargs) -> None:
+        """Fetch the data of all the trials whose data isn't cached yet with :meth:`fetch_trials_data`,
+        and cache it for :meth:`_fetch_trial_data`."""
+        metric_cache = self._get_metric_cache()
+
+        def is_cached(trial):
+            cached = metric_cache.get(trial.index)
+            return bool(cached) and all(name in cached for name in self.metric_names)
+
+        trials = [trial for trial in trials if not is_cached(trial)]
+        if not trials:
+            return
+        res = self.fetch_trials_data(
+            trials=trials,
+            metric_properties=self._metric_properties,
+            param_names=param_names or {},
+            **kwargs,
+        )
+        if res is None:
+            return
+        for trial_index, trial_res in res.items():
+            for name in trial_res:
+                if self.metric_names and name not in self.metric_names:
+                    raise ValueError(
+                        f"found extra returned metric: {name} in returned metrics from fetch_trials_data"
+                        " Check the name of your metrics in your config file line up with the metric names"
+                        " you return from your wrapper class."
+                    )
+            metric_cache[trial_index] = {**metric_cache.get(trial_index, {}), **trial_res}
+
+    def fetch_trials_data(
+        self,
+        *,
+        trials: list[Trial],
+        metric_properties: dict,
+        param_names: dict[str, list[str]],
+        **kwargs,
+    ) -> dict[int, dict] | None:
+        """
+        Retrieves the trial data of several trials at once, for all metrics. When BOA fetches the
+        data of the trials that completed since the last poll, this is called once for all of them,
+        before :meth:`fetch_trial_data` would be called for each trial and metric. Override it if
+        your model's outputs are cheaper to load together, such as from one file or database query.
+
+        By default, returns None, and each trial's data is fetched with :meth:`fetch_trial_data`.
+
+        Parameters
+        ----------
+        trials
+            The trials to fetch the data of
+        metric_properties
+            collection of all metric properties for all metrics as a nested dictionary.
+            a specific metric properties can be accessed as `metric_properties["metric_name1"]`
+        param_names
+            The `param_names` of each metric, by metric name
+
+        Returns
+        -------
+        dict or None
+            A dictionary with the trial indices as keys, and as values, what :meth:`fetch_trial_data`
+            would return for all metrics of that trial at once, such as
+            ``{0: {"Mean": {"a": [1, 2, 3, 4]}}, 1: {"Mean": {"a": [2, 3, 4, 5]}}}``.
+            Trials left out are fetched with :meth:`fetch_trial_data`.
+        """
+        return None
+
+    def _get_metric_cache(self) -> MutableMapping:
+        # in case users don't subclass with super
+        if getattr(self, "_metric_cache", None) is None:
+            self._metric_cache = self.make_metric_cache()
+        return self._metric_cache
+
+    def make_metric_cache(self) -> MutableMapping:
+        """
+        Make the cache of the data fetched for each trial (what :meth:`fetch_trial_data`
+        returns for all metrics), by trial index. By default, a :class:`.PayloadCache`
+        bounded by the ``payload_cache_max_trials`` and ``payload_cache_max_mb`` script options.
+        Override to plug in your own cache, any mutable mapping.
+        """
+        max_trials = max_mb = None
+        if self.script_options:
+            max_trials = self.script_options.payload_cache_max_trials
+            max_mb = self.script_options.payload_cache_max_mb
+        return PayloadCache(max_trials=max_trials, max_bytes=None if max_mb is None else int(max_mb * 1024**2))
+
+    def make_result_cache(self, metric_name: str) -> MutableMapping:
+        """
+        Make the cache of a metric's computed results, by trial. By default, a :class:`.ResultCache`,
+        persisted to ``metric_results.jsonl`` in the experiment directory with the
+        ``persist_metric_results`` script option. Override to plug in your own cache, any mutable mapping.
+
+        Parameters
+        ----------
+        metric_name
+            Name of the metric whose results are cached
+        """
+        path = None
+        if self.script_options and self.script_options.persist_metric_results and self.experiment_dir:
+            path = pathlib.Path(self.experiment_dir) / RESULTS_FILE_NAME
+        return ResultCache(metric_name, path=path)
+
+    def _get_trial_store(self) -> Optional[TrialResultStore]:
+        if "_trial_store" not in self.__dict__:
+            self.__dict__["_trial_store"] = self.make_trial_store()
+        return self.__dict__["_trial_store"]
+
+    def make_trial_store(self) -> Optional[TrialResultStore]:
+        """
+        Make the store of the metric values of evaluated parameterizations, used to complete trials
+        whose parameterization was already evaluated without running them (see :meth:`memoization_key`).
+        By default, with the ``memoize_trials`` script option, a :class:`.TrialResultStore` in a
+        ``trial_results`` directory in the output directory (the parent of the experiment directory),
+        or None (no memoization) without it.
+        """
+        if not (self.script_options and self.script_options.memoize_trials and self.experiment_dir):
+            return None
+        output_dir = self.output_dir or pathlib.Path(self.experiment_dir).parent
+        return TrialResultStore(pathlib.Path(output_dir) / TRIAL_STORE_DIR_NAME)
+
+    def memoization_key(self, trial: Trial) -> str:
+        """
+        Key of the parameterization of a trial in the store of :meth:`make_trial_store`.
+        Trials with the same key are taken to have the same metric values.
+        By default, a hash of the trial's parameters, the ``model_options`` of the config
+        and what evaluates them (see :meth:`_memoization_evaluator`).
+        Override if other things change your model's results, or to leave out parameters that don't.
+
+        Parameters
+        ----------
+        trial
+            The trial to key
+        """
+        return parameterization_key(trial.arm.parameters, self.model_settings, self._memoization_evaluator())
+
+    def _memoization_evaluator(self) -> dict:
+        """What evaluates the parameters of trials for :meth:`memoization_key`, the wrapper class
+        and the objective of the config, so experiments of other models or metrics sharing the
+        output directory don't reuse each other's results."""
+        return {
+            "wrapper": f"{type(self).__module__}.{type(self).__qualname__}",
+            "objective": self.config.objective.to_dict() if self.config else None,
+        }
+
+    def run_model_batch(self, trials: list[Trial]) -> None:
+        """
+        Deploy several trials at once, called instead of :meth:`write_configs` and :meth:`run_model`
+        for each trial when the ``batch_trials`` script option is set. Override if your model can
+        run several parameterizations at once, such as vectorized or as one job array.
+        By default, writes the configs of and runs each trial in turn.
+
+        Parameters
+        ----------
+        trials
+            The trials to deploy
+        """
+        for trial in trials:
+            self.write_configs(trial)
+            self.run_model(trial)
+
+    def set_trial_status_batch(self, trials: list[Trial]) -> None:
+        """
+        Set the status of several trials at once, called instead of :meth:`set_trial_status`
+        for each trial when the ``batch_trials`` script option is set.
+        By default, sets the status of each trial in turn.
+
+        Parameters
+        ----------
+        trials
+            The trials to set the status of
+        """
+        for trial in trials:
+            self.set_trial_status(trial)
+
+    def stop_trial(self, trial: Trial, reason: Optional[str] = None) -> None:
+        """
+        Stop a trial's model run, such as when it runs longer than the ``trial_timeout``
+        script option. Override to cancel your model run, such as killing its process or
+        cancelling its batch job. BOA marks the trial's status itself (before calling this).
+
+        Parameters
+        ----------
+        trial
+            The trial to stop
+        reason
+            Why the trial is being stopped
+        """
+
+    def wait_for_trial_updates(self, timeout: float) -> None:
+        """
+        Wait between polls of the running trials, for up to ``timeout`` seconds.
+        Override to return early when a trial may have finished.
+        """
+        time.sleep(timeout)
+
+    def close(self) -> None:
+        """
+        Called when the optimization is done. Override to release anything your wrapper
+        keeps running between trials, such as connections or long-lived processes.
+        """
+
     def to_dict(self) -> dict:
         """Convert BaseWrapper to a dictionary."""
 
@@ -0,0 +1,47 @@
+"""
+########################
+Script Worker Clients
+########################
+
+Reference clients of the script worker protocol (see :mod:`.script_worker`), which handle
+BOA's requests to your scripts for you when the ``script_workers`` script option is set.
+
+Python
+======
+
+Call :func:`serve_script_worker` with a function that takes the trial directory and the
+request and does what your script would do for that trial::
+
+    from boa.wrappers.clients import serve_script_worker
+
+    def run_model(trial_dir, request):
+        ...  # run the model for the trial in trial_dir and write its output.json
+
+    if __name__ == "__main__":
+        serve_script_worker(run_model)
+
+R
+=
+
+``boa_worker.R``, installed with BOA (at :data:`R_CLIENT`), defines ``serve_boa_requests``,
+which takes the same kind of function. ``python -m boa.wrappers.clients`` prints where it is,
+so your script can source it from the python environment BOA is installed in::
+
+    source(system2("python", c("-m", "boa.wrappers.clients"), stdout=TRUE))
+
+    run_model <- function(trial_dir, request) {
+        # run the model for the trial in trial_dir and write its output.json
+    }
+
+    serve_boa_requests(run_model)
+
+It needs the ``jsonlite`` R package.
+"""
+import pathlib
+
+from boa.wrappers.clients.boa_worker import serve_script_worker
+
+__all__ = ["serve_script_worker", "R_CLIENT"]
+
+#: Path to the reference R client, ``boa_worker.R``
+R_CLIENT = pathlib.Path(__file__).parent / "boa_worker.R"
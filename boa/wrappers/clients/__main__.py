@@ -0,0 +1,5 @@
+"""Print the path to the reference R client, to ``source`` it from R scripts"""
+from boa.wrappers.clients import R_CLIENT
+
+if __name__ == "__main__":
+    print(R_CLIENT)
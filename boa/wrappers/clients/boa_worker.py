@@ -0,0 +1,62 @@
+"""Reference python client of the script worker protocol (see :mod:`.script_worker`),
+for the ``script_workers`` script option."""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import sys
+import threading
+import traceback
+from typing import Callable, Optional, TextIO
+
+
+def serve_script_worker(
+    handler: Callable[[str, dict], Optional[dict]],
+    stdin: TextIO = None,
+    stdout: TextIO = None,
+    max_workers: int = 1,
+) -> None:
+    """Serve BOA's requests to a script started as a script worker, see :mod:`.script_worker`.
+
+    Calls ``handler(trial_dir, request)`` for each request BOA sends, until BOA is done.
+    If the handler raises, BOA is told the request failed. If it returns a dictionary,
+    it is added to the response.
+
+    Requests are handled one at a time unless ``max_workers`` is greater than 1, so
+    the ``run_model`` requests of trials running at the same time wait on each other.
+    With ``max_workers`` greater than 1, up to that many requests are handled at once
+    on separate threads, so ``handler`` must be safe to call concurrently.
+
+    Examples
+    --------
+    >>> def run_model(trial_dir, request):
+    ...     ...  # run the model for the trial in trial_dir and write its output.json
+
+    >>> from boa.wrappers.clients import serve_script_worker
+    >>> if __name__ == "__main__":
+    ...     serve_script_worker(run_model, max_workers=4)  # doctest: +SKIP
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+
+    def answer(request: dict) -> None:
+        try:
+            response = dict(handler(request["trial_dir"], request) or {}, ok=True)
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            response = dict(ok=False, error=repr(e))
+        response["id"] = request["id"]
+        with write_lock:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+    requests = (json.loads(line) for line in stdin if line.strip())
+    if max_workers <= 1:
+        for request in requests:
+            answer(request)
+        return
+    # leaving the pool waits on the requests still being handled
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for request in requests:
+            pool.submit(answer, request)
@@ -0,0 +1,269 @@
+"""
+########################
+Metric Cache
+########################
+
+The caches BOA keeps of each trial's metric data, so it isn't fetched or computed more
+than once. What is cached, and how, can be changed by overriding your wrapper's
+:meth:`~.BaseWrapper.make_metric_cache` and :meth:`~.BaseWrapper.make_result_cache`,
+which can return any :class:`~collections.abc.MutableMapping`.
+
+* :class:`PayloadCache`: the data your wrapper's ``fetch_trial_data`` returns for each
+  trial, which can be large (such as the ``y_true`` and ``y_pred`` arrays of
+  :class:`.RMSE`). The least recently used trials are dropped beyond the
+  ``payload_cache_max_trials`` and ``payload_cache_max_mb`` script options.
+* :class:`ResultCache`: the values each metric computes from that data (the mean and sem
+  of each arm), which are small, so they are all kept. With the ``persist_metric_results``
+  script option they are also appended to ``metric_results.jsonl`` in the experiment
+  directory, so a resumed optimization doesn't fetch them again.
+* :class:`TrialResultStore`: the metric values of each evaluated parameterization, by
+  :func:`parameterization_key`, shared by the experiments of an output directory.
+  With the ``memoize_trials`` script option, trials whose parameterization is in it
+  are completed with those values instead of running the model again (see
+  :meth:`~.BaseWrapper.make_trial_store`).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator, MutableMapping
+from typing import Any, Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+from ax import Trial
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+
+logger = get_logger()
+
+RESULTS_FILE_NAME = "metric_results.jsonl"
+TRIAL_STORE_DIR_NAME = "trial_results"
+
+# appends to the results file from metrics sharing it
+_results_file_lock = threading.Lock()
+
+
+def payload_nbytes(payload: Any) -> int:
+    """Approximate memory used by ``payload``, the data fetched for a trial.
+    Memory-mapped arrays count as nothing, they are backed by their file."""
+    if isinstance(payload, np.memmap):
+        return 0
+    if isinstance(payload, np.ndarray):
+        return payload.nbytes
+    if isinstance(payload, (pd.DataFrame, pd.Series)):
+        return int(np.sum(payload.memory_usage(deep=True)))
+    if isinstance(payload, dict):
+        return sys.getsizeof(payload) + sum(payload_nbytes(k) + payload_nbytes(v) for k, v in payload.items())
+    if isinstance(payload, (list, tuple, set)):
+        return sys.getsizeof(payload) + sum(payload_nbytes(v) for v in payload)
+    return sys.getsizeof(payload)
+
+
+def trial_key(trial: Trial) -> tuple[int, str]:
+    """Key of a trial's metric results: its index, and a digest of its arms' parameters, so
+    results persisted by another experiment in the same directory aren't taken for its own."""
+    arms = sorted(
+        (name, {k: v for k, v in arm.parameters.items() if k != "kwargs"}) for name, arm in trial.arms_by_name.items()
+    )
+    digest = hashlib.sha1(json.dumps(arms, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return trial.index, digest
+
+
+class PayloadCache(MutableMapping):
+    """
+    The data fetched for each trial, by trial index, dropping the least recently used
+    trials beyond ``max_trials`` trials or ``max_bytes`` bytes (as estimated by
+    :func:`payload_nbytes`). The most recently added trial is always kept.
+
+    Parameters
+    ----------
+    max_trials
+        Maximum number of trials to keep, no limit if None
+    max_bytes
+        Maximum size of the trials' data to keep, no limit if None
+    """
+
+    def __init__(self, max_trials: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_trials = max_trials
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+
+    def __getitem__(self, key: Hashable):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value):
+        if key in self._data:
+            del self[key]
+        self._data[key] = value
+        if self.max_bytes is not None:
+            self._sizes[key] = payload_nbytes(value)
+            self.nbytes += self._sizes[key]
+        self._evict()
+
+    def __delitem__(self, key: Hashable):
+        del self._data[key]
+        self.nbytes -= self._sizes.pop(key, 0)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _is_full(self) -> bool:
+        return (self.max_trials is not None and len(self._data) > self.max_trials) or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        )
+
+    def _evict(self):
+        while len(self._data) > 1 and self._is_full():
+            key = next(iter(self._data))
+            logger.debug(f"Dropping the cached fetched data of trial {key}")
+            del self[key]
+
+
+def _to_json(obj):
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ResultCache(MutableMapping):
+    """
+    The results of one metric, the data frame columns Ax makes its data from, by :func:`trial_key`.
+    Given a ``path``, results are also appended to that JSON lines file (shared by all the metrics
+    of an experiment), and the metric's results already in it are loaded.
+
+    Parameters
+    ----------
+    metric_name
+        Name of the metric whose results are cached
+    path
+        JSON lines file to persist the results to, only kept in memory if None
+    """
+
+    def __init__(self, metric_name: str, path: Optional[PathLike] = None):
+        self.metric_name = metric_name
+        self.path = pathlib.Path(path) if path else None
+        self._data = {}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # cut off by a crash while writing
+                    continue
+                if record.get("metric_name") != self.metric_name:
+                    continue
+                key = (record["trial_index"], record["arms"])
+                if record.get("deleted"):
+                    self._data.pop(key, None)
+                else:
+                    self._data[key] = record["columns"]
+
+    def _append(self, key: tuple[int, str], **record):
+        record = {"metric_name": self.metric_name, "trial_index": key[0], "arms": key[1], **record}
+        try:
+            line = json.dumps(record, default=_to_json)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not saving the results of trial {key[0]} for metric {self.metric_name}: {e!r}")
+            return
+        with _results_file_lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def __getitem__(self, key: tuple[int, str]) -> dict[str, list]:
+        return self._data[key]
+
+    def __setitem__(self, key: tuple[int, str], columns: dict[str, list]):
+        self._data[key] = columns
+        if self.path is not None:
+            self._append(key, columns=columns)
+
+    def __delitem__(self, key: tuple[int, str]):
+        del self._data[key]
+        if self.path is not None:
+            self._append(key, deleted=True)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _canonical(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value) + 0.0  # the same for 1, 1.0 and -0.0, 0.0
+    return value
+
+
+def parameterization_key(parameters: dict, model_settings: Any = None, evaluator: Any = None) -> str:
+    """Key of a parameterization in a :class:`TrialResultStore`, a hash of the parameters
+    (numbers compared by value, so ``1`` and ``1.0`` are the same), the model settings and
+    whatever evaluates them (such as the wrapper and objective, see :meth:`.BaseWrapper.memoization_key`)."""
+    canonical = {
+        "parameters": {name: _canonical(value) for name, value in parameters.items() if name != "kwargs"},
+        "model_settings": model_settings,
+        "evaluator": evaluator,
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class TrialResultStore:
+    """
+    The metric values of each evaluated parameterization, in a directory with a directory per
+    :func:`parameterization_key` and a JSON file per metric in it, so it can be shared by several
+    experiments (and processes), each metric writing its own file.
+
+    Parameters
+    ----------
+    directory
+        Directory of the store, made when the first results are added
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = pathlib.Path(directory)
+
+    def _path(self, key: str, metric_name: str) -> pathlib.Path:
+        return self.directory / key / f"{quote(metric_name, safe='')}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """The entry of a parameterization, ``{"parameters": ..., "metrics": {name: {"mean": ..., "sem": ...}}}``,
+        or None if it wasn't evaluated yet"""
+        entry = None
+        for path in sorted((self.directory / key).glob("*.json")):
+            try:
+                with open(path) as f:
+                    result = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            entry = entry or {"parameters": result["parameters"], "metrics": {}}
+            entry["metrics"][result["metric_name"]] = {"mean": result["mean"], "sem": result["sem"]}
+        return entry
+
+    def add(self, key: str, parameters: dict, metric_name: str, mean: float, sem: Optional[float]) -> None:
+        """Add the value of one metric for a parameterization"""
+        from boa.storage.atomic import atomic_write
+
+        result = {"parameters": parameters, "metric_name": metric_name, "mean": mean, "sem": sem}
+        path = self._path(key, metric_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(result, default=_to_json))
@@ -0,0 +1,150 @@
+"""
+########################
+Script Processes
+########################
+
+The processes :class:`.ScriptWrapper` runs your script commands in
+(unless the ``script_workers`` script option is set, see :mod:`.script_worker`).
+
+Each script's stdout and stderr are read as they are written, each on its own thread,
+and logged (to info and warning), so a script writing a lot to one can't fill that pipe
+and hang while BOA waits on the other. With the ``script_log_files`` script option,
+they are also written to ``<script option>.log`` in the trial directory.
+
+Each script is started in its own process group (its own session on POSIX), so when a
+trial needs to be stopped, the script and anything it started can be killed together.
+"""
+from __future__ import annotations
+
+import collections
+import os
+import signal
+import subprocess
+import sys
+import threading
+from typing import IO, Optional
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+
+logger = get_logger()
+
+# longest piece of a line read from a script at once, so a script that never
+# writes a newline can't make us hold all its output in memory
+MAX_LINE_LENGTH = 64 * 1024
+# number of the script's last stderr lines kept, to log if it fails
+STDERR_TAIL_LINES = 20
+# number of the script's last output lines (stdout and stderr) kept, see ScriptWrapper.subprocess_output
+OUTPUT_TAIL_LINES = 20
+# seconds to wait for the rest of a script's output to be logged after it exits
+OUTPUT_DRAIN_TIMEOUT = 1
+
+
+class ScriptProcess:
+    """A script command running in its own process group, with its output logged as it comes.
+
+    Parameters
+    ----------
+    args
+        Command line arguments to start the script with
+    cwd
+        Working directory to start the script in
+    name
+        Name to log the script's output under, such as the script option and trial it is for
+    log_file
+        File to also write the script's stdout and stderr to
+    """
+
+    def __init__(self, args: list[str], cwd: Optional[PathLike] = None, name: str = "", log_file: PathLike = None):
+        self.args = args
+        self.name = name or " ".join(args)
+        self.stderr_tail: collections.deque[str] = collections.deque(maxlen=STDERR_TAIL_LINES)
+        self.output_tail: collections.deque[str] = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+        if sys.platform == "win32":
+            group_kwargs = dict(creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            group_kwargs = dict(start_new_session=True)
+        self.process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            universal_newlines=True,
+            errors="replace",
+            cwd=cwd,
+            **group_kwargs,
+        )
+        self._log_file = open(log_file, "a") if log_file else None
+        self._log_lock = threading.Lock()
+        self._open_streams = 2
+        self._readers = [
+            threading.Thread(target=self._drain, args=(self.process.stdout, False), daemon=True),
+            threading.Thread(target=self._drain, args=(self.process.stderr, True), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.poll()
+
+    def _drain(self, stream: IO[str], is_stderr: bool) -> None:
+        log = logger.warning if is_stderr else logger.info
+        with stream:
+            for line in iter(lambda: stream.readline(MAX_LINE_LENGTH), ""):
+                if self._log_file is not None:
+                    with self._log_lock:
+                        self._log_file.write(line)
+                line = line.rstrip()
+                self.output_tail.append(line)
+                if is_stderr:
+                    self.stderr_tail.append(line)
+                log(line)
+        with self._log_lock:
+            self._open_streams -= 1
+            if self._log_file is not None and not self._open_streams:
+                self._log_file.close()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for the script to exit and its output to be logged, returning its exit code.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If it doesn't exit within ``timeout`` seconds
+        """
+        exit_code = self.process.wait(timeout=timeout)
+        # anything the script started in the background can keep its pipes open after it exits,
+        # so we don't wait for that, its output is still logged as it comes
+        for reader in self._readers:
+            reader.join(timeout=OUTPUT_DRAIN_TIMEOUT)
+        return exit_code
+
+    def kill(self, grace_period: float = 5) -> None:
+        """Stop the script and everything in its process group: ask them to exit, and kill them
+        if the script hasn't after ``grace_period`` seconds."""
+        if sys.platform == "win32":
+            if self.returncode is None:
+                self.process.send_signal(signal.CTRL_BREAK_EVENT)
+            try:
+                self.process.wait(timeout=grace_period)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            return
+        self._signal_group(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=grace_period)
+        except subprocess.TimeoutExpired:
+            pass
+        # also anything it started that ignored SIGTERM
+        self._signal_group(signal.SIGKILL)
+
+    def _signal_group(self, sig: int) -> None:
+        try:
+            os.killpg(self.process.pid, sig)
+        except (ProcessLookupError, PermissionError):  # they all exited already
+            pass
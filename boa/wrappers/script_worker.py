@@ -0,0 +1,176 @@
+"""
+########################
+Script Workers
+########################
+
+Long-lived script processes for :class:`.ScriptWrapper`.
+
+Normally :class:`.ScriptWrapper` launches your script command again for every trial and every
+call (and ``set_trial_status`` is called on every poll of every trial). For scripts whose
+interpreter takes longer to start than the work itself takes (such as ``Rscript``), set the
+``script_workers`` script option to True. BOA then starts each script command once, and sends it
+one request per call over stdin, as a line of JSON::
+
+    {"id": 3, "func_name": "set_trial_status", "trial_index": 1, "trial_dir": "/path/to/trial_dir"}
+
+The script does what it would have done when launched with ``trial_dir`` as its last command line
+argument (reading ``parameters.json`` and writing ``output.json`` etc. in ``trial_dir``), and then
+answers on stdout with a line of JSON with the same id::
+
+    {"id": 3, "ok": true}
+
+or, if it failed (the equivalent of a non-zero exit code, the trial is marked failed)::
+
+    {"id": 3, "ok": false, "error": "what went wrong"}
+
+Anything else the script prints to stdout, and everything it prints to stderr, is logged.
+When BOA is done, it closes the script's stdin, and the script should exit.
+
+Requests can be answered in any order. A script that answers them one at a time (like both
+reference clients by default) runs the ``run_model`` of trials running at the same time one
+after the other, so answer them concurrently (``max_workers`` of :func:`.serve_script_worker`)
+to keep the trials running in parallel.
+
+Reference clients that handle the protocol for you, for python and R, are in :mod:`.clients`.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import json
+import os
+import subprocess
+import threading
+from typing import Optional
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+from boa.wrappers.clients.boa_worker import serve_script_worker  # noqa: F401
+from boa.wrappers.wrapper_utils import split_shell_command
+
+logger = get_logger()
+
+WORKER_ENV_VAR = "BOA_SCRIPT_WORKER"
+
+
+class ScriptWorkerError(RuntimeError):
+    """A script worker answered a request with an error, or exited before answering"""
+
+
+class ScriptWorker:
+    """A script command started once, that BOA sends requests to over stdin.
+
+    Parameters
+    ----------
+    cmd
+        Shell command to start the script
+    cwd
+        Working directory to start the script in
+    name
+        Name to log the script's output under, such as the script option it is for
+    """
+
+    def __init__(self, cmd: str, cwd: Optional[PathLike] = None, name: str = ""):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.name = name or cmd
+        self._process: Optional[subprocess.Popen] = None
+        self._pending: dict[int, concurrent.futures.Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self) -> None:
+        logger.info(f"Starting script worker for {self.name}: {self.cmd}")
+        self._process = subprocess.Popen(
+            split_shell_command(self.cmd),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,  # line buffered, so each request is sent as soon as it is written
+            cwd=self.cwd,
+            env={**os.environ, WORKER_ENV_VAR: "1"},
+        )
+        # requests to an earlier process that exited are failed by that process's reader
+        self._pending = {}
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process, self._pending),
+            daemon=True,
+            name=f"boa-worker-{self.name}",
+        ).start()
+        threading.Thread(
+            target=self._log_stderr, args=(self._process,), daemon=True, name=f"boa-worker-{self.name}-err"
+        ).start()
+
+    def submit(self, func_name: str, trial_index: int, trial_dir: PathLike, **kwargs) -> concurrent.futures.Future:
+        """Send a request to the script, starting it if it isn't running.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to the script's response, or raises a :class:`ScriptWorkerError`
+            if the script answers with an error or exits first.
+        """
+        future = concurrent.futures.Future()
+        with self._lock:
+            if not self.running:
+                self._start()
+            request_id = next(self._ids)
+            request = dict(id=request_id, func_name=func_name, trial_index=trial_index, trial_dir=str(trial_dir))
+            self._pending[request_id] = future
+            try:
+                self._process.stdin.write(json.dumps({**kwargs, **request}) + "\n")
+                self._process.stdin.flush()
+            except OSError as e:  # the script exited
+                del self._pending[request_id]
+                future.set_exception(ScriptWorkerError(f"Script worker for {self.name} exited: {e!r}"))
+        return future
+
+    def request(self, func_name: str, trial_index: int, trial_dir: PathLike, timeout: float = None, **kwargs) -> dict:
+        """Send a request to the script and wait for its response."""
+        return self.submit(func_name, trial_index, trial_dir, **kwargs).result(timeout=timeout)
+
+    def _read_responses(self, process: subprocess.Popen, pending: dict[int, concurrent.futures.Future]) -> None:
+        for line in process.stdout:
+            line = line.strip()
+            try:
+                response = json.loads(line)
+                future = pending.pop(response["id"])
+            except (ValueError, TypeError, KeyError):
+                # not a response, something the script printed
+                if line:
+                    logger.info(f"{self.name}: {line}")
+                continue
+            if response.get("ok", True):
+                future.set_result(response)
+            else:
+                future.set_exception(ScriptWorkerError(response.get("error") or f"{self.name} failed"))
+        exit_code = process.wait()
+        with self._lock:
+            unanswered = list(pending.values())
+            pending.clear()
+        for future in unanswered:
+            future.set_exception(
+                ScriptWorkerError(f"Script worker for {self.name} exited with code {exit_code} before answering")
+            )
+
+    def _log_stderr(self, process: subprocess.Popen) -> None:
+        for line in process.stderr:
+            logger.warning(f"{self.name}: {line.strip()}")
+
+    def close(self, timeout: float = 5) -> None:
+        """Close the script's stdin, so it exits, killing it if it doesn't within ``timeout`` seconds."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
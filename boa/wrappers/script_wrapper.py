@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import pathlib
 import subprocess
 import threading
 import time
@@ -12,18 +14,34 @@ from ax.storage.json_store.encoder import object_to_json
 
 from boa.logger import get_logger
 from boa.template import JinjaTemplateVars, render_template
+from boa.utils import deprecation
+from boa.wrappers.array_outputs import (
+    ARRAY_SUFFIXES,
+    load_array_output,
+    resolve_array_references,
+)
 from boa.wrappers.base_wrapper import BaseWrapper
+from boa.wrappers.script_process import ScriptProcess
+from boa.wrappers.script_worker import ScriptWorker, ScriptWorkerError
+from boa.wrappers.trial_watcher import TrialFileWatcher
 from boa.wrappers.wrapper_utils import (
+    current_working_dir,
     get_trial_dir,
     load_jsonlike,
     save_trial_data,
     split_shell_command,
+    zfilled_trial_index,
 )
 
 logger = get_logger()
 
 
 OUTPUT_FILES = ("output", "outputs", "result", "results", "metric", "metrics")
+JSONLIKE_SUFFIXES = (".json", ".yml", ".yaml")
+STATUS_FILES = ("trial_status", "TrialStatus")
+# how long fetch_trial_data waits for output files with `watch_trial_files`,
+# about as long as it sleeps in total without it
+OUTPUT_WAIT_TIMEOUT = 20
 
 
 class ScriptWrapper(BaseWrapper):
@@ -37,13 +55,101 @@ class ScriptWrapper(BaseWrapper):
     need to run your scripts. ``parameters.json`` includes all of the parameters for that trial.
     ``trial.json`` includes the complete json serialization of the current trial (including the
     parameters, this is usually more than you need, but has lots of information, such as the trial index
-    (You also know that by the trial dir path you are passed), ``data.json`` which includes
+    (You also know that by the trial dir path you are passed, and it isn't written with the
+    ``write_trial_json`` script option set to False), ``data.json`` which includes
     which is a comprehensive json file of everything above, as well as the param_names from your
     config file for each metric, and the metric_properties you custom configure for any individual
     metric (though metric_properties is only available in the final stages when fetch_trial_status
     is being called).
+
+    With the ``script_workers`` script option, each script command is instead started once and
+    sent a request for each trial, see :mod:`.script_worker`.
+    With the ``watch_trial_files`` script option, the trial directories are watched for the
+    status and output files, see :mod:`.trial_watcher`.
     """
 
+    def __init__(self, *args, **kwargs):
+        # creating the script workers and trial watcher (made lazily by whichever thread needs them first)
+        # and tracking the running script processes, of this wrapper only
+        self._lazy_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def __getstate__(self):
+        # running scripts can't be pickled (or deep copied), a copy starts its own when needed
+        state = self.__dict__.copy()
+        state.pop("_script_workers", None)
+        state.pop("_trial_watcher", None)
+        state.pop("_script_processes", None)
+        state.pop("_trial_file_hashes", None)
+        state.pop("_lazy_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lazy_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the script workers if ``script_workers`` is set, which lets the scripts exit,
+        and stop watching the trial directories if ``watch_trial_files`` is set."""
+        for worker in getattr(self, "_script_workers", {}).values():
+            worker.close()
+        watcher = self.__dict__.pop("_trial_watcher", None)
+        if watcher is not None:
+            watcher.close()
+
+    @property
+    def trial_watcher(self) -> TrialFileWatcher | None:
+        """Watcher of the trial directories if the ``watch_trial_files`` script option is set."""
+        if not (self.config and self.config.script_options.watch_trial_files):
+            return None
+        with self._lazy_lock:
+            if "_trial_watcher" not in self.__dict__:
+                self._trial_watcher = TrialFileWatcher(
+                    file_names=(*STATUS_FILES, *OUTPUT_FILES), suffixes=(*JSONLIKE_SUFFIXES, *ARRAY_SUFFIXES)
+                )
+            return self._trial_watcher
+
+    @property
+    def subprocess_output(self) -> str | None:
+        """The last lines of output (stdout and stderr) of the last script command to exit.
+
+        .. deprecated::
+            Script output is logged as it is written, and with the ``script_log_files`` script option,
+            written to ``<script option>.log`` in the trial directory. Will be removed in the next release.
+        """
+        deprecation(
+            "ScriptWrapper.subprocess_output is deprecated and will be removed in the next release, "
+            "use the script_log_files script option to keep each script's output instead."
+        )
+        return self.__dict__.get("_last_script_output")
+
+    def _memoization_evaluator(self) -> dict:
+        """Also the script commands, which run the model and compute its results."""
+        script_options = self.config.script_options if self.config else None
+        return {
+            **super()._memoization_evaluator(),
+            "script_commands": {
+                func_name: getattr(script_options, func_name, None)
+                for func_name in ("write_configs", "run_model", "set_trial_status", "fetch_trial_data")
+            },
+        }
+
+    def wait_for_trial_updates(self, timeout: float) -> None:
+        """With ``watch_trial_files``, stops waiting as soon as a trial writes its status or output file."""
+        watcher = self.trial_watcher
+        if watcher is None:
+            return super().wait_for_trial_updates(timeout)
+        watcher.wait(timeout)
+
+    def _get_script_worker(self, run_cmd: str, func_name: str) -> ScriptWorker:
+        """Get the script worker for ``run_cmd``, starting it if needed.
+        Script options with the same command share a script worker."""
+        with self._lazy_lock:
+            workers = self.__dict__.setdefault("_script_workers", {})
+            if run_cmd not in workers:
+                workers[run_cmd] = ScriptWorker(run_cmd, cwd=current_working_dir(), name=func_name)
+            return workers[run_cmd]
+
     def write_configs(self, trial: Trial) -> None:
         """
         It can be convenient to separate our your writing out model configuration files
@@ -182,7 +288,19 @@ class ScriptWrapper(BaseWrapper):
         param_names = {metric.name: metric.param_names for metric in self.config.objective.metrics}
         kw = {"param_names": param_names} if param_names else {}
         self._run_subprocess_script_cmd_if_exists(trial, "set_trial_status", **kw)
-        data = self._read_subprocess_script_output(trial, file_names=["trial_status", "TrialStatus", *OUTPUT_FILES])
+        self._set_trial_status_from_files(trial)
+
+    def _set_trial_status_from_files(self, trial: Trial) -> None:
+        """Mark the trial with the status in its status or output files, if it wrote any."""
+        watcher = self.trial_watcher
+        if watcher is not None:
+            # its files are already there if we start watching late, such as after reloading
+            watcher.watch(trial.index, get_trial_dir(self.experiment_dir, trial.index))
+            if not watcher.pop_changed(trial.index):
+                return  # nothing new written since we last checked
+        data = self._read_subprocess_script_output(trial, file_names=[*STATUS_FILES, *OUTPUT_FILES])
+        if data is None and self._has_array_output(get_trial_dir(self.experiment_dir, trial.index)):
+            data = {}  # the trial is completed, its arrays are only loaded once its data is fetched
         if data is not None:
             trial_status_keys = [k for k in data.keys() if k.lower() == "trialstatus" or k.lower() == "trial_status"]
             if not trial_status_keys:
@@ -204,9 +322,68 @@ class ScriptWrapper(BaseWrapper):
                     # you can't set a running trial to running, so we leave, which is equivalent
                     if trial_status != TrialStatus.RUNNING:
                         trial.mark_as(trial_status)
+                        # completed trials are still watched until their data is fetched
+                        if watcher is not None and trial_status != TrialStatus.COMPLETED:
+                            watcher.unwatch(trial.index)
                 except ValueError as e:
                     raise ValueError(f"Invalid trial status - {trial_status} - passed to `set_trial_status`") from e
 
+    def run_model_batch(self, trials: list[Trial]) -> None:
+        """
+        With the ``batch_trials`` script option, the ``write_configs`` and ``run_model`` script
+        commands are each run once for all the trials being deployed, instead of once per trial.
+        Instead of a trial directory, they are passed the path to a ``manifest.json`` file listing
+        the trials, such as::
+
+            {
+                "func_name": "run_model",
+                "batch_dir": "/path/to/experiment_dir/batches/run_model_000000-000049",
+                "trials": [{"trial_index": 0, "trial_dir": "/path/to/trial_dir"}, ...]
+            }
+
+        The trial directories have the same files as without ``batch_trials``, and your scripts can
+        write the status and output files of each trial to them the same way. Or they can write one
+        output file to the ``batch_dir``, keyed by trial index, which BOA splits into the trial
+        directories, such as::
+
+            {"0": {"metric": 1.2}, "1": {"trial_status": "FAILED"}, "2": {"trial_status": "RUNNING"}}
+
+        If the script exits with a non-zero exit code, all of the trials are marked failed.
+
+        Parameters
+        ----------
+        trials
+            The trials to deploy
+        """
+        if self.config.script_options.script_workers:
+            return super().run_model_batch(trials)
+        param_names = {metric.name: metric.param_names for metric in self.config.objective.metrics}
+        kw = {"param_names": param_names} if param_names else {}
+        self._run_batch_script_cmd_if_exists(trials, "write_configs", block=True, **kw)
+        self._run_batch_script_cmd_if_exists(trials, "run_model", **kw)
+
+    def set_trial_status_batch(self, trials: list[Trial]) -> None:
+        """
+        With the ``batch_trials`` script option, the ``set_trial_status`` script command is run once
+        for all the running trials, and after it (and each trial's status is set as in
+        :meth:`set_trial_status`), the ``fetch_trial_data`` script command is run once for the trials
+        that completed. They are passed a manifest of the trials, see :meth:`run_model_batch`.
+
+        Parameters
+        ----------
+        trials
+            The trials to set the status of
+        """
+        if self.config.script_options.script_workers:
+            return super().set_trial_status_batch(trials)
+        param_names = {metric.name: metric.param_names for metric in self.config.objective.metrics}
+        kw = {"param_names": param_names} if param_names else {}
+        self._run_batch_script_cmd_if_exists(trials, "set_trial_status", block=True, **kw)
+        for trial in trials:
+            self._set_trial_status_from_files(trial)
+        completed = [trial for trial in trials if trial.status.is_completed]
+        self._run_batch_script_cmd_if_exists(completed, "fetch_trial_data", block=True, **kw)
+
     def fetch_trial_data(self, trial: Trial, metric_properties: dict, *args, **kwargs) -> dict | None:
         """
         Retrieves the trial data and prepares it for the metric(s) used in the objective
@@ -246,6 +423,12 @@ class ScriptWrapper(BaseWrapper):
                 }
             }
 
+        For large arrays, your script can write them to ``.npy``, ``.npz``, ``.parquet`` or
+        ``.arrow`` files instead, either as the output file itself or pointed to from the JSON output
+        file, such as ``{"MSE": {"y_true": "observed.npy", "y_pred": "simulated.npy"}}``.
+        They are memory-mapped where possible and passed to your metric as numpy arrays,
+        see :mod:`.array_outputs`.
+
         Parameters
         ----------
         trial : Trial
@@ -263,27 +446,32 @@ class ScriptWrapper(BaseWrapper):
         kw = {"param_names": param_names} if param_names else {}
         if metric_properties:
             kw["metric_properties"] = metric_properties
-        self._run_subprocess_script_cmd_if_exists(
-            trial,
-            func_names="fetch_trial_data",
-            **kw,
-        )
-        loops = 0
-        while not (data := self._read_subprocess_script_output(trial, file_names=OUTPUT_FILES)):
-            time.sleep(1.5**loops)
-            loops += 1
-            if loops > 5:
-                logger.warning(
-                    f"fetch_trial_data did not write out a file with one of the following names: {OUTPUT_FILES}"
-                )
-                self.fetch_none_ok = True
-                trial.mark_failed(unsafe=True)
-                return None
-        if data is not None:
-            trial_status_keys = [k for k in data.keys() if k.lower() == "trialstatus" or k.lower() == "trial_status"]
-            for key in trial_status_keys:
-                data.pop(key)
-            return data
+        # with `batch_trials`, the script was already run for the trials completed in the last poll
+        if not self.config.script_options.batch_trials or self.config.script_options.script_workers:
+            self._run_subprocess_script_cmd_if_exists(
+                trial,
+                func_names="fetch_trial_data",
+                **kw,
+            )
+        watcher = self.trial_watcher
+        if watcher is not None:
+            data = self._wait_for_output_files(trial, watcher)
+        else:
+            loops = 0
+            while not (data := self._read_subprocess_script_output(trial, file_names=OUTPUT_FILES, arrays=True)):
+                time.sleep(1.5**loops)
+                loops += 1
+                if loops > 5:
+                    break
+        if not data:
+            logger.warning(f"fetch_trial_data did not write out a file with one of the following names: {OUTPUT_FILES}")
+            self.fetch_none_ok = True
+            trial.mark_failed(unsafe=True)
+            return None
+        trial_status_keys = [k for k in data.keys() if k.lower() == "trialstatus" or k.lower() == "trial_status"]
+        for key in trial_status_keys:
+            data.pop(key)
+        return data
 
     def _run_subprocess_script_cmd_if_exists(self, trial: Trial, func_names: list[str] | str, block=False, **kwargs):
         """
@@ -315,43 +503,264 @@ class ScriptWrapper(BaseWrapper):
                 ran_cmds = True
                 # TODO BaseTrial doesn't have arm property, just arms.
                 # With issue #22, fix this to fully support Batched Trials
-                trial_dir = save_trial_data(trial, experiment_dir=self.experiment_dir, **kwargs)
+                trial_dir = self._save_trial_data(trial, **kwargs)
 
                 parameters = object_to_json(trial.arm.parameters)
                 parameters.pop("__type", None)
                 logger.info(run_cmd)
                 if self.config_path or self.config.config_path:
-                    kw = {**asdict(JinjaTemplateVars(self.config_path or self.config.config_path)), **parameters}
+                    kw = {**asdict(JinjaTemplateVars(self.config_path or self.config.config_path))}
                 else:
-                    kw = parameters
+                    kw = {}
+                if self.config.script_options.script_workers:
+                    # the script is started once for all trials, so it can't be templated per trial
+                    run_cmd = render_template(run_cmd, **kw)
+                    self._request_script_worker(trial, run_cmd, func_name, trial_dir, block=block)
+                    continue
+                kw.update(parameters)
                 kw["trial_dir"] = trial_dir
                 logger.info(kw)
                 run_cmd = render_template(run_cmd, **kw)
                 logger.info(run_cmd)
 
                 args = split_shell_command(f"{run_cmd} {trial_dir}")
-                p = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE, universal_newlines=True
-                )
-                if block:
-                    subprocess_output(p, trial)
-                t = threading.Thread(target=subprocess_output, args=(p, trial), daemon=True)
-                t.start()
+                log_file = trial_dir / f"{func_name}.log" if self.config.script_options.script_log_files else None
+                name = f"{func_name} for trial {trial.index}"
+                self._start_script([trial], args, func_name, block=block, log_file=log_file, name=name)
         return ran_cmds
 
-    def _read_subprocess_script_output(self, trial: Trial, file_names: Iterable[str] | str):
-        trial_dir = get_trial_dir(self.experiment_dir, trial.index)
+    def _save_trial_data(self, trial: Trial, **kwargs) -> pathlib.Path:
+        """Write the trial's data files for its script commands, only rewriting those that changed
+        since they were last written (such as trial.json when its status changes)."""
+        return save_trial_data(
+            trial,
+            experiment_dir=self.experiment_dir,
+            write_trial_json=self.config.script_options.write_trial_json,
+            file_hashes=self.__dict__.setdefault("_trial_file_hashes", {}),
+            **kwargs,
+        )
+
+    def _run_batch_script_cmd_if_exists(self, trials: list[Trial], func_name: str, block=False, **kwargs) -> bool:
+        """
+        Run a script command from their config file once for several trials, see :meth:`run_model_batch`.
+
+        Parameters
+        ----------
+        trials
+            Trials to dump to json and list in the manifest passed to the script
+        func_name
+            Name of function that is calling this func
+        block
+            Whether to block until subprocess completes (defaults to False)
+
+        Returns
+        -------
+        bool
+            True if a script was run, False otherwise
+        """
+        from boa.storage.atomic import atomic_write
+
+        run_cmd = getattr(self.config.script_options, func_name)
+        if not run_cmd or not trials:
+            return False
+        trial_dirs = {trial.index: self._save_trial_data(trial, **kwargs) for trial in trials}
+        indices = sorted(trial_dirs)
+        first, last = indices[0], indices[-1]
+        batch_name = f"{func_name}_{zfilled_trial_index(first)}-{zfilled_trial_index(last)}"
+        batch_dir = self.experiment_dir / "batches" / batch_name
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        # from an earlier call for the same trials, such as the last poll
+        for file in batch_dir.iterdir():
+            if file.stem in OUTPUT_FILES:
+                file.unlink()
+        manifest = dict(
+            func_name=func_name,
+            batch_dir=str(batch_dir),
+            trials=[dict(trial_index=index, trial_dir=str(trial_dirs[index])) for index in indices],
+        )
+        manifest_path = batch_dir / "manifest.json"
+        atomic_write(manifest_path, json.dumps(manifest, indent=4))
+
+        if self.config_path or self.config.config_path:
+            run_cmd = render_template(run_cmd, **asdict(JinjaTemplateVars(self.config_path or self.config.config_path)))
+        logger.info(run_cmd)
+        args = split_shell_command(f"{run_cmd} {manifest_path}")
+        log_file = batch_dir / f"{func_name}.log" if self.config.script_options.script_log_files else None
+        name = f"{func_name} for trials {first}-{last}" if len(indices) > 1 else f"{func_name} for trial {first}"
+        self._start_script(trials, args, func_name, block=block, log_file=log_file, name=name, batch_dir=batch_dir)
+        return True
+
+    def _start_script(
+        self, trials: list[Trial], args: list[str], func_name: str, block=False, log_file=None, name="", batch_dir=None
+    ) -> None:
+        """Start a script for ``trials`` and wait for it to exit, in the background unless ``block``."""
+        process = ScriptProcess(args, cwd=current_working_dir(), name=name, log_file=log_file)
+        with self._lazy_lock:
+            running = self.__dict__.setdefault("_script_processes", {})
+            for trial in trials:
+                running.setdefault(trial.index, set()).add(process)
+        timeout = (self.config.script_options.script_timeouts or {}).get(func_name)
+        if block:
+            self._wait_for_script(trials, process, timeout, batch_dir=batch_dir)
+        else:
+            threading.Thread(
+                target=self._wait_for_script,
+                args=(trials, process, timeout),
+                kwargs=dict(batch_dir=batch_dir),
+                daemon=True,
+                name=f"boa-{func_name}-{trials[0].index}",
+            ).start()
+
+    def _wait_for_script(
+        self, trials: list[Trial], process: ScriptProcess, timeout: float = None, batch_dir=None
+    ) -> None:
+        """Wait for a script to exit, killing it if it runs longer than ``timeout`` seconds,
+        and mark its trials failed if it exited with a non-zero exit code.
+        For a batch script, the batch output file is split into its trials' directories."""
+        try:
+            exit_code = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.error(f"{process.name} didn't finish within {timeout} seconds, killing it.")
+            process.kill()
+            exit_code = process.wait()
+        self._last_script_output = "\n".join(process.output_tail)
+        with self._lazy_lock:
+            running = self.__dict__.get("_script_processes", {})
+            for trial in trials:
+                trial_processes = running.get(trial.index)
+                if trial_processes is not None:
+                    trial_processes.discard(process)
+                    if not trial_processes:
+                        del running[trial.index]
+        if batch_dir is not None:
+            self._split_batch_output(trials, batch_dir)
+        if exit_code != 0:
+            message = f"{process.name} exited with code {exit_code}"
+            if process.stderr_tail:
+                message += ", its stderr ended with:\n" + "\n".join(process.stderr_tail)
+            logger.error(message)
+            for trial in trials:
+                if not trial.status.is_terminal:
+                    trial.mark_failed()
+
+    def _split_batch_output(self, trials: list[Trial], batch_dir) -> None:
+        """Write each trial's entry of a batch output file to its trial directory,
+        to its ``trial_status.json`` if all it has is its status, otherwise its ``output.json``."""
+        from boa.storage.atomic import atomic_write
+
+        data = self._read_output_files(batch_dir, OUTPUT_FILES)
+        if not data:
+            return
+        for trial in trials:
+            trial_data = data.get(str(trial.index), data.get(trial.index))
+            if trial_data is None:
+                continue
+            status_only = all(key.lower() in ("trial_status", "trialstatus") for key in trial_data)
+            file_name = "trial_status.json" if status_only else "output.json"
+            trial_dir = get_trial_dir(self.experiment_dir, trial.index)
+            atomic_write(trial_dir / file_name, json.dumps(trial_data, indent=4))
+
+    def stop_trial(self, trial: Trial, reason: str | None = None) -> None:
+        """Kill the trial's scripts that are still running, along with anything they started.
+        (With ``script_workers``, the scripts are shared by all trials, so they are left running.)"""
+        self.kill_trial_scripts(trial.index)
+
+    def kill_trial_scripts(self, trial_index: int, grace_period: float = 5) -> None:
+        """Kill the scripts still running for a trial, along with anything they started.
+
+        Parameters
+        ----------
+        trial_index
+            Index of the trial to kill the scripts of
+        grace_period
+            Seconds the scripts are given to exit after being asked to, before they are killed
+        """
+        with self._lazy_lock:
+            processes = self.__dict__.get("_script_processes", {}).pop(trial_index, set())
+        for process in processes:
+            logger.info(f"Killing {process.name}")
+            process.kill(grace_period=grace_period)
+
+    def _request_script_worker(self, trial: Trial, run_cmd: str, func_name: str, trial_dir, block=False):
+        """Send the request for ``func_name`` to the script worker for ``run_cmd``.
+
+        ``run_model`` requests are answered when the model run is done, so unless ``block``,
+        they aren't waited on, like a ``run_model`` script isn't. The other requests are
+        waited on, so their output files are there to be read after.
+        If the script answers with an error, the trial is marked failed
+        (or if the trial isn't running yet, the error is raised to fail its deployment).
+        """
+        future = self._get_script_worker(run_cmd, func_name).submit(func_name, trial.index, trial_dir)
+
+        def mark_failed_on_error(future_):
+            try:
+                future_.result()
+            except ScriptWorkerError as e:
+                logger.error(f"{func_name} failed for trial {trial.index}: {e}")
+                if not trial.status.is_terminal:
+                    trial.mark_failed(unsafe=True)
+
+        if func_name == "run_model" and not block:
+            future.add_done_callback(mark_failed_on_error)
+            return
+        try:
+            future.result()
+        except ScriptWorkerError:
+            if trial.status != TrialStatus.RUNNING:
+                raise
+            mark_failed_on_error(future)
+
+    def _wait_for_output_files(self, trial: Trial, watcher: TrialFileWatcher) -> dict | None:
+        """Read the output files of ``trial``, waiting up to ``OUTPUT_WAIT_TIMEOUT`` seconds
+        for them to be written if they aren't yet, then stop watching the trial."""
+        watcher.watch(trial.index, get_trial_dir(self.experiment_dir, trial.index))
+        deadline = time.monotonic() + OUTPUT_WAIT_TIMEOUT
+        try:
+            while not (data := self._read_subprocess_script_output(trial, file_names=OUTPUT_FILES, arrays=True)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not watcher.wait_for_trial(trial.index, timeout=remaining):
+                    return None
+                watcher.pop_changed(trial.index)
+            return data
+        finally:
+            watcher.unwatch(trial.index)
+
+    def _read_subprocess_script_output(self, trial: Trial, file_names: Iterable[str] | str, arrays: bool = False):
+        return self._read_output_files(get_trial_dir(self.experiment_dir, trial.index), file_names, arrays=arrays)
+
+    @staticmethod
+    def _has_array_output(trial_dir: pathlib.Path) -> bool:
+        """Whether an array output file (see :mod:`.array_outputs`) was written to ``trial_dir``."""
+        return any(
+            file.suffix.lower() in ARRAY_SUFFIXES
+            for file_name in OUTPUT_FILES
+            for file in trial_dir.glob(f"{file_name}.*")
+        )
+
+    @staticmethod
+    def _read_output_files(trial_dir: pathlib.Path, file_names: Iterable[str] | str, arrays: bool = False):
+        """Read the first of ``file_names`` written to ``trial_dir`` as a json or yaml file,
+        or with ``arrays``, also as an array file, loading any array files the json or yaml file
+        points to (see :mod:`.array_outputs`)."""
         if isinstance(file_names, str):
             file_names = [file_names]
         for file_name in file_names:
-            output_files = trial_dir.glob(f"{file_name}.*")
-            json_output_files = [file for file in output_files if file.suffix.lower() in {".json", ".yml", ".yaml"}]
+            output_files = list(trial_dir.glob(f"{file_name}.*"))
+            json_output_files = [file for file in output_files if file.suffix.lower() in JSONLIKE_SUFFIXES]
             if len(json_output_files) > 1:
                 raise ValueError(f"{file_name} can only output one json or yaml output file")
             elif len(json_output_files) == 1:
                 output_file = json_output_files[0]
                 if output_file.exists():
-                    return load_jsonlike(output_file)
+                    data = load_jsonlike(output_file)
+                    return resolve_array_references(data, trial_dir) if arrays else data
+            if not arrays:
+                continue
+            array_output_files = [file for file in output_files if file.suffix.lower() in ARRAY_SUFFIXES]
+            if len(array_output_files) > 1:
+                raise ValueError(f"{file_name} can only output one array output file")
+            elif len(array_output_files) == 1:
+                return load_array_output(array_output_files[0])
         return None
 
 
@@ -359,7 +768,15 @@ def subprocess_output(p: subprocess.Popen, trial: Trial):
     """
     log the output of a subprocess `p` to the logger
     and mark the trial as failed if the subprocess exits with a non-zero exit code
+
+    .. deprecated::
+        Script commands run in a :class:`.ScriptProcess`, which logs their output as it is written.
+        Will be removed in the next release.
     """
+    deprecation(
+        "subprocess_output is deprecated and will be removed in the next release, "
+        "use boa.wrappers.script_process.ScriptProcess instead."
+    )
     while (exit_code := p.poll()) is None:
         for line in p.stdout:
             logger.info(line.strip())
@@ -0,0 +1,311 @@
+"""
+########################
+Trial File Watcher
+########################
+
+Watches trial directories for the status and output files your scripts write, so
+:class:`.ScriptWrapper` only reads a trial's files when they change, and can wake up
+as soon as they are written instead of sleeping until the next poll.
+See the ``watch_trial_files`` script option.
+
+On Linux, this uses inotify, and a file counts as written once it is closed
+(or moved into the trial directory). Elsewhere (or if inotify is unavailable),
+the trial directories are scanned every ``poll_interval`` seconds, and a file counts
+as written once its size and modification time are the same for two scans.
+
+Files written on another machine to a shared file system (such as NFS, by jobs on the
+compute nodes of a cluster) don't raise inotify events on this one, so with inotify the
+trial directories are still scanned every ``rescan_interval`` seconds, to catch those.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from boa.definitions import PathLike
+from boa.logger import get_logger
+
+logger = get_logger()
+
+# from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_IGNORED = 0x00008000
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch  # noqa: B018
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class TrialFileWatcher:
+    """Tracks which trials have written one of the watched files since they were last checked.
+
+    Parameters
+    ----------
+    file_names
+        File names (without suffix) to watch for, such as ``output`` or ``trial_status``
+    suffixes
+        File suffixes to watch for
+    poll_interval
+        Seconds between scans of the trial directories, when not using inotify
+    use_inotify
+        Whether to use inotify if it is available
+    rescan_interval
+        Seconds between scans of the trial directories when using inotify, for files written
+        without an inotify event (such as from another machine to a shared file system),
+        never if None
+    """
+
+    def __init__(
+        self,
+        file_names: Iterable[str],
+        suffixes: Iterable[str] = (".json", ".yml", ".yaml"),
+        poll_interval: float = 0.5,
+        use_inotify: bool = True,
+        rescan_interval: Optional[float] = 5.0,
+    ):
+        self.file_names = set(file_names)
+        self.suffixes = {suffix.lower() for suffix in suffixes}
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self._cond = threading.Condition()
+        self._changed: set[int] = set()
+        # number of changes seen, and seen when `wait` last returned
+        self._n_changes = 0
+        self._n_waited = 0
+        self._trial_dirs: dict[int, Path] = {}
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        # inotify watch descriptors by trial index and trial index by watch descriptor
+        self._wds: dict[int, int] = {}
+        self._wd_trials: dict[int, int] = {}
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd = -1
+        if self._libc is not None:
+            self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+            if self._fd < 0:
+                self._libc = None
+            else:
+                self._wake_r, self._wake_w = os.pipe()
+
+        # file signatures (size, mtime) of the trials, for scanning them:
+        # those last reported, and those seen on the last scan
+        self._reported: dict[int, dict[str, tuple]] = {}
+        self._scanned: dict[int, dict[str, tuple]] = {}
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._libc is not None else "polling"
+
+    def _is_watched_file(self, name: str) -> bool:
+        path = Path(name)
+        return path.stem in self.file_names and path.suffix.lower() in self.suffixes
+
+    def _signatures(self, trial_dir: Path) -> dict[str, tuple]:
+        signatures = {}
+        try:
+            with os.scandir(trial_dir) as entries:
+                for entry in entries:
+                    if self._is_watched_file(entry.name):
+                        stat = entry.stat()
+                        signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return signatures
+
+    def _mark_changed(self, trial_index: int) -> None:
+        with self._cond:
+            self._changed.add(trial_index)
+            self._n_changes += 1
+            self._cond.notify_all()
+
+    def watch(self, trial_index: int, trial_dir: PathLike) -> None:
+        """Start watching ``trial_dir`` for ``trial_index``. If it already has any of the
+        watched files, the trial counts as changed."""
+        trial_dir = Path(trial_dir)
+        with self._cond:
+            if trial_index in self._trial_dirs or self._closed:
+                return
+            self._trial_dirs[trial_index] = trial_dir
+            use_polling = self._libc is None
+            if not use_polling:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(trial_dir), IN_CLOSE_WRITE | IN_MOVED_TO)
+                if wd < 0:
+                    # such as running out of inotify watches, this trial is scanned instead
+                    logger.warning(
+                        f"Couldn't watch {trial_dir} with inotify ({os.strerror(ctypes.get_errno())}),"
+                        f" checking it every {self.poll_interval} seconds instead."
+                    )
+                    use_polling = True
+                else:
+                    self._wds[trial_index] = wd
+                    self._wd_trials[wd] = trial_index
+            # files written before we started watching
+            signatures = self._signatures(trial_dir)
+            self._reported[trial_index] = self._scanned[trial_index] = signatures
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._read_events if self._libc is not None else self._scan, daemon=True, name="boa-watcher"
+                )
+                self._thread.start()
+        if signatures:
+            self._mark_changed(trial_index)
+
+    def unwatch(self, trial_index: int) -> None:
+        """Stop watching the trial directory of ``trial_index``."""
+        with self._cond:
+            self._trial_dirs.pop(trial_index, None)
+            self._changed.discard(trial_index)
+            self._reported.pop(trial_index, None)
+            self._scanned.pop(trial_index, None)
+            wd = self._wds.pop(trial_index, None)
+            if wd is not None:
+                self._wd_trials.pop(wd, None)
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+    def is_watched(self, trial_index: int) -> bool:
+        return trial_index in self._trial_dirs
+
+    def pop_changed(self, trial_index: int) -> bool:
+        """Whether ``trial_index`` wrote any of the watched files since this was last called for it."""
+        with self._cond:
+            if trial_index in self._changed:
+                self._changed.remove(trial_index)
+                return True
+            return False
+
+    def wait_for_trial(self, trial_index: int, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` seconds for ``trial_index`` to write any of the watched files
+        (returning right away if it already has since :meth:`pop_changed`).
+
+        Returns
+        -------
+        bool
+            Whether it did
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: trial_index in self._changed or self._closed, timeout=timeout)
+            return trial_index in self._changed
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` seconds for any trial to write any of the watched files
+        (returning right away if one has since this last returned).
+
+        Returns
+        -------
+        bool
+            Whether one did
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._n_changes > self._n_waited or self._closed, timeout=timeout)
+            changed = self._n_changes > self._n_waited
+            self._n_waited = self._n_changes
+            return changed
+
+    def _read_events(self) -> None:
+        last_rescan = time.monotonic()
+        while True:
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [], self.poll_interval)
+            if self._closed:
+                return
+            if self._fd in readable:
+                try:
+                    buffer = os.read(self._fd, 64 * 1024)
+                except OSError:
+                    return
+                changed = set()
+                with self._cond:
+                    offset = 0
+                    while offset < len(buffer):
+                        wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                        offset += _EVENT_HEADER.size
+                        name = buffer[offset : offset + length].rstrip(b"\0").decode(errors="replace")
+                        offset += length
+                        trial_index = self._wd_trials.get(wd)
+                        if trial_index is None:
+                            continue
+                        if mask & IN_IGNORED:
+                            # the trial directory was removed, scan for it instead in case it comes back
+                            del self._wd_trials[wd]
+                            self._wds.pop(trial_index, None)
+                            self._reported[trial_index] = self._scanned[trial_index] = {}
+                        elif self._is_watched_file(name):
+                            changed.add(trial_index)
+                for trial_index in changed:
+                    self._mark_reported(trial_index)
+                    self._mark_changed(trial_index)
+            if self.rescan_interval is not None and time.monotonic() - last_rescan >= self.rescan_interval:
+                # all trials, for files written without an inotify event
+                self._scan_once(include_inotify=True)
+                last_rescan = time.monotonic()
+            # trials that couldn't be watched with inotify
+            elif any(trial_index not in self._wds for trial_index in self._trial_dirs):
+                self._scan_once()
+
+    def _mark_reported(self, trial_index: int) -> None:
+        # so the files an inotify event reported aren't reported again by the next rescan
+        with self._cond:
+            trial_dir = self._trial_dirs.get(trial_index)
+        if trial_dir is None:
+            return
+        signatures = self._signatures(trial_dir)
+        with self._cond:
+            if trial_index in self._trial_dirs:
+                self._reported[trial_index] = dict(signatures)
+                self._scanned[trial_index] = signatures
+
+    def _scan(self) -> None:
+        while not self._closed:
+            self._scan_once()
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed, timeout=self.poll_interval)
+
+    def _scan_once(self, include_inotify: bool = False) -> None:
+        with self._cond:
+            trial_dirs = {i: d for i, d in self._trial_dirs.items() if include_inotify or i not in self._wds}
+        for trial_index, trial_dir in trial_dirs.items():
+            signatures = self._signatures(trial_dir)
+            with self._cond:
+                if trial_index not in self._trial_dirs:
+                    continue
+                # only report files that stopped changing, so we don't read them while they're being written
+                stable = {name: sig for name, sig in signatures.items() if self._scanned[trial_index].get(name) == sig}
+                self._scanned[trial_index] = signatures
+                reported = self._reported[trial_index]
+                if any(reported.get(name) != sig for name, sig in stable.items()):
+                    reported.update(stable)
+                    self._changed.add(trial_index)
+                    self._n_changes += 1
+                    self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stop watching all trial directories and wake anything waiting."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._libc is not None:
+            os.write(self._wake_w, b"\0")
+            if self._thread is not None:
+                self._thread.join()
+            os.close(self._fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
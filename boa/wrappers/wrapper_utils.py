@@ -10,11 +10,13 @@ Utility tools for to ease model wrapping.
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
 import json
 import os
 import pathlib
 import shlex
 from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
 from typing import TYPE_CHECKING, Type
 
@@ -47,6 +49,10 @@ PARAM_CLASSES = {
     "fixed": FixedParameter,
 }
 
+# working directory of the wrapper call in progress when not changing the process's directory,
+# a context variable so concurrent calls on other threads each have their own
+_working_dir: ContextVar[pathlib.Path | None] = ContextVar("boa_working_dir", default=None)
+
 
 @contextmanager
 def cd_and_cd_back(path: PathLike = None):
@@ -133,6 +139,60 @@ def cd_and_cd_back_dec(path: PathLike = None):
     return _cd_and_cd_back_dec
 
 
+@contextmanager
+def working_dir_context(path: PathLike = None):
+    """Context manager that sets the working directory returned by :func:`current_working_dir`
+    for the code inside it, without changing the directory of the whole process
+    (unlike :func:`cd_and_cd_back`), so it is safe to use from multiple threads at once.
+
+    Parameters
+    ==========
+    path
+        The working directory inside the context manager
+
+    Examples
+    ========
+    >>> starting_dir = os.getcwd()
+    >>> with working_dir_context(".."):
+    ...     assert current_working_dir() == pathlib.Path("..").resolve()
+    >>> assert os.getcwd() == starting_dir
+    """
+    token = _working_dir.set(pathlib.Path(path).resolve() if path else None)
+    try:
+        yield
+    finally:
+        _working_dir.reset(token)
+
+
+def current_working_dir() -> pathlib.Path:
+    """The working directory set by :func:`working_dir_context` if inside one,
+    otherwise the current working directory of the process.
+
+    Use this instead of :func:`os.getcwd` (and as ``cwd=`` for subprocesses) in your wrapper
+    if you set the ``restore_cwd`` script option to False.
+    """
+    return _working_dir.get() or pathlib.Path.cwd()
+
+
+@contextmanager
+def wrapper_working_dir(wrapper: BaseWrapper):
+    """Context manager that every :class:`.BaseWrapper` function runs in.
+
+    By default this is :func:`cd_and_cd_back`, so directory changes in a wrapper function
+    don't leak out of it. That changes the directory of the whole process though, which
+    races when trials are deployed on multiple threads. With the ``restore_cwd`` script
+    option set to False, it is instead :func:`working_dir_context` of the wrapper's working
+    directory, and the directory of the process is never changed.
+    """
+    config = getattr(wrapper, "config", None)
+    if config is None or config.script_options.restore_cwd:
+        with cd_and_cd_back():
+            yield
+    else:
+        with working_dir_context(getattr(wrapper, "working_dir", None) or config.script_options.working_dir):
+            yield
+
+
 def initialize_wrapper(
     wrapper: Type[BaseWrapper] | PathLike,
     append_timestamp: bool = None,
@@ -407,15 +467,33 @@ def save_trial_data(
     trial_dir: pathlib.Path = None,
     experiment_dir: PathLike = None,
     param_names: dict[str, list] = None,
+    write_trial_json: bool = True,
+    file_hashes: dict[str, str] = None,
     **kwargs,
 ):
     """Save trial data (trial.json, parameters.json and data.json) to
     either: supplied trial_dir or supplied experiment_dir / trial.index
+
+    Without ``write_trial_json``, trial.json isn't written, and data.json doesn't include the trial.
+    If ``file_hashes`` is passed, nothing is serialized or written if the trial (by
+    :func:`~boa.storage.tracking.trial_fingerprint`) and the other arguments are the same as when
+    they were last written with the same ``file_hashes``, and otherwise only the files whose
+    content changed are written. ``file_hashes`` is updated with what was written.
     """
     param_names = param_names if param_names is not None else {}
     if not trial_dir:
         trial_dir = get_trial_dir(experiment_dir, trial.index)
         trial_dir.mkdir(parents=True, exist_ok=True)
+    if file_hashes is not None:
+        fingerprint = _trial_data_fingerprint(trial, param_names, write_trial_json, kwargs)
+        names = [
+            "parameters",
+            "data",
+            *(["trial"] if write_trial_json else []),
+            *(["filtered_parameters"] if param_names else []),
+        ]
+        if file_hashes.get(str(trial_dir)) == fingerprint and all((trial_dir / f"{n}.json").exists() for n in names):
+            return trial_dir
     kw = {}
     for key, value in kwargs.items():
         try:
@@ -435,10 +513,10 @@ def save_trial_data(
                     f"Parameter {metric} listed in `param_names` not found in trial parameters. "
                     f"Available parameters are {list(parameters_jsn.keys())}"
                 ) from e
-    trial_jsn = object_to_json(trial)
+    trial_jsn = object_to_json(trial) if write_trial_json else {}
     data = {
         "parameters": parameters_jsn,
-        "trial": trial_jsn,
+        **({"trial": trial_jsn} if write_trial_json else {}),
         "trial_index": trial.index,
         "trial_dir": str(trial_dir),
         "filtered_parameters": filtered_parameters_jsn,
@@ -451,6 +529,23 @@ def save_trial_data(
     ):
         if jsn:
             file_path = trial_dir / f"{name}.json"
+            text = json.dumps(jsn, indent=4)
+            if file_hashes is not None:
+                digest = hashlib.sha1(text.encode()).hexdigest()
+                if file_hashes.get(str(file_path)) == digest and file_path.exists():
+                    continue
             with open(file_path, "w+") as file:  # pragma: no cover
-                file.write(json.dumps(jsn, indent=4))
+                file.write(text)
+            if file_hashes is not None:
+                file_hashes[str(file_path)] = digest
+    if file_hashes is not None:
+        file_hashes[str(trial_dir)] = fingerprint
     return trial_dir
+
+
+def _trial_data_fingerprint(trial: BaseTrial, param_names: dict, write_trial_json: bool, kwargs: dict) -> str:
+    """Cheap fingerprint of what :func:`save_trial_data` writes, without serializing the trial"""
+    from boa.storage.tracking import trial_fingerprint
+
+    state = [trial.index, trial_fingerprint(trial), param_names, write_trial_json, kwargs]
+    return hashlib.sha1(json.dumps(state, sort_keys=True, default=repr).encode()).hexdigest()
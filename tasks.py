@@ -113,6 +113,23 @@ All Testing Directories Passed Successfully
     )
 
 
+@task
+def benchmark(command, name="storage", options=""):
+    """Runs the benchmarks of ``benchmarks/<name>.py`` (``storage``, ``signatures`` or ``streaming``),
+    pass options to ``python -m benchmarks.<name>`` like
+    invoke benchmark --options "-n 100 -n 1000 -o storage_benchmark.csv"
+    invoke benchmark --name signatures --options "-r 5000"
+    """
+    title = f"Running the {name} benchmarks"
+    print(
+        f"""
+{title}
+{"=" * len(title)}
+"""
+    )
+    command.run(f"python -m benchmarks.{name} {options}", echo=True, pty=POSIX)
+
+
 @task
 def docs(command, warn_is_error=False, options=""):
     """Runs Sphinx to build the docs locally for testing"""
@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pytest
+from ax.core.base_trial import TrialStatus
+from ax.modelbridge.registry import Models
+
+from boa import ScriptWrapper, WrappedJobRunner, get_experiment, make_trial_dir
+from boa.wrappers.array_outputs import (
+    load_array_file,
+    load_array_output,
+    resolve_array_references,
+)
+from boa.wrappers.script_wrapper import OUTPUT_FILES
+
+
+def test_npy_files_are_memory_mapped(tmp_path):
+    np.save(tmp_path / "y.npy", np.arange(10.0))
+    array = load_array_file(tmp_path / "y.npy")
+    assert isinstance(array, np.memmap)
+    np.testing.assert_array_equal(array, np.arange(10.0))
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_npz_outputs_nest_metric_arguments(tmp_path, compressed):
+    y_true, y_pred = np.arange(6.0).reshape(2, 3), np.asfortranarray(np.ones((2, 3), dtype=np.float32))
+    savez = np.savez_compressed if compressed else np.savez
+    savez(tmp_path / "output.npz", **{"RMSE/y_true": y_true, "RMSE/y_pred": y_pred, "a": np.arange(3)})
+
+    data = load_array_output(tmp_path / "output.npz")
+    assert set(data) == {"RMSE", "a"}
+    np.testing.assert_array_equal(data["RMSE"]["y_true"], y_true)
+    np.testing.assert_array_equal(data["RMSE"]["y_pred"], y_pred)
+    assert data["RMSE"]["y_pred"].dtype == np.float32
+    # only arrays saved without compression can be memory-mapped
+    assert isinstance(data["RMSE"]["y_true"], np.memmap) is not compressed
+
+
+def test_npy_output_is_first_metric_argument(tmp_path):
+    np.save(tmp_path / "output.npy", np.arange(3))
+    data = load_array_output(tmp_path / "output.npy")
+    np.testing.assert_array_equal(data["wrapper_args"][0], np.arange(3))
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_table_outputs(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    table = pa.table({"flow": np.arange(5.0), "stage": np.ones(5)})
+    path = tmp_path / f"simulated{suffix}"
+    if suffix == ".parquet":
+        pyarrow.parquet.write_table(table, path)
+    else:
+        pyarrow.feather.write_feather(table, path, compression="uncompressed")
+
+    np.testing.assert_array_equal(load_array_file(f"{path}#flow"), np.arange(5.0))
+    assert set(load_array_output(path)) == {"flow", "stage"}
+
+
+def test_json_outputs_point_to_array_files(tmp_path):
+    np.save(tmp_path / "observed.npy", np.arange(4.0))
+    np.savez(tmp_path / "simulated.npz", flow=np.ones(4))
+    data = resolve_array_references(
+        {"RMSE": {"y_true": "observed.npy", "y_pred": "simulated.npz#flow", "label": "flow"}}, tmp_path
+    )
+    np.testing.assert_array_equal(data["RMSE"]["y_true"], np.arange(4.0))
+    np.testing.assert_array_equal(data["RMSE"]["y_pred"], np.ones(4))
+    assert data["RMSE"]["label"] == "flow"
+
+    with pytest.raises(KeyError):
+        resolve_array_references({"y": "simulated.npz#stage"}, tmp_path)
+    with pytest.raises(FileNotFoundError):
+        resolve_array_references({"y": "missing.npy"}, tmp_path)
+    # only metric arguments are array files, not strings nested deeper in them
+    data = resolve_array_references(
+        {"RMSE": {"y_true": ["observed.npy"], "options": {"log": "missing.npy"}}, "notes": [["missing.npy"]]},
+        tmp_path,
+    )
+    np.testing.assert_array_equal(data["RMSE"]["y_true"][0], np.arange(4.0))
+    assert data["RMSE"]["options"] == {"log": "missing.npy"}
+    assert data["notes"] == [["missing.npy"]]
+
+
+def test_script_wrapper_reads_array_outputs(tmp_path):
+    np.save(tmp_path / "observed.npy", np.arange(4.0))
+    (tmp_path / "output.json").write_text(json.dumps({"RMSE": {"y_true": "observed.npy"}}))
+
+    data = ScriptWrapper._read_output_files(tmp_path, OUTPUT_FILES, arrays=True)
+    np.testing.assert_array_equal(data["RMSE"]["y_true"], np.arange(4.0))
+    # reading the trial's status doesn't load its arrays
+    assert ScriptWrapper._read_output_files(tmp_path, OUTPUT_FILES) == {"RMSE": {"y_true": "observed.npy"}}
+
+    (tmp_path / "output.json").unlink()
+    np.savez(tmp_path / "results.npz", **{"RMSE/y_pred": np.ones(4)})
+    data = ScriptWrapper._read_output_files(tmp_path, OUTPUT_FILES, arrays=True)
+    np.testing.assert_array_equal(data["RMSE"]["y_pred"], np.ones(4))
+    assert ScriptWrapper._read_output_files(tmp_path, OUTPUT_FILES) is None
+
+
+@pytest.mark.parametrize("watch_trial_files", [False, True])
+def test_array_output_file_marks_trial_completed(generic_config, tmp_path, watch_trial_files):
+    generic_config.script_options.watch_trial_files = watch_trial_files
+    wrapper = ScriptWrapper(config=generic_config, experiment_dir=tmp_path)
+    experiment = get_experiment(wrapper.config, WrappedJobRunner(wrapper=wrapper), wrapper)
+    trial = experiment.new_trial(generator_run=Models.SOBOL(search_space=experiment.search_space).gen(1))
+    trial.mark_running(no_runner_required=True)
+    trial_dir = make_trial_dir(wrapper.experiment_dir, trial.index)
+    try:
+        wrapper._set_trial_status_from_files(trial)
+        assert trial.status == TrialStatus.RUNNING
+
+        # the file is only loaded once the trial's data is fetched
+        (trial_dir / "output.npz").write_bytes(b"not read yet")
+        if watch_trial_files:
+            assert wrapper.trial_watcher.wait_for_trial(trial.index, timeout=10)
+        wrapper._set_trial_status_from_files(trial)
+        assert trial.status == TrialStatus.COMPLETED
+    finally:
+        wrapper.close()
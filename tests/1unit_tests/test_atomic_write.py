@@ -0,0 +1,37 @@
+from boa.storage.atomic import atomic_write, backup_path, iter_snapshot_candidates
+
+
+def test_atomic_write_rotates_backups(tmp_path):
+    path = tmp_path / "scheduler.json"
+    for i in range(5):
+        atomic_write(path, f"{i}", backups=2)
+
+    assert path.read_text() == "4"
+    assert backup_path(path, 1).read_text() == "3"
+    assert backup_path(path, 2).read_text() == "2"
+    assert not backup_path(path, 3).exists()
+    assert list(iter_snapshot_candidates(path)) == [path, backup_path(path, 1), backup_path(path, 2)]
+    # no temp files left behind
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_atomic_write_no_backups(tmp_path):
+    path = tmp_path / "scheduler.json"
+    atomic_write(path, "a")
+    atomic_write(path, b"b")
+    assert path.read_text() == "b"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_file_permissions(tmp_path):
+    reference = tmp_path / "reference"
+    reference.touch()
+    path = tmp_path / "scheduler.json"
+    # new files get the same permissions as any other new file
+    atomic_write(path, "a", backups=1)
+    assert path.stat().st_mode == reference.stat().st_mode
+    # existing files keep theirs
+    path.chmod(0o600)
+    atomic_write(path, "b", backups=1)
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert backup_path(path, 1).read_text() == "a"
@@ -0,0 +1,60 @@
+import threading
+
+from boa.storage.background import BackgroundWriter
+
+
+def test_background_writer_coalesces_rewrites_of_same_file(tmp_path):
+    release = threading.Event()
+    writes = []
+    writer = BackgroundWriter()
+    # block the writer thread so the next writes pile up
+    writer.submit(tmp_path / "block", release.wait)
+    for i in range(5):
+        writer.submit(tmp_path / "a", lambda i=i: writes.append(("a", i)), replaces=True)
+        writer.submit(tmp_path / "b", lambda i=i: writes.append(("b", i)))
+    release.set()
+    assert writer.flush(timeout=10)
+    assert [w for w in writes if w[0] == "a"] == [("a", 4)]
+    assert [w for w in writes if w[0] == "b"] == [("b", i) for i in range(5)]
+    writer.close()
+
+
+def test_background_writer_flush_skips_min_interval(tmp_path):
+    writes = []
+    writer = BackgroundWriter(min_interval=60)
+    writer.submit(tmp_path / "a", lambda: writes.append(1))
+    assert writer.flush(timeout=10)
+    writer.submit(tmp_path / "a", lambda: writes.append(2))
+    # second write is debounced for a minute, unless flushed
+    assert writer.flush(timeout=10)
+    assert writes == [1, 2]
+    writer.close()
+
+
+def test_background_writer_close_writes_pending(tmp_path):
+    writes = []
+    writer = BackgroundWriter(min_interval=60)
+    writer.submit(tmp_path / "a", lambda: writes.append(1))
+    writer.flush(timeout=10)
+    writer.submit(tmp_path / "a", lambda: writes.append(2))
+    writer.close(timeout=10)
+    assert writes == [1, 2]
+
+
+def test_background_writer_concurrent_flushes_skip_min_interval(tmp_path):
+    writes = []
+    writer = BackgroundWriter(min_interval=60)
+    writer.submit(tmp_path / "a", lambda: writes.append(1))
+    assert writer.flush(timeout=10)
+    writer.submit(tmp_path / "a", lambda: writes.append(2))
+    # one flush timing out doesn't make the other one wait out the interval
+    assert not writer.flush(timeout=0)
+    results = []
+    flushers = [threading.Thread(target=lambda: results.append(writer.flush(timeout=10))) for _ in range(3)]
+    for thread in flushers:
+        thread.start()
+    for thread in flushers:
+        thread.join()
+    assert results == [True] * 3
+    assert writes == [1, 2]
+    writer.close()
@@ -0,0 +1,26 @@
+import logging
+import logging.handlers
+import queue
+
+from boa.logger import get_logger, start_queue_listener
+
+
+def test_queue_listener_logs_queued_records_through_local_handlers(caplog):
+    q = queue.Queue()
+    listener = start_queue_listener(q)
+    try:
+        # what a worker process with init_queue_logging does
+        worker_logger = logging.getLogger("boa.worker")
+        record = worker_logger.makeRecord("boa.worker", logging.INFO, __file__, 1, "from worker %s", (1,), None)
+        logging.handlers.QueueHandler(q).handle(record)
+    finally:
+        listener.stop()
+    assert [r.getMessage() for r in caplog.records if r.name == "boa.worker"] == ["from worker 1"]
+
+
+def test_get_logger_adds_file_handler_once(tmp_path):
+    filename = str(tmp_path / "optimization.log")
+    logger = get_logger("boa.test_logger", filename=filename)
+    n_handlers = len(logger.handlers)
+    get_logger("boa.test_logger", filename=filename)
+    assert len(logger.handlers) == n_handlers
@@ -0,0 +1,76 @@
+import numpy as np
+
+from boa.wrappers.metric_cache import (
+    PayloadCache,
+    ResultCache,
+    TrialResultStore,
+    parameterization_key,
+    payload_nbytes,
+)
+
+
+def test_payload_cache_drops_least_recently_used_trials():
+    cache = PayloadCache(max_trials=2)
+    cache[0], cache[1] = {"a": 0}, {"a": 1}
+    cache[0]  # used more recently than 1
+    cache[2] = {"a": 2}
+    assert list(cache) == [0, 2]
+
+
+def test_payload_cache_bounded_by_size(tmp_path):
+    array = np.ones(1000)
+    cache = PayloadCache(max_bytes=2.5 * array.nbytes)
+    for i in range(3):
+        cache[i] = {"RMSE": {"y_true": array, "y_pred": array}}
+    assert list(cache) == [2] and cache.nbytes == payload_nbytes(cache[2]) > 2 * array.nbytes
+
+    # memory-mapped arrays don't count, they are backed by their file
+    np.save(tmp_path / "y.npy", array)
+    cache[3] = {"RMSE": {"y_true": np.load(tmp_path / "y.npy", mmap_mode="r")}}
+    assert list(cache) == [2, 3]
+    del cache[2]
+    assert cache.nbytes < array.nbytes
+
+
+def test_result_cache_persists_results(tmp_path):
+    path = tmp_path / "metric_results.jsonl"
+    rmse, mean = ResultCache("RMSE", path=path), ResultCache("Mean", path=path)
+    rmse[(0, "abc")] = {"arm_name": ["0_0"], "mean": [np.float32(0.5)], "sem": [float("nan")]}
+    rmse[(1, "def")] = {"arm_name": ["1_0"], "mean": [1.5], "sem": [0.0]}
+    mean[(0, "abc")] = {"arm_name": ["0_0"], "mean": [2.0], "sem": [0.0]}
+    del rmse[(1, "def")]
+    with open(path, "a") as f:
+        f.write('{"metric_name": "RMSE", "trial_ind')  # cut off by a crash
+
+    loaded = ResultCache("RMSE", path=path)
+    assert list(loaded) == [(0, "abc")]
+    assert loaded[(0, "abc")]["mean"] == [0.5] and np.isnan(loaded[(0, "abc")]["sem"][0])
+    assert dict(ResultCache("Mean", path=path)) == dict(mean)
+
+
+def test_parameterization_key_compares_numbers_by_value():
+    key = parameterization_key({"x1": 1, "x2": -0.0, "x3": "a"}, {"setting": 1})
+    assert key == parameterization_key({"x3": "a", "x2": np.float64(0.0), "x1": 1.0}, {"setting": 1})
+    assert key != parameterization_key({"x1": 1, "x2": 0.0, "x3": "a"}, {"setting": 2})
+    assert key != parameterization_key({"x1": 1, "x2": 0.0, "x3": "b"}, {"setting": 1})
+
+
+def test_trial_result_store_merges_metrics(tmp_path):
+    store = TrialResultStore(tmp_path / "trial_results")
+    key = parameterization_key({"x1": 0.5})
+    assert store.get(key) is None
+    store.add(key, parameters={"x1": 0.5}, metric_name="RMSE", mean=np.float32(0.25), sem=0.0)
+    other_store = TrialResultStore(tmp_path / "trial_results")
+    other_store.add(key, parameters={"x1": 0.5}, metric_name="Mean", mean=2.0, sem=None)
+    assert store.get(key) == {
+        "parameters": {"x1": 0.5},
+        "metrics": {"RMSE": {"mean": 0.25, "sem": 0.0}, "Mean": {"mean": 2.0, "sem": None}},
+    }
+    # each metric has its own file, so metrics added at the same time don't overwrite each other
+    assert sorted(path.name for path in (tmp_path / "trial_results" / key).iterdir()) == ["Mean.json", "RMSE.json"]
+
+
+def test_parameterization_key_includes_evaluator():
+    key = parameterization_key({"x1": 0.5}, evaluator={"wrapper": "Wrapper", "run_model": "python run.py"})
+    assert key != parameterization_key({"x1": 0.5}, evaluator={"wrapper": "Wrapper", "run_model": "python other.py"})
+    assert key != parameterization_key({"x1": 0.5})
@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from ax import MultiObjectiveOptimizationConfig, OptimizationConfig
+from ax import Metric, MultiObjectiveOptimizationConfig, OptimizationConfig
 
 from boa import (
     BaseWrapper,
@@ -116,6 +116,49 @@ def test_metric_fetch_trial_data_works_with_wrapper_fetch_trial_data_and_test_se
             prev_f_ret = f_ret
 
 
+class BulkWrapper(WrapperForTestss):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bulk_calls = []
+
+    def fetch_trials_data(self, trials, metric_properties, param_names, **kwargs):
+        self.bulk_calls.append([trial.index for trial in trials])
+        return {trial.index: self.fetch_trial_data(trial, metric_properties, None) for trial in trials}
+
+
+def test_experiment_fetch_gets_all_metrics_of_completed_trials_at_once(moo_config, tmp_path):
+    controller = Controller(config=moo_config, wrapper=BulkWrapper, experiment_dir=tmp_path)
+    controller.initialize_scheduler()
+    experiment = controller.experiment
+    wrapper = controller.wrapper
+
+    trials = []
+    for _ in range(4):
+        trial = experiment.new_trial(generator_run=controller.scheduler.generation_strategy.gen(experiment))
+        trial.mark_running(no_runner_required=True).mark_completed()
+        trials.append(trial)
+    results = experiment.fetch_trials_data_results([trial.index for trial in trials])
+
+    # one call to the wrapper for all trials and metrics
+    assert wrapper.bulk_calls == [[0, 1, 2, 3]]
+    assert set(results) == {0, 1, 2, 3}
+    for trial in trials:
+        assert set(results[trial.index]) == set(experiment.metrics)
+        for name, metric in experiment.metrics.items():
+            df = results[trial.index][name].unwrap().df
+            assert df["trial_index"].tolist() == [trial.index] and df["metric_name"].tolist() == [name]
+            metric._trial_data_cache.clear()
+            assert df["mean"].iloc[0] == metric.fetch_trial_data(trial).unwrap().df["mean"].iloc[0]
+
+    # once attached to the experiment, completed trials' data is looked up instead of fetched
+    experiment.attach_data(Metric._unwrap_experiment_data_multi(results))
+    results, contains_new_data = next(iter(experiment.metrics.values())).fetch_data_prefer_lookup(
+        experiment, list(experiment.metrics.values()), trials=trials
+    )
+    assert not contains_new_data and all(set(result) == set(experiment.metrics) for result in results.values())
+    assert len(wrapper.bulk_calls) == 1
+
+
 def test_metric_fetch_trial_data_works_with_wrapper_fetch_trial_all_data_and_test_sem_fails_with_wrong_metrics(
     moo_config, caplog, tmp_path
 ):
@@ -201,3 +244,29 @@ def test_can_override_metric_func_kwargs():
         returns.append(metric.f(x, y))
     # All the normalized values should be different, ensuring that the kwargs are passed through
     assert len(set(returns)) == len(normalizers)
+
+
+def test_persisted_metric_results_are_not_fetched_again_on_resume(moo_config, tmp_path):
+    moo_config.script_options.persist_metric_results = True
+    controller = Controller(config=moo_config, wrapper=BulkWrapper, experiment_dir=tmp_path)
+    controller.initialize_scheduler()
+    experiment = controller.experiment
+
+    trials = []
+    for _ in range(3):
+        trial = experiment.new_trial(generator_run=controller.scheduler.generation_strategy.gen(experiment))
+        trial.mark_running(no_runner_required=True).mark_completed()
+        trials.append(trial)
+    results = experiment.fetch_trials_data_results([trial.index for trial in trials])
+    assert (controller.wrapper.experiment_dir / "metric_results.jsonl").exists()
+
+    # as if resumed, a new wrapper (with empty caches) and new metrics
+    wrapper = BulkWrapper(config=moo_config, mk_exp_dir=False)
+    wrapper.experiment_dir = controller.wrapper.experiment_dir
+    for name, metric in experiment.metrics.items():
+        metric = metric.clone()
+        metric.wrapper = wrapper
+        for trial in trials:
+            df = metric.fetch_trial_data(trial).unwrap().df
+            assert df["mean"].tolist() == results[trial.index][name].unwrap().df["mean"].tolist()
+    assert wrapper.bulk_calls == [] and len(wrapper._get_metric_cache()) == 0
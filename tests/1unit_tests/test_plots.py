@@ -6,6 +6,7 @@ from boa.plotting import (
     plot_metrics_trace,
     plot_pareto_frontier,
     plot_slice,
+    summary_view,
 )
 
 
@@ -20,6 +21,9 @@ def test_soo_can_create_plots(branin_main_run):
     slice = plot_slice(scheduler)
     assert isinstance(slice, pn.reactive.Reactive)
 
+    summary = summary_view(scheduler)
+    assert isinstance(summary, pn.template.BaseTemplate)
+
 
 def test_moo_can_create_plots(moo_main_run):
     scheduler = moo_main_run
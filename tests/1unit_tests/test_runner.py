@@ -0,0 +1,331 @@
+import logging
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+from ax import Arm
+from ax.core.base_trial import TrialStatus
+from ax.modelbridge.registry import Models
+
+from boa import BaseWrapper, ScriptWrapper, WrappedJobRunner, get_experiment
+from boa.config import BOAScriptOptions
+from boa.logger import get_logger
+
+
+class FakeTrial:
+    def __init__(self, index):
+        self.index = index
+        self.status = TrialStatus.RUNNING
+
+
+class SlowStatusWrapper(BaseWrapper):
+    def __init__(self, *args, delays=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = delays or {}
+        self.threads = set()
+
+    def set_trial_status(self, trial) -> None:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delays.get(trial.index, 0.2))
+        trial.status = TrialStatus.COMPLETED
+
+
+class FailingDeployWrapper(BaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deployed = set()
+        self.stopped = {}
+
+    def run_model(self, trial) -> None:
+        if trial.index == 1:
+            raise RuntimeError("model crashed")
+        if trial.index == 2:
+            time.sleep(1.0)
+        self.deployed.add(trial.index)
+
+    def set_trial_status(self, trial) -> None:
+        pass
+
+    def stop_trial(self, trial, reason=None) -> None:
+        self.stopped[trial.index] = reason
+
+
+class SlowDeployWrapper(BaseWrapper):
+    def __init__(self, *args, delay=0.3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.deployed = set()
+
+    def run_model(self, trial) -> None:
+        time.sleep(self.delay)
+        self.deployed.add(trial.index)
+
+    def set_trial_status(self, trial) -> None:
+        pass
+
+
+class StoppableWrapper(BaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopped = {}
+
+    def run_model(self, trial) -> None:
+        pass
+
+    def set_trial_status(self, trial) -> None:
+        pass  # never finishes
+
+    def stop_trial(self, trial, reason=None) -> None:
+        self.stopped[trial.index] = reason
+
+
+class CountingWrapper(BaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def run_model(self, trial) -> None:
+        self.calls.append(("run_model", trial.index))
+
+    def set_trial_status(self, trial) -> None:
+        self.calls.append(("set_trial_status", trial.index))
+        trial.mark_completed()
+
+    def fetch_trial_data(self, trial, metric_properties, metric_name, *args, **kwargs):
+        self.calls.append(("fetch_trial_data", trial.index))
+        y = np.array(list(trial.arm.parameters.values()), dtype=float)
+        return {"rmse": {"y_true": y, "y_pred": y + 1}, "Meanyyy": {"a": y}}
+
+
+class OtherModelWrapper(CountingWrapper):
+    pass
+
+
+class LoggingDeployWrapper(BaseWrapper):
+    def run_model(self, trial) -> None:
+        get_logger().info(f"deploying trial {trial.index}")
+
+
+def test_poll_trial_status_concurrently(generic_config, tmp_path):
+    wrapper = SlowStatusWrapper(config=generic_config, experiment_dir=tmp_path)
+    wrapper.config.script_options.poll_workers = 8
+    runner = WrappedJobRunner(wrapper=wrapper)
+    trials = [FakeTrial(i) for i in range(8)]
+
+    start = time.perf_counter()
+    status_dict = runner.poll_trial_status(trials)
+    assert time.perf_counter() - start < 0.2 * 4
+    assert status_dict == {TrialStatus.COMPLETED: set(range(8))}
+    assert len(wrapper.threads) > 1
+
+
+def test_poll_trial_status_timeout_doesnt_wait_on_hung_checks(generic_config, tmp_path):
+    wrapper = SlowStatusWrapper(config=generic_config, experiment_dir=tmp_path, delays={0: 1.0})
+    wrapper.config.script_options.poll_workers = 4
+    wrapper.config.script_options.poll_timeout = 0.5
+    runner = WrappedJobRunner(wrapper=wrapper)
+    trials = [FakeTrial(i) for i in range(4)]
+
+    start = time.perf_counter()
+    status_dict = runner.poll_trial_status(trials)
+    assert time.perf_counter() - start < 1.0
+    assert status_dict == {TrialStatus.RUNNING: {0}, TrialStatus.COMPLETED: {1, 2, 3}}
+
+    # the hung check is picked up by the next poll instead of starting another one
+    time.sleep(0.6)
+    status_dict = runner.poll_trial_status(trials[:1])
+    assert status_dict == {TrialStatus.COMPLETED: {0}}
+    assert not runner._pending_polls
+
+
+def test_run_multiple_marks_failed_deployments_and_deploys_the_rest(generic_config, tmp_path):
+    wrapper = FailingDeployWrapper(config=generic_config, experiment_dir=tmp_path)
+    wrapper.config.script_options.deploy_workers = 4
+    wrapper.config.script_options.deploy_timeout = 0.5
+    runner = WrappedJobRunner(wrapper=wrapper)
+    experiment = get_experiment(wrapper.config, runner, wrapper)
+    sobol = Models.SOBOL(search_space=experiment.search_space)
+    trials = [experiment.new_trial(generator_run=sobol.gen(1)) for _ in range(4)]
+    n_handlers = len(logging.getLogger().handlers), len(logging.getLogger("ax").handlers)
+
+    results = runner.run_multiple(trials)
+    assert set(results) == {0, 1, 2, 3}
+    assert "deploy_error" in results[1] and "deploy_error" in results[2]
+    assert wrapper.deployed == {0, 3}
+    # deploying doesn't add logging handlers
+    assert (len(logging.getLogger().handlers), len(logging.getLogger("ax").handlers)) == n_handlers
+
+    for trial in trials:
+        trial.mark_running(no_runner_required=True)
+    status_dict = runner.poll_trial_status(trials)
+    assert status_dict == {TrialStatus.RUNNING: {0, 3}, TrialStatus.FAILED: {1, 2}}
+    assert trials[1].status == TrialStatus.FAILED
+    assert "model crashed" in trials[1].failed_reason
+    # the timed out deployment is stopped, not left running
+    assert list(wrapper.stopped) == [2] and "deploy_timeout" in wrapper.stopped[2]
+    assert "deploy_timeout" in trials[2].failed_reason
+    runner.shutdown(wait=False)
+    # nothing is made for logging from other processes when deploying in this one
+    assert runner._queue is None
+
+
+def test_deploy_timeout_is_timed_from_when_each_deployment_starts(generic_config, tmp_path):
+    wrapper = SlowDeployWrapper(config=generic_config, experiment_dir=tmp_path, delay=0.3)
+    wrapper.config.script_options.deploy_workers = 2
+    wrapper.config.script_options.deploy_timeout = 0.6
+    runner = WrappedJobRunner(wrapper=wrapper)
+    experiment = get_experiment(wrapper.config, runner, wrapper)
+    sobol = Models.SOBOL(search_space=experiment.search_space)
+    trials = [experiment.new_trial(generator_run=sobol.gen(1)) for _ in range(6)]
+
+    # all six take longer than deploy_timeout on two workers, but each one is well within it
+    results = runner.run_multiple(trials)
+    assert not any("deploy_error" in result for result in results.values())
+    assert wrapper.deployed == set(range(6))
+    runner.shutdown(wait=False)
+
+
+def test_run_multiple_in_processes_logs_through_main_process(generic_config, tmp_path, caplog):
+    wrapper = LoggingDeployWrapper(config=generic_config, experiment_dir=tmp_path)
+    wrapper.config.script_options.deploy_executor = "process"
+    wrapper.config.script_options.deploy_workers = 2
+    runner = WrappedJobRunner(wrapper=wrapper)
+    experiment = get_experiment(wrapper.config, runner, wrapper)
+    sobol = Models.SOBOL(search_space=experiment.search_space)
+    trials = [experiment.new_trial(generator_run=sobol.gen(1)) for _ in range(2)]
+
+    results = runner.run_multiple(trials)
+    runner.shutdown()
+    assert results == {0: {"job_id": 0}, 1: {"job_id": 1}}
+    messages = {r.getMessage() for r in caplog.records if r.processName != "MainProcess"}
+    assert messages >= {"deploying trial 0", "deploying trial 1"}
+
+
+def test_process_deploy_executor_is_rejected_for_script_wrapper(generic_config, tmp_path):
+    with pytest.raises(TypeError, match="process"):
+        BOAScriptOptions(run_model=SLEEPING_SCRIPT, deploy_executor="process")
+
+    wrapper = ScriptWrapper(config=generic_config, experiment_dir=tmp_path)
+    wrapper.config.script_options.deploy_executor = "process"
+    runner = WrappedJobRunner(wrapper=wrapper)
+    experiment = get_experiment(wrapper.config, runner, wrapper)
+    sobol = Models.SOBOL(search_space=experiment.search_space)
+    with pytest.raises(TypeError, match="process"):
+        runner.run_multiple([experiment.new_trial(generator_run=sobol.gen(1))])
+
+
+def _running_trials(runner, wrapper, n):
+    experiment = get_experiment(wrapper.config, runner, wrapper)
+    sobol = Models.SOBOL(search_space=experiment.search_space)
+    trials = [experiment.new_trial(generator_run=sobol.gen(1)) for _ in range(n)]
+    runner.run_multiple(trials)
+    for trial in trials:
+        trial.mark_running(no_runner_required=True)
+    return trials
+
+
+@pytest.mark.parametrize("timeout_status", ["failed", "abandoned"])
+def test_poll_trial_status_stops_trials_past_trial_timeout(generic_config, tmp_path, timeout_status):
+    wrapper = StoppableWrapper(config=generic_config, experiment_dir=tmp_path)
+    wrapper.config.script_options.trial_timeout = 0.5
+    wrapper.config.script_options.trial_timeout_status = timeout_status
+    runner = WrappedJobRunner(wrapper=wrapper)
+    trials = _running_trials(runner, wrapper, 2)
+
+    assert runner.poll_trial_status(trials) == {TrialStatus.RUNNING: {0, 1}}
+    time.sleep(0.6)
+    status = TrialStatus[timeout_status.upper()]
+    assert runner.poll_trial_status(trials) == {status: {0, 1}}
+    assert trials[0].status == status
+    assert set(wrapper.stopped) == {0, 1} and "trial_timeout" in wrapper.stopped[0]
+    runner.shutdown()
+
+
+SLEEPING_SCRIPT = f"{sys.executable} -c 'import time; time.sleep(60)'"
+
+
+def test_trial_timeout_kills_script_wrapper_scripts(generic_config, tmp_path):
+    generic_config.script_options.run_model = SLEEPING_SCRIPT
+    generic_config.script_options.trial_timeout = 0.5
+    wrapper = ScriptWrapper(config=generic_config, experiment_dir=tmp_path)
+    runner = WrappedJobRunner(wrapper=wrapper)
+    (trial,) = _running_trials(runner, wrapper, 1)
+    (process,) = wrapper._script_processes[trial.index]
+
+    time.sleep(0.6)
+    assert runner.poll_trial_status([trial]) == {TrialStatus.FAILED: {0}}
+    assert process.returncode is not None
+    assert trial.index not in wrapper._script_processes
+    runner.shutdown()
+
+
+def test_subprocess_output_is_deprecated_and_returns_the_last_script_output(generic_config, tmp_path):
+    generic_config.script_options.run_model = f"{sys.executable} -c 'print(1234)'"
+    wrapper = ScriptWrapper(config=generic_config, experiment_dir=tmp_path)
+    runner = WrappedJobRunner(wrapper=wrapper)
+    (trial,) = _running_trials(runner, wrapper, 1)
+
+    deadline = time.monotonic() + 10
+    while trial.index in wrapper._script_processes and time.monotonic() < deadline:
+        time.sleep(0.1)
+    with pytest.deprecated_call():
+        assert wrapper.subprocess_output == "1234"
+    runner.shutdown()
+
+
+def test_script_timeouts_kill_script_and_fail_trial(generic_config, tmp_path):
+    generic_config.script_options.run_model = SLEEPING_SCRIPT
+    generic_config.script_options.script_timeouts = {"run_model": 0.5}
+    wrapper = ScriptWrapper(config=generic_config, experiment_dir=tmp_path)
+    runner = WrappedJobRunner(wrapper=wrapper)
+    (trial,) = _running_trials(runner, wrapper, 1)
+
+    deadline = time.monotonic() + 10
+    while not trial.status.is_terminal and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert trial.status == TrialStatus.FAILED
+    runner.shutdown()
+
+
+def test_trials_with_evaluated_parameters_are_memoized(generic_config, tmp_path):
+    generic_config.script_options.memoize_trials = True
+
+    def run_trial(experiment, runner, arm):
+        trial = experiment.new_trial().add_arm(arm)
+        trial.update_run_metadata(runner.run_multiple([trial])[trial.index])
+        trial.mark_running(no_runner_required=True)
+        assert runner.poll_trial_status([trial]) == {TrialStatus.COMPLETED: {trial.index}}
+        data = experiment.fetch_trials_data([trial.index]).df
+        return trial, dict(zip(data["metric_name"], data["mean"]))
+
+    wrapper = CountingWrapper(config=generic_config, experiment_dir=tmp_path / "exp")
+    runner = WrappedJobRunner(wrapper=wrapper)
+    experiment = get_experiment(wrapper.config, runner, wrapper)
+    arm = Models.SOBOL(search_space=experiment.search_space).gen(1).arms[0]
+    _, means = run_trial(experiment, runner, arm)
+    assert {call for call, _ in wrapper.calls} == {"run_model", "set_trial_status", "fetch_trial_data"}
+
+    # the same parameters, in this experiment or another one in the same output dir, aren't run again
+    wrapper.calls.clear()
+    trial, memoized_means = run_trial(experiment, runner, Arm(parameters=arm.parameters))
+    assert trial.run_metadata["memoized"] and memoized_means == means and wrapper.calls == []
+
+    other_wrapper = CountingWrapper(config=generic_config, experiment_dir=tmp_path / "other_exp")
+    other_runner = WrappedJobRunner(wrapper=other_wrapper)
+    other_experiment = get_experiment(other_wrapper.config, other_runner, other_wrapper)
+    _, other_means = run_trial(other_experiment, other_runner, Arm(parameters=arm.parameters))
+    assert other_means == means and other_wrapper.calls == []
+
+    # but new parameters are
+    parameters = {**arm.parameters, "x1": (arm.parameters["x1"] + 0.5) % 1}
+    trial, _ = run_trial(other_experiment, other_runner, Arm(parameters=parameters))
+    assert "memoized" not in trial.run_metadata and ("run_model", trial.index) in other_wrapper.calls
+
+    # and neither are the same parameters of another model
+    model_wrapper = OtherModelWrapper(config=generic_config, experiment_dir=tmp_path / "model_exp")
+    model_runner = WrappedJobRunner(wrapper=model_wrapper)
+    model_experiment = get_experiment(model_wrapper.config, model_runner, model_wrapper)
+    trial, _ = run_trial(model_experiment, model_runner, Arm(parameters=arm.parameters))
+    assert "memoized" not in trial.run_metadata and ("run_model", trial.index) in model_wrapper.calls
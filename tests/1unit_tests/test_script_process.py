@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+import pytest
+
+from boa.wrappers.script_process import ScriptProcess
+
+CHATTY_SCRIPT = """
+import sys
+for i in range(20000):
+    sys.stderr.write(f"err {i}\\n")
+print("done")
+"""
+
+PARENT_SCRIPT = """
+import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print(child.pid, flush=True)
+time.sleep(60)
+"""
+
+
+def test_script_process_drains_stderr_while_stdout_is_quiet(tmp_path, caplog):
+    log_file = tmp_path / "run_model.log"
+    process = ScriptProcess([sys.executable, "-c", CHATTY_SCRIPT], log_file=log_file)
+    # more stderr than a pipe holds, so this would hang if stderr was only read after stdout
+    assert process.wait(timeout=30) == 0
+    assert "done" in caplog.messages
+    assert list(process.stderr_tail)[-1] == "err 19999"
+    log = log_file.read_text().splitlines()
+    assert len(log) == 20001 and "done" in log
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are killed with signals on POSIX")
+def test_script_process_kill_kills_what_it_started(caplog):
+    process = ScriptProcess([sys.executable, "-c", PARENT_SCRIPT])
+    # the script prints the pid of the process it started, which is logged
+    deadline = time.monotonic() + 30
+    while not (child_pids := [int(m) for m in caplog.messages if m.isdigit()]) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert child_pids
+
+    process.kill(grace_period=1)
+    assert process.wait(timeout=5) != 0
+    deadline = time.monotonic() + 5
+    while _is_running(child_pids[0]) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not _is_running(child_pids[0])
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
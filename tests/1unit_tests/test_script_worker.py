@@ -0,0 +1,60 @@
+import io
+import json
+import sys
+import threading
+
+import pytest
+
+from boa.definitions import ROOT
+from boa.wrappers.clients import R_CLIENT, serve_script_worker
+from boa.wrappers.script_worker import ScriptWorker, ScriptWorkerError
+
+ECHO_WORKER = f"{sys.executable} {ROOT / 'tests/scripts/py_script_worker/echo_worker.py'}"
+
+
+def test_script_worker_answers_requests_from_one_process(tmp_path):
+    worker = ScriptWorker(ECHO_WORKER, cwd=tmp_path)
+    try:
+        assert worker.request("run_model", 0, tmp_path, timeout=30)["echo"] == "run_model"
+        pid = worker._process.pid
+        assert worker.request("set_trial_status", 0, tmp_path, timeout=30)["echo"] == "set_trial_status"
+        assert worker._process.pid == pid
+
+        with pytest.raises(ScriptWorkerError, match="always fails"):
+            worker.request("run_model", 1, tmp_path, timeout=30)
+        # the worker keeps serving after a failed request
+        assert worker.request("run_model", 3, tmp_path, timeout=30)["ok"]
+    finally:
+        worker.close()
+    assert not worker.running
+
+
+def test_script_worker_restarts_after_exiting(tmp_path):
+    worker = ScriptWorker(ECHO_WORKER, cwd=tmp_path)
+    try:
+        with pytest.raises(ScriptWorkerError, match="exited with code 3"):
+            worker.request("run_model", 2, tmp_path, timeout=30)
+        assert worker.request("run_model", 0, tmp_path, timeout=30)["ok"]
+    finally:
+        worker.close()
+
+
+def test_serve_script_worker_handles_requests_concurrently(tmp_path):
+    # both requests have to be handled at the same time to get past the barrier
+    barrier = threading.Barrier(2, timeout=10)
+
+    def handle(trial_dir, request):
+        barrier.wait()
+        return {"trial_index": request["trial_index"]}
+
+    requests = [{"id": i, "func_name": "run_model", "trial_index": i, "trial_dir": str(tmp_path)} for i in range(2)]
+    stdout = io.StringIO()
+    serve_script_worker(
+        handle, stdin=io.StringIO("".join(json.dumps(r) + "\n" for r in requests)), stdout=stdout, max_workers=2
+    )
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert sorted((r["id"], r["trial_index"], r["ok"]) for r in responses) == [(0, 0, True), (1, 1, True)]
+
+
+def test_r_client_is_installed_with_boa():
+    assert R_CLIENT.exists() and "serve_boa_requests" in R_CLIENT.read_text()
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import scipy.stats
+import sklearn.metrics
+
+from boa import MeanSquaredError, RSquared
+from boa.metrics.metric_funcs import normalized_root_mean_squared_error
+from boa.metrics.streaming import (
+    StreamingHistogram,
+    mean,
+    mean_squared_error,
+    r2_score,
+)
+
+
+def chunks(array, size):
+    for start in range(0, len(array), size):
+        yield array[start : start + size]
+
+
+@pytest.fixture
+def arrays(tmp_path):
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(size=(5001, 3))
+    y_pred = y_true + rng.normal(scale=0.3, size=y_true.shape)
+    np.save(tmp_path / "y_true.npy", y_true)
+    np.save(tmp_path / "y_pred.npy", y_pred)
+    mm_true, mm_pred = np.load(tmp_path / "y_true.npy", mmap_mode="r"), np.load(tmp_path / "y_pred.npy", mmap_mode="r")
+    return y_true, y_pred, mm_true, mm_pred
+
+
+@pytest.mark.parametrize("multioutput", ["raw_values", "uniform_average", [0.2, 0.3, 0.5]])
+def test_streamed_metrics_match_in_memory_ones(arrays, multioutput):
+    y_true, y_pred, mm_true, mm_pred = arrays
+    weight = np.linspace(0, 1, len(y_true))
+
+    expected = sklearn.metrics.mean_squared_error(y_true, y_pred, sample_weight=weight, multioutput=multioutput)
+    # unaligned chunks of an iterator and a memory-mapped array
+    result = mean_squared_error(
+        mm_true, chunks(y_pred, 777), sample_weight=weight, multioutput=multioutput, chunk_size=999
+    )
+    np.testing.assert_allclose(result, expected)
+    np.testing.assert_allclose(
+        mean_squared_error(mm_true, mm_pred, multioutput=multioutput, squared=False),
+        mean_squared_error(y_true, y_pred, multioutput=multioutput, squared=False),
+    )
+
+    expected = sklearn.metrics.r2_score(y_true, y_pred, sample_weight=weight, multioutput=multioutput)
+    result = r2_score(chunks(y_true, 333), mm_pred, sample_weight=weight, multioutput=multioutput)
+    np.testing.assert_allclose(result, expected)
+
+    np.testing.assert_allclose(mean(mm_true), np.mean(y_true))
+    np.testing.assert_allclose(mean(chunks(y_true, 100), axis=0), np.mean(y_true, axis=0))
+
+
+def test_streamed_inputs_must_have_the_same_length(arrays):
+    y_true, y_pred, _, _ = arrays
+    with pytest.raises(ValueError):
+        mean_squared_error(chunks(y_true, 100), y_pred[:-1])
+
+
+@pytest.mark.parametrize("normalizer,stat", [("iqr", scipy.stats.iqr), ("std", scipy.stats.tstd), ("range", np.ptp)])
+def test_streamed_nrmse(arrays, normalizer, stat):
+    y_true, y_pred, mm_true, mm_pred = arrays
+    expected = sklearn.metrics.mean_squared_error(y_true[:, 0], y_pred[:, 0]) ** 0.5 / stat(y_pred[:, 0])
+    result = normalized_root_mean_squared_error(chunks(y_true[:, 0], 500), mm_pred[:, 0], normalizer=normalizer)
+    # the iqr of streamed arrays is estimated from a histogram
+    np.testing.assert_allclose(result, expected, rtol=1e-3 if normalizer == "iqr" else 1e-7)
+
+
+def test_streaming_histogram_quantiles():
+    values = np.random.default_rng(1).exponential(size=100_000)
+    histogram = StreamingHistogram(bins=1024)
+    for chunk in chunks(values[::-1], 1000):  # the range grows from both ends
+        histogram.update(chunk)
+    width = np.ptp(values) / 1024
+    assert histogram.quantile(0) == values.min() and histogram.quantile(1) == values.max()
+    for q in (0, 0.25, 0.5, 0.75, 1):
+        assert abs(histogram.quantile(q) - np.quantile(values, q)) <= 4 * width
+
+
+def test_metrics_evaluate_memory_mapped_arrays(arrays):
+    y_true, y_pred, mm_true, mm_pred = arrays
+    assert MeanSquaredError().f(mm_true, mm_pred) == pytest.approx(sklearn.metrics.mean_squared_error(y_true, y_pred))
+    metric = RSquared(metric_func_kwargs={"chunk_size": 1000})
+    assert metric.f(y_true, y_pred) == pytest.approx(sklearn.metrics.r2_score(y_true, y_pred))
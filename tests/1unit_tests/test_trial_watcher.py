@@ -0,0 +1,100 @@
+import json
+import shutil
+import time
+
+import pytest
+
+from boa.wrappers.trial_watcher import TrialFileWatcher, _load_inotify
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request):
+    watcher = TrialFileWatcher(file_names=["output", "trial_status"], poll_interval=0.05, use_inotify=request.param)
+    yield watcher
+    watcher.close()
+
+
+def test_watcher_reports_written_output_files(watcher, tmp_path):
+    watcher.watch(0, tmp_path)
+    assert not watcher.pop_changed(0)
+
+    (tmp_path / "parameters.json").write_text("{}")  # not a watched file
+    assert not watcher.wait_for_trial(0, timeout=0.3)
+
+    start = time.perf_counter()
+    with open(tmp_path / "output.json", "w") as f:
+        json.dump({"metric": 1}, f)
+    assert watcher.wait_for_trial(0, timeout=5)
+    assert time.perf_counter() - start < 1
+    assert watcher.pop_changed(0)
+    assert not watcher.pop_changed(0)
+
+
+def test_watcher_reports_files_written_before_watching(watcher, tmp_path):
+    (tmp_path / "trial_status.json").write_text('{"trial_status": "FAILED"}')
+    watcher.watch(3, tmp_path)
+    assert watcher.pop_changed(3)
+
+
+def test_watcher_wait_wakes_on_any_trial(watcher, tmp_path):
+    trial_dirs = [tmp_path / str(i) for i in range(2)]
+    for i, trial_dir in enumerate(trial_dirs):
+        trial_dir.mkdir()
+        watcher.watch(i, trial_dir)
+    assert not watcher.wait(timeout=0.2)
+
+    (trial_dirs[1] / "output.yaml").write_text("metric: 1")
+    assert watcher.wait(timeout=5)
+    assert not watcher.pop_changed(0) and watcher.pop_changed(1)
+
+    watcher.unwatch(1)
+    (trial_dirs[1] / "output.json").write_text("{}")
+    assert not watcher.wait(timeout=0.3)
+
+
+def test_watcher_keeps_watching_after_a_trial_dir_is_removed(watcher, tmp_path):
+    trial_dirs = [tmp_path / str(i) for i in range(2)]
+    for i, trial_dir in enumerate(trial_dirs):
+        trial_dir.mkdir()
+        watcher.watch(i, trial_dir)
+
+    shutil.rmtree(trial_dirs[0])
+    time.sleep(0.3)
+    (trial_dirs[1] / "output.json").write_text("{}")
+    assert watcher.wait_for_trial(1, timeout=5)
+
+    # and notices the files of the removed one if it comes back
+    trial_dirs[0].mkdir()
+    (trial_dirs[0] / "output.json").write_text("{}")
+    assert watcher.wait_for_trial(0, timeout=5)
+
+
+class _NoWriteEvents:
+    """inotify that never reports files written, like files written to NFS from another machine"""
+
+    IN_DELETE_SELF = 0x00000400
+
+    def __init__(self, libc):
+        self._libc = libc
+
+    def __getattr__(self, name):
+        return getattr(self._libc, name)
+
+    def inotify_add_watch(self, fd, path, mask):
+        return self._libc.inotify_add_watch(fd, path, self.IN_DELETE_SELF)
+
+
+@pytest.mark.skipif(_load_inotify() is None, reason="needs inotify")
+def test_watcher_rescans_for_files_written_without_inotify_events(tmp_path):
+    watcher = TrialFileWatcher(file_names=["output"], poll_interval=0.05, rescan_interval=0.1)
+    watcher._libc = _NoWriteEvents(watcher._libc)
+    try:
+        watcher.watch(0, tmp_path)
+        assert watcher.backend == "inotify" and watcher._wds
+        (tmp_path / "output.json").write_text("{}")
+        assert watcher.wait_for_trial(0, timeout=5)
+        assert watcher.pop_changed(0)
+        # and only reported once
+        assert not watcher.wait_for_trial(0, timeout=0.5)
+    finally:
+        watcher.close()
@@ -0,0 +1,65 @@
+import importlib
+import sys
+
+from boa.utils import (
+    clear_signature_cache,
+    get_callable_signature,
+    get_dictionary_from_callable,
+)
+
+MODULE = """
+def metric(y_true, y_pred):
+    return 0
+"""
+
+
+def test_signatures_are_cached():
+    def f(a, b=1):
+        pass
+
+    assert get_callable_signature(f) is get_callable_signature(f)
+    assert get_dictionary_from_callable(f, {"a": 1, "c": 2}) == {"a": 1}
+
+    clear_signature_cache()
+    assert list(get_callable_signature(f).parameters) == ["a", "b"]
+
+
+def test_bound_methods_share_their_functions_signature():
+    class Wrapper:
+        def fetch_trial_data(self, trial, y_true=None, **kwargs):
+            pass
+
+    a, b = Wrapper(), Wrapper()
+    assert get_callable_signature(a.fetch_trial_data) is get_callable_signature(b.fetch_trial_data)
+    assert list(get_callable_signature(a.fetch_trial_data).parameters) == ["trial", "y_true", "kwargs"]
+    assert get_dictionary_from_callable(a.fetch_trial_data, {"trial": 1, "x": 2}) == {"trial": 1, "x": 2}
+    assert get_dictionary_from_callable(a.fetch_trial_data, {"x": 2}, accept_all_kwargs=False) == {}
+
+
+def test_functions_changed_in_place_are_noticed():
+    def f(a):
+        pass
+
+    def g(a, b):
+        pass
+
+    assert get_dictionary_from_callable(f, {"a": 1, "b": 2}) == {"a": 1}
+    f.__code__ = g.__code__  # as autoreload does
+    assert get_dictionary_from_callable(f, {"a": 1, "b": 2}) == {"a": 1, "b": 2}
+
+
+def test_reloaded_modules_are_noticed(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    (tmp_path / "boa_reloaded_metric.py").write_text(MODULE)
+    try:
+        import boa_reloaded_metric
+
+        data = {"y_true": 1, "y_pred": 2, "normalizer": "iqr"}
+        assert get_dictionary_from_callable(boa_reloaded_metric.metric, data) == {"y_true": 1, "y_pred": 2}
+
+        (tmp_path / "boa_reloaded_metric.py").write_text(MODULE.replace("y_pred)", "y_pred, normalizer)"))
+        importlib.reload(boa_reloaded_metric)
+        assert get_dictionary_from_callable(boa_reloaded_metric.metric, data) == data
+    finally:
+        sys.modules.pop("boa_reloaded_metric", None)
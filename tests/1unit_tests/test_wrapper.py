@@ -2,6 +2,7 @@ import pytest
 
 from boa import BaseWrapper as BWrapper
 from boa import ModularMetric as MMetric
+from boa import ScriptWrapper
 from boa import WrappedJobRunner as WRunner
 
 
@@ -9,6 +10,12 @@ def test_wrapper_instantiation(generic_config, tmp_path):
     BWrapper(config=generic_config, experiment_dir=tmp_path)
 
 
+def test_script_wrappers_do_not_share_a_lock(generic_config, tmp_path):
+    wrapper1 = ScriptWrapper(config=generic_config, experiment_dir=tmp_path / "1")
+    wrapper2 = ScriptWrapper(config=generic_config, experiment_dir=tmp_path / "2")
+    assert wrapper1._lazy_lock is not wrapper2._lazy_lock
+
+
 def test_creating_wrapper_with_same_name_as_other_wrapper_from_diff_file_raises_val_error_and_metric_and_runner():
     with pytest.raises(ValueError):
 
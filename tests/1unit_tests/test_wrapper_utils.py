@@ -1,4 +1,6 @@
-from boa import make_experiment_dir
+import pytest
+
+from boa import load_jsonlike, make_experiment_dir
 
 
 def test_make_new_exp_dir_when_exp_dir_already_exists(tmp_path):
@@ -10,3 +12,66 @@ def test_make_new_exp_dir_when_exp_dir_already_exists(tmp_path):
         dirs.add(exp_dir)
         assert exp_dir.exists()
     assert len(dirs) == 10
+
+
+def test_wrapper_with_restore_cwd_false_doesnt_change_process_dir(generic_config, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+
+    from boa import BaseWrapper, current_working_dir
+
+    class WorkingDirWrapper(BaseWrapper):
+        def run_model(self, trial) -> None:
+            return current_working_dir()
+
+    starting_dir = Path.cwd()
+    wrapper = WorkingDirWrapper(config=generic_config, experiment_dir=tmp_path)
+    wrapper.config.script_options.restore_cwd = False
+    wrapper.working_dir = tmp_path
+    with ThreadPoolExecutor(4) as executor:
+        working_dirs = set(executor.map(wrapper.run_model, range(8)))
+    assert working_dirs == {tmp_path.resolve()}
+    assert Path.cwd() == starting_dir
+    assert current_working_dir() == starting_dir
+
+
+def test_save_trial_data_only_rewrites_changed_files(generic_config, tmp_path, monkeypatch):
+    from ax.modelbridge.registry import Models
+
+    import boa.wrappers.wrapper_utils
+    from boa import BaseWrapper, WrappedJobRunner, get_experiment, save_trial_data
+
+    class Wrapper(BaseWrapper):
+        def run_model(self, trial) -> None:
+            pass
+
+    wrapper = Wrapper(config=generic_config, experiment_dir=tmp_path)
+    experiment = get_experiment(wrapper.config, WrappedJobRunner(wrapper=wrapper), wrapper)
+    trial = experiment.new_trial(generator_run=Models.SOBOL(search_space=experiment.search_space).gen(1))
+
+    file_hashes = {}
+    trial_dir = save_trial_data(trial, experiment_dir=tmp_path, file_hashes=file_hashes)
+    files = list(trial_dir.iterdir())
+    assert {path.name for path in files} == {"parameters.json", "trial.json", "data.json"}
+    for path in files:
+        path.write_text("stale")  # so rewritten files can be told apart
+    trial.mark_running(no_runner_required=True)
+    save_trial_data(trial, experiment_dir=tmp_path, file_hashes=file_hashes)
+
+    # only the files with the trial's status changed
+    rewritten = {path.name for path in files if path.read_text() != "stale"}
+    assert rewritten == {"trial.json", "data.json"}
+
+    # an unchanged trial isn't even serialized again
+    with monkeypatch.context() as m:
+        m.setattr(boa.wrappers.wrapper_utils, "object_to_json", lambda *args, **kwargs: pytest.fail("serialized"))
+        save_trial_data(trial, experiment_dir=tmp_path, file_hashes=file_hashes)
+
+    # unless they were removed
+    (trial_dir / "parameters.json").unlink()
+    save_trial_data(trial, experiment_dir=tmp_path, file_hashes=file_hashes)
+    assert load_jsonlike(trial_dir / "parameters.json") == trial.arm.parameters
+
+    (tmp_path / "new").mkdir()
+    trial_dir = save_trial_data(trial, trial_dir=tmp_path / "new", write_trial_json=False)
+    assert not (trial_dir / "trial.json").exists() and "trial" not in load_jsonlike(trial_dir / "data.json")
@@ -95,3 +95,7 @@ def test_async(config_path, tmp_path):
             .reset_index(drop=True)
         ),  # remove index to avoid index mismatch, we don't care about the index
     )
+
+    snapshot = main(split_shell_command(f"-sp {output_dir / 'scheduler.json'} --summary"), standalone_mode=False)
+    assert len(snapshot.summary()) == n_ran_trials
+    assert not snapshot.best_trials().empty
@@ -1,8 +1,10 @@
+import json
 import os
 import subprocess
 from pathlib import Path
 
 import pytest
+from ax.core.base_trial import TrialStatus
 from ax.service.scheduler import FailureRateExceededError
 
 from boa import (
@@ -175,3 +177,45 @@ def test_return_nan_fails_trial():
     with pytest.raises(FailureRateExceededError):
         config_path = ROOT / "tests" / f"scripts/other_langs/r_failure_nan/config.yaml"
         cli_main(split_shell_command(f"--config-path {config_path} -td"), standalone_mode=False)
+
+
+@pytest.mark.parametrize("config_name", ["config.yaml", "config_watch.yaml"])
+def test_script_workers_run_all_trials_in_one_process(config_name):
+    config_path = ROOT / "tests" / f"scripts/py_script_worker/{config_name}"
+    scheduler = cli_main(split_shell_command(f"--config-path {config_path} -td"), standalone_mode=False)
+    wrapper = scheduler.wrapper
+    assert len(scheduler.experiment.trials) == wrapper.config.trials
+
+    pids = {
+        (get_trial_dir(wrapper.experiment_dir, trial.index) / "worker_pid.txt").read_text()
+        for trial in scheduler.experiment.trials.values()
+        if trial.status == TrialStatus.COMPLETED  # trials with x0 > 0.9 fail
+    }
+    assert len(pids) == 1
+    # the worker is closed with the run
+    assert not any(worker.running for worker in wrapper._script_workers.values())
+    assert "_trial_watcher" not in wrapper.__dict__
+
+
+def test_batch_trials_run_trials_deployed_together_in_one_call():
+    config_path = ROOT / "tests" / "scripts/py_batch/config.yaml"
+    scheduler = cli_main(split_shell_command(f"--config-path {config_path} -td"), standalone_mode=False)
+    wrapper = scheduler.wrapper
+    trials = scheduler.experiment.trials.values()
+    assert len(trials) == wrapper.config.trials
+
+    batch_dirs = sorted((wrapper.experiment_dir / "batches").iterdir())
+    # fewer calls than trials, each one listing its trials in its manifest
+    assert len(batch_dirs) < len(trials)
+    manifest_indices = []
+    for batch_dir in batch_dirs:
+        manifest = json.loads((batch_dir / "manifest.json").read_text())
+        assert manifest["func_name"] == "run_model"
+        manifest_indices.extend(trial["trial_index"] for trial in manifest["trials"])
+        assert (batch_dir / "pid.txt").exists()
+    assert sorted(manifest_indices) == sorted(trial.index for trial in trials)
+
+    # the batch output file was split into the trials, failing those with x0 > 0.9
+    for trial in trials:
+        expected = TrialStatus.FAILED if trial.arm.parameters["x0"] > 0.9 else TrialStatus.COMPLETED
+        assert trial.status == expected
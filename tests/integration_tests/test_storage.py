@@ -1,11 +1,14 @@
 import json
 import os
+import pathlib
 import shutil
 import sys
 
 import numpy as np
+import pandas as pd
 import pytest
-from ax import Experiment, Objective, OptimizationConfig
+from ax import Data, Experiment, Objective, OptimizationConfig
+from ax.service.utils.report_utils import exp_to_df
 from ax.storage.json_store.decoder import object_from_json
 from ax.storage.json_store.encoder import object_to_json
 from ax.storage.json_store.registry import (
@@ -15,23 +18,35 @@ from ax.storage.json_store.registry import (
     CORE_ENCODER_REGISTRY,
 )
 
+from benchmarks.storage import FORMATS, run_storage_benchmark
 from boa import (
     BaseWrapper,
     BOAConfig,
     ModularMetric,
+    SchedulerSnapshot,
     WrappedJobRunner,
     cd_and_cd_back,
+    exp_opt_to_csv,
     get_dictionary_from_callable,
+    get_experiment,
     get_scheduler,
     instantiate_search_space_from_json,
     load_jsonlike,
+    load_scheduler_snapshot,
     scheduler_from_json_file,
+    scheduler_opt_to_csv,
     scheduler_to_json_file,
     split_shell_command,
 )
 from boa.__version__ import __version__
 from boa.cli import main as cli_main
+from boa.config import StorageBackend
+from boa.convert import main as convert_main
 from boa.definitions import ROOT
+from boa.storage.atomic import backup_path
+from boa.storage.journal import journal_path_for, read_journal
+from boa.storage.sqlite import sqlite_path_for
+from boa.storage.tracking import TrialChangeTracker
 
 TEST_DIR = ROOT / "tests"
 
@@ -263,3 +278,290 @@ def test_save_load_scheduler_with_generic_callable(generic_config, tmp_path):
         scheduler = scheduler_from_json_file(scheduler_json, wrapper=wrapper)
 
         assert "median" in scheduler.experiment.metrics
+
+
+def _storage_backend_scheduler(exp_dir, storage_backend=StorageBackend.JOURNAL, compaction_interval=1000):
+    from boa.scripts.script_wrappers import BraninWrapper
+
+    wrapper = BraninWrapper(config_path=ROOT / "boa/scripts/synth_func_config.yaml", experiment_dir=exp_dir)
+    wrapper.config.script_options.storage_backend = storage_backend
+    wrapper.config.script_options.journal_compaction_interval = compaction_interval
+    experiment = get_experiment(wrapper.config, WrappedJobRunner(wrapper=wrapper), wrapper)
+    return get_scheduler(experiment, config=wrapper.config)
+
+
+def test_journal_storage_backend_replays_journal_on_load(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path)
+    scheduler.run_n_trials(6)
+
+    journal_path = journal_path_for(scheduler.scheduler_filepath)
+    assert journal_path.exists()
+    with open(journal_path) as f:
+        # header plus at least one change record
+        assert len(f.readlines()) > 1
+
+    loaded = scheduler_from_json_file(scheduler.scheduler_filepath)
+    assert len(loaded.experiment.trials) == len(scheduler.experiment.trials) == 6
+    loaded_df = loaded.experiment.lookup_data().df.sort_values("trial_index")
+    df = scheduler.experiment.lookup_data().df.sort_values("trial_index")
+    assert list(loaded_df["arm_name"]) == list(df["arm_name"])
+    np.testing.assert_allclose(loaded_df["mean"], df["mean"])
+    assert len(loaded.generation_strategy._generator_runs) == len(scheduler.generation_strategy._generator_runs)
+
+    loaded.run_n_trials(2)
+    assert len(loaded.experiment.trials) == 8
+
+
+def test_journal_storage_backend_compacts(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, compaction_interval=1)
+    scheduler.run_n_trials(4)
+
+    with open(scheduler.scheduler_filepath) as f:
+        snapshot = json.load(f)
+    # every save compacts, so the snapshot alone holds all trials
+    assert len(snapshot["experiment"]["trials"]) == 4
+    assert read_journal(journal_path_for(scheduler.scheduler_filepath), snapshot["journal_id"]) == []
+
+
+def test_journal_from_other_snapshot_or_truncated_is_not_replayed(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path)
+    scheduler.run_n_trials(6)
+    journal_path = journal_path_for(scheduler.scheduler_filepath)
+    with open(scheduler.scheduler_filepath) as f:
+        journal_id = json.load(f)["journal_id"]
+
+    records = read_journal(journal_path, journal_id)
+    assert records
+    assert read_journal(journal_path, "some other snapshot") == []
+
+    with open(journal_path, "a") as f:
+        f.write('{"record": "trial", "trial_in')
+    assert read_journal(journal_path, journal_id) == records
+
+
+def test_sqlite_storage_backend_save_load(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.SQLITE)
+    scheduler.run_n_trials(6)
+
+    db_path = sqlite_path_for(scheduler.scheduler_filepath)
+    assert db_path.exists()
+    assert not scheduler.scheduler_filepath.exists()
+
+    loaded = scheduler_from_json_file(db_path)
+    assert len(loaded.experiment.trials) == len(scheduler.experiment.trials) == 6
+    loaded_df = loaded.experiment.lookup_data().df.sort_values("trial_index")
+    df = scheduler.experiment.lookup_data().df.sort_values("trial_index")
+    assert list(loaded_df["arm_name"]) == list(df["arm_name"])
+    np.testing.assert_allclose(loaded_df["mean"], df["mean"])
+    assert len(loaded.generation_strategy._generator_runs) == len(scheduler.generation_strategy._generator_runs)
+
+    # resumed scheduler keeps saving incrementally to the same database
+    loaded.run_n_trials(2)
+    assert len(scheduler_from_json_file(db_path).experiment.trials) == 8
+
+
+def test_sqlite_path_for():
+    assert sqlite_path_for("dir/scheduler.json") == pathlib.Path("dir/scheduler.db")
+    assert sqlite_path_for("dir/scheduler.json.gz") == pathlib.Path("dir/scheduler.db")
+    assert sqlite_path_for("dir/scheduler.sqlite") == pathlib.Path("dir/scheduler.sqlite")
+
+
+def test_sqlite_storage_backend_resume_from_cli(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.SQLITE)
+    scheduler.run_n_trials(3)
+    db_path = scheduler.scheduler_filepath
+    assert db_path.name == "scheduler.db"
+
+    scheduler = cli_main(split_shell_command(f"--scheduler-path {db_path} -td"), standalone_mode=False)
+    assert len(scheduler.experiment.trials) > 3
+
+
+def test_incremental_opt_csv_matches_full_rewrite(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.JSON)
+    scheduler.run_n_trials(6)
+    writer = scheduler._opt_csv_writer
+    assert writer is not None
+
+    full_csv = exp_opt_to_csv(scheduler.experiment, tmp_path / "full.csv")
+    pd.testing.assert_frame_equal(pd.read_csv(scheduler.opt_csv), pd.read_csv(full_csv))
+
+    # changing the data of an existing trial patches its row
+    trial_data = scheduler.experiment.lookup_data(trial_indices=[1]).df.copy()
+    trial_data["mean"] = 12345.0
+    scheduler.experiment.attach_data(Data(df=trial_data))
+    scheduler_opt_to_csv(scheduler, opt_filepath=scheduler.opt_csv)
+    df = pd.read_csv(scheduler.opt_csv)
+    assert df.loc[df["trial_index"] == 1, "rmse"].item() == 12345.0
+    pd.testing.assert_frame_equal(df, pd.read_csv(exp_opt_to_csv(scheduler.experiment, tmp_path / "full.csv")))
+
+    # files changed by someone else are rewritten in full
+    with open(scheduler.opt_csv, "w") as f:
+        f.write("garbage\n")
+    scheduler_opt_to_csv(scheduler, opt_filepath=scheduler.opt_csv)
+    pd.testing.assert_frame_equal(pd.read_csv(scheduler.opt_csv), df)
+
+
+def test_incremental_opt_csv_text_matches_full_rewrite(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.JSON)
+    full_csv = tmp_path / "full.csv"
+
+    def assert_same_as_full_rewrite():
+        scheduler_opt_to_csv(scheduler, opt_filepath=scheduler.opt_csv)
+        exp_opt_to_csv(scheduler.experiment, full_csv, lineterminator="\n")
+        assert scheduler.opt_csv.read_text() == full_csv.read_text()
+
+    # appended trials
+    scheduler.run_n_trials(3)
+    assert_same_as_full_rewrite()
+    scheduler.run_n_trials(3)
+    assert_same_as_full_rewrite()
+
+    # patched rows
+    trial_data = scheduler.experiment.lookup_data(trial_indices=[1]).df.copy()
+    trial_data["mean"] = 1.0
+    scheduler.experiment.attach_data(Data(df=trial_data))
+    assert_same_as_full_rewrite()
+
+    # a trial without data and a new column for its failure reason
+    trial = scheduler.experiment.new_trial(generator_run=scheduler.experiment.trials[0].generator_run.clone())
+    trial.mark_running(no_runner_required=True)
+    assert_same_as_full_rewrite()
+    trial.mark_failed(reason="failed for the test")
+    assert_same_as_full_rewrite()
+
+
+def test_trial_change_tracker_compares_metadata_and_data_by_content(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.JSON)
+    scheduler.run_n_trials(2)
+    experiment = scheduler.experiment
+    tracker = TrialChangeTracker()
+    tracker.mark_saved(experiment)
+    assert tracker.collect_changes(experiment) == ({}, {})
+
+    # a metadata value changing, without keys being added or removed
+    trial = experiment.trials[0]
+    key = next(iter(trial.run_metadata))
+    trial.update_run_metadata({key: "changed"})
+    trials, data = tracker.collect_changes(experiment)
+    assert list(trials) == [0] and data == {}
+
+    # data combined with the last data of a trial, under the same timestamp
+    trial_data = experiment.lookup_data(trial_indices=[1]).df.copy()
+    trial_data["metric_name"] = trial_data["metric_name"] + "_other"
+    experiment.attach_data(Data(df=trial_data), combine_with_last_data=True)
+    trials, data = tracker.collect_changes(experiment)
+    assert trials == {} and list(data) == [1]
+    assert tracker.collect_changes(experiment) == ({}, {})
+
+
+@pytest.mark.parametrize("storage_backend", [StorageBackend.JSON, StorageBackend.JOURNAL, StorageBackend.SQLITE])
+def test_background_save(storage_backend, tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=storage_backend)
+    scheduler.wrapper.config.script_options.background_save = True
+    scheduler.wrapper.config.script_options.min_save_interval = 5
+    scheduler.run_n_trials(6)
+    scheduler.flush_save_data()
+    assert scheduler._background_writer is not None
+
+    path = sqlite_path_for(scheduler.scheduler_filepath) if storage_backend == StorageBackend.SQLITE else None
+    loaded = scheduler_from_json_file(path or scheduler.scheduler_filepath)
+    assert len(loaded.experiment.trials) == 6
+    assert len(pd.read_csv(scheduler.opt_csv)) == 6
+
+
+def test_load_falls_back_to_backup_snapshot(tmp_path, caplog):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.JSON)
+    scheduler.run_n_trials(6)
+    scheduler_filepath = scheduler.scheduler_filepath
+    assert backup_path(scheduler_filepath, 1).exists()
+
+    # simulate a snapshot truncated by being killed mid write (with non atomic writes)
+    text = scheduler_filepath.read_text()
+    scheduler_filepath.write_text(text[: len(text) // 2])
+
+    loaded = scheduler_from_json_file(scheduler_filepath)
+    assert 0 < len(loaded.experiment.trials) <= 6
+    assert "Falling back to backup snapshot" in caplog.text
+
+
+def test_compressed_snapshot_save_load(tmp_path):
+    scheduler = _storage_backend_scheduler(tmp_path, storage_backend=StorageBackend.JSON)
+    scheduler.wrapper.config.script_options.snapshot_compression = "gzip"
+    scheduler.run_n_trials(4)
+
+    gz_path = scheduler.scheduler_filepath
+    assert gz_path.name == "scheduler.json.gz"
+    assert gz_path.exists()
+    assert not gz_path.with_name("scheduler.json").exists()
+    with open(gz_path, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+
+    loaded = scheduler_from_json_file(gz_path)
+    assert len(loaded.experiment.trials) == 4
+
+    # compression is detected from the contents, not the name
+    renamed = tmp_path / "renamed.json"
+    shutil.copy(gz_path, renamed)
+    assert len(scheduler_from_json_file(renamed).experiment.trials) == 4
+
+
+@pytest.mark.parametrize("out_name", ["converted.json", "converted.json.gz", "converted.db"])
+def test_convert_scheduler_snapshot_cli(out_name, branin_main_run, tmp_path):
+    file_out = tmp_path / "scheduler.json"
+    scheduler_to_json_file(branin_main_run, file_out)
+
+    out_path = convert_main([str(file_out), str(tmp_path / out_name)], standalone_mode=False)
+    assert load_scheduler_snapshot(out_path)["experiment"] == load_scheduler_snapshot(file_out)["experiment"]
+    scheduler = scheduler_from_json_file(out_path)
+    assert len(scheduler.experiment.trials) == len(branin_main_run.experiment.trials)
+
+
+def test_scheduler_snapshot_matches_restored_scheduler(branin_main_run, tmp_path):
+    scheduler = branin_main_run
+    file_out = tmp_path / "scheduler.json"
+    scheduler_to_json_file(scheduler, file_out)
+    snapshot = SchedulerSnapshot.from_file(file_out)
+
+    assert snapshot.trial_indices == sorted(scheduler.experiment.trials)
+    assert snapshot.search_space == scheduler.experiment.search_space
+    assert repr(snapshot.optimization_config) == repr(scheduler.experiment.optimization_config)
+    assert snapshot.load_config().objective == scheduler.wrapper.config.objective
+
+    summary = snapshot.summary().sort_values("trial_index").reset_index(drop=True)
+    exp_df = exp_to_df(scheduler.experiment).sort_values("trial_index").reset_index(drop=True)
+    pd.testing.assert_frame_equal(summary[exp_df.columns], exp_df, check_dtype=False)
+
+    best = snapshot.best_trials()
+    assert list(best["trial_index"]) == list(scheduler.best_raw_trials())
+
+    data = snapshot.fetch_data().df.sort_values("trial_index")
+    exp_data = scheduler.experiment.lookup_data().df.sort_values("trial_index")
+    assert list(data["arm_name"]) == list(exp_data["arm_name"])
+    np.testing.assert_allclose(data["mean"], exp_data["mean"])
+
+    # decoding parts of the snapshot doesn't stop it from being fully restored after
+    restored = snapshot.to_scheduler()
+    assert len(restored.experiment.trials) == len(scheduler.experiment.trials)
+
+
+def test_scheduler_snapshot_best_trials_is_pareto_front(moo_main_run, tmp_path):
+    file_out = tmp_path / "scheduler.json"
+    scheduler_to_json_file(moo_main_run, file_out)
+    snapshot = SchedulerSnapshot.from_file(file_out)
+
+    objectives = snapshot.optimization_config.objective.objectives
+    completed = snapshot.summary().query("trial_status == 'COMPLETED'")
+    y = np.column_stack([completed[obj.metric.name] * (-1 if obj.minimize else 1) for obj in objectives])
+    front = snapshot.best_trials()
+    assert not front.empty
+    for _, row in front.iterrows():
+        point = np.array([row[obj.metric.name] * (-1 if obj.minimize else 1) for obj in objectives])
+        dominated = np.all(y >= point, axis=1) & np.any(y > point, axis=1)
+        assert not dominated.any()
+
+
+def test_storage_benchmark(tmp_path):
+    df = run_storage_benchmark(n_trials=[5], dir_=tmp_path, isolate=False)
+    assert list(df["format"]) == list(FORMATS)
+    assert (df["size_mb"] > 0).all()
+    assert (df[["save_s", "load_s", "save_peak_rss_mb"]] > 0).all().all()
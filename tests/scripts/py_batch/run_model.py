@@ -0,0 +1,29 @@
+"""Runs all the trials of a batch in one process, see ScriptWrapper.run_model_batch"""
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def main(manifest_path):
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    outputs = {}
+    for trial in manifest["trials"]:
+        with open(Path(trial["trial_dir"]) / "parameters.json") as f:
+            parameters = json.load(f)
+        if parameters["x0"] > 0.9:  # the model diverges
+            outputs[trial["trial_index"]] = {"trial_status": "FAILED"}
+        else:
+            outputs[trial["trial_index"]] = {"metric": parameters["x0"] ** 2 + parameters["x1"]}
+
+    # one output file for the whole batch, that BOA splits into the trial directories
+    with open(Path(manifest["batch_dir"]) / "output.json", "w") as f:
+        json.dump(outputs, f)
+    # so tests can check all trials were run by the same process
+    (Path(manifest["batch_dir"]) / "pid.txt").write_text(str(os.getpid()))
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[-1]))
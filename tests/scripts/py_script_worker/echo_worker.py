@@ -0,0 +1,16 @@
+import sys
+
+from boa.wrappers.clients import serve_script_worker
+
+
+def handle(trial_dir, request):
+    if request["trial_index"] == 1:
+        raise ValueError("trial 1 always fails")
+    if request["trial_index"] == 2:
+        print("not a response")
+        sys.exit(3)
+    return {"echo": request["func_name"]}
+
+
+if __name__ == "__main__":
+    serve_script_worker(handle)
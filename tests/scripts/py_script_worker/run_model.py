@@ -0,0 +1,23 @@
+import json
+import os
+from pathlib import Path
+
+from boa.wrappers.clients import serve_script_worker
+
+
+def handle(trial_dir, request):
+    trial_dir = Path(trial_dir)
+    if request["func_name"] == "run_model":
+        with open(trial_dir / "parameters.json") as f:
+            parameters = json.load(f)
+        if parameters["x0"] > 0.9:
+            raise ValueError("model diverged")
+        with open(trial_dir / "output.json", "w") as f:
+            json.dump({"metric": parameters["x0"] ** 2 + parameters["x1"]}, f)
+        # so tests can check all trials were run by the same process
+        (trial_dir / "worker_pid.txt").write_text(str(os.getpid()))
+    # set_trial_status has nothing to do, output.json is enough to mark the trial completed
+
+
+if __name__ == "__main__":
+    serve_script_worker(handle)